@@ -0,0 +1,325 @@
+"""
+Numeric kernels for the restaurant lookup hot paths.
+
+The kernels are compiled with Numba when it is installed and fall back to
+equivalent NumPy implementations otherwise, so Numba stays an optional
+dependency.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+
+# Mean Earth radius in kilometers
+EARTH_RADIUS_KM = 6371.0088
+
+# Seconds in a day, for comparing times of day that wrap past midnight
+SECONDS_PER_DAY = 86400
+
+# Every fast-math flag except the no-NaN/no-inf assumptions, since restaurant
+# data can contain missing coordinates that must never match
+FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+# Largest half-angle difference, in radians, for which the compiled radius checks
+# decide from polynomial bounds on the sines before computing them
+SMALL_HALF_ANGLE = 0.1
+
+# Relative slack on those bounds, far above the rounding error of the arithmetic
+BOUND_MARGIN = 1e-9
+
+
+def _within_radius_array_numpy(lat_u: float, lon_u: float, lat_rad: np.ndarray, lon_rad: np.ndarray,
+                               cos_lat: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    """
+    Check which points lie within their own radius of a location.
+
+    Instead of taking arcsin and sqrt of every haversine term, each radius is
+    converted to the matching haversine term, sin^2(radius / 2R), which is
+    monotonic in the distance up to half the Earth's circumference.
+
+    Args:
+        lat_u, lon_u: Coordinates of the user location in radians
+        lat_rad, lon_rad: Coordinates of the other points in radians
+        cos_lat: Precomputed cosine of lat_rad
+        radius: Radius of each point in kilometers
+
+    Returns:
+        numpy.ndarray: Boolean mask, True where the distance is within the radius
+    """
+    # Subtract in float64 like the compiled kernels; a Python float alone would
+    # leave float32 columns in float32
+    sin_dlat = np.sin(np.subtract(lat_rad, lat_u, dtype=np.float64) * 0.5)
+    sin_dlon = np.sin(np.subtract(lon_rad, lon_u, dtype=np.float64) * 0.5)
+    a = sin_dlat * sin_dlat + math.cos(lat_u) * cos_lat * sin_dlon * sin_dlon
+    limit = np.sin(np.clip(np.multiply(radius, 0.5 / EARTH_RADIUS_KM, dtype=np.float64), 0.0, 0.5 * math.pi))
+    return (a <= limit * limit) & (radius >= 0)
+
+
+def _within_radius_pairs_indexed_numpy(user_index: np.ndarray, positions: np.ndarray,
+                                       lat_u: np.ndarray, lon_u: np.ndarray, cos_u: np.ndarray,
+                                       lat_rad: np.ndarray, lon_rad: np.ndarray, cos_lat: np.ndarray,
+                                       radius: np.ndarray, eligible: np.ndarray) -> np.ndarray:
+    """
+    Check (user, point) pairs given as indices for whether the point is eligible and within its radius.
+
+    Takes the full user and point columns and each pair's index into them,
+    so the compiled version reads every pair in place instead of gathering
+    temporary copies of every column first.
+
+    Args:
+        user_index: Index of each pair's user location in the user columns
+        positions: Index of each pair's point in the point columns
+        lat_u, lon_u: Coordinates of all user locations in radians
+        cos_u: Precomputed cosine of lat_u
+        lat_rad, lon_rad: Coordinates of all points in radians
+        cos_lat: Precomputed cosine of lat_rad
+        radius: Radius of each point in kilometers
+        eligible: Boolean mask of the points that may match at all
+
+    Returns:
+        numpy.ndarray: Boolean mask over the pairs, True where the point matches
+    """
+    radius = radius[positions]
+    sin_dlat = np.sin((lat_rad[positions] - lat_u[user_index]) * 0.5)
+    sin_dlon = np.sin((lon_rad[positions] - lon_u[user_index]) * 0.5)
+    a = sin_dlat * sin_dlat + cos_u[user_index] * cos_lat[positions] * sin_dlon * sin_dlon
+    limit = np.sin(np.clip(np.multiply(radius, 0.5 / EARTH_RADIUS_KM, dtype=np.float64), 0.0, 0.5 * math.pi))
+    return (a <= limit * limit) & (radius >= 0) & eligible[positions]
+
+
+def _available_array_numpy(lat_u: float, lon_u: float, lat_rad: np.ndarray, lon_rad: np.ndarray,
+                           cos_lat: np.ndarray, radius: np.ndarray, open_s: np.ndarray,
+                           close_s: np.ndarray, now_s: int) -> np.ndarray:
+    """
+    Check which points are both within their own radius of a location and open.
+
+    Combines _within_radius_array_numpy with the wrapped opening-hours check,
+    so callers filtering on both need a single kernel call.
+
+    Args:
+        lat_u, lon_u: Coordinates of the user location in radians
+        lat_rad, lon_rad: Coordinates of the other points in radians
+        cos_lat: Precomputed cosine of lat_rad
+        radius: Radius of each point in kilometers
+        open_s, close_s: Opening and closing time of each point in seconds since midnight
+        now_s: Time to check in seconds since midnight
+
+    Returns:
+        numpy.ndarray: Boolean mask, True where the point is in range and open
+    """
+    is_open = (now_s - open_s) % SECONDS_PER_DAY <= (close_s - open_s) % SECONDS_PER_DAY
+    return _within_radius_array_numpy(lat_u, lon_u, lat_rad, lon_rad, cos_lat, radius) & is_open
+
+
+def _select_within_radius_numpy(lat_u: float, lon_u: float, positions: np.ndarray,
+                                lat_rad: np.ndarray, lon_rad: np.ndarray, cos_lat: np.ndarray,
+                                radius: np.ndarray, eligible: np.ndarray) -> np.ndarray:
+    """
+    Select the eligible points within their own radius of a location, among candidates.
+
+    Takes the full columns and the candidates' positions in them, so the
+    compiled version reads each candidate in place instead of gathering
+    temporary copies of every column first.
+
+    Args:
+        lat_u, lon_u: Coordinates of the user location in radians
+        positions: Positions of the candidate points in the columns
+        lat_rad, lon_rad: Coordinates of all points in radians
+        cos_lat: Precomputed cosine of lat_rad
+        radius: Radius of each point in kilometers
+        eligible: Boolean mask of the points that may be selected at all
+
+    Returns:
+        numpy.ndarray: Positions of the selected candidates, in candidate order
+    """
+    in_range = _within_radius_array_numpy(lat_u, lon_u, lat_rad[positions], lon_rad[positions],
+                                          cos_lat[positions], radius[positions])
+    return positions[in_range & eligible[positions]]
+
+
+def _haversine_batch_numpy(lat1: float, lon1: float, lat2: np.ndarray,
+                           lon2: np.ndarray) -> np.ndarray:
+    """
+    Calculate the great-circle distance from one point to many points.
+
+    Args:
+        lat1, lon1: Coordinates of the origin point in degrees
+        lat2, lon2: Coordinates of the other points in degrees
+
+    Returns:
+        numpy.ndarray: Distances in kilometers
+    """
+    lat1_rad = math.radians(lat1)
+    return _haversine_from_rad_numpy(lat1_rad, math.radians(lon1), math.cos(lat1_rad),
+                                     lat2, lon2)
+
+
+def _haversine_from_rad_numpy(lat1_rad: float, lon1_rad: float, cos_lat1: float,
+                              lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """
+    Calculate the great-circle distance from a fixed origin to many points.
+
+    Args:
+        lat1_rad, lon1_rad: Coordinates of the origin point in radians
+        cos_lat1: Precomputed cosine of lat1_rad
+        lat2, lon2: Coordinates of the other points in degrees
+
+    Returns:
+        numpy.ndarray: Distances in kilometers
+    """
+    lat2_rad = np.radians(lat2)
+    sin_dlat = np.sin((lat2_rad - lat1_rad) * 0.5)
+    sin_dlon = np.sin((np.radians(lon2) - lon1_rad) * 0.5)
+    a = sin_dlat * sin_dlat + cos_lat1 * np.cos(lat2_rad) * sin_dlon * sin_dlon
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _haversine_point_from_rad_python(lat1_rad: float, lon1_rad: float, cos_lat1: float,
+                                     lat2: float, lon2: float) -> float:
+    """
+    Calculate the great-circle distance from a fixed origin to a single point.
+
+    Scalar counterpart of _haversine_from_rad_numpy, avoiding the array
+    round trip for one-off distances.
+
+    Args:
+        lat1_rad, lon1_rad: Coordinates of the origin point in radians
+        cos_lat1: Precomputed cosine of lat1_rad
+        lat2, lon2: Coordinates of the other point in degrees
+
+    Returns:
+        float: Distance in kilometers
+    """
+    lat2_rad = math.radians(lat2)
+    sin_dlat = math.sin((lat2_rad - lat1_rad) * 0.5)
+    sin_dlon = math.sin((math.radians(lon2) - lon1_rad) * 0.5)
+    a = sin_dlat * sin_dlat + cos_lat1 * math.cos(lat2_rad) * sin_dlon * sin_dlon
+    return 2.0 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=FASTMATH, nogil=True, boundscheck=False)
+    def _within_half_angle(half_dlat, half_dlon, cos_product, half_angle):
+        """
+        Check whether a point lies within a delivery radius, skipping the sines where bounds decide.
+
+        For half-angles t below SMALL_HALF_ANGLE, t*(1 - t**2/6) <= sin(t) <= t, so
+        the haversine term and the radius limit computed from the angles
+        themselves bracket the exact ones. Only points too close to the
+        boundary for the brackets to decide pay for the sines.
+
+        Args:
+            half_dlat, half_dlon: Half the latitude and longitude difference in radians
+            cos_product: Product of the cosines of both latitudes
+            half_angle: Half the radius as an angle in radians (non-negative)
+
+        Returns:
+            bool: True where the point is within the radius
+        """
+        a_approx = half_dlat * half_dlat + cos_product * half_dlon * half_dlon
+        limit_approx = half_angle * half_angle
+        t2 = max(half_dlat * half_dlat, half_dlon * half_dlon)
+        if t2 < SMALL_HALF_ANGLE * SMALL_HALF_ANGLE and half_angle < SMALL_HALF_ANGLE:
+            # a <= a_approx, and the limit is at least its lower bound: accept
+            shrink = 1.0 - limit_approx * (1.0 / 6.0)
+            if a_approx <= limit_approx * shrink * shrink * (1.0 - BOUND_MARGIN):
+                return True
+            # a is at least a_approx's lower bound, and the limit at most limit_approx: reject
+            shrink = 1.0 - t2 * (1.0 / 6.0)
+            if a_approx * shrink * shrink * (1.0 - BOUND_MARGIN) > limit_approx:
+                return False
+
+        limit = math.sin(min(half_angle, 0.5 * math.pi))
+        sin_dlat = math.sin(half_dlat)
+        sin_dlon = math.sin(half_dlon)
+        return sin_dlat * sin_dlat + cos_product * sin_dlon * sin_dlon <= limit * limit
+
+    @njit(cache=True, fastmath=FASTMATH, nogil=True, boundscheck=False)
+    def within_radius_pairs_indexed(user_index, positions, lat_u, lon_u, cos_u,
+                                    lat_rad, lon_rad, cos_lat, radius, eligible):
+        """Compiled equivalent of _within_radius_pairs_indexed_numpy, skipping the trigonometry for ineligible points."""
+        n = positions.shape[0]
+        out = np.empty(n, dtype=np.bool_)
+        for k in range(n):
+            i = positions[k]
+            u = user_index[k]
+            half_angle = radius[i] * (0.5 / EARTH_RADIUS_KM)
+            if not (eligible[i] and half_angle >= 0.0):  # Closed, or negative or missing radius
+                out[k] = False
+                continue
+            out[k] = _within_half_angle((lat_rad[i] - lat_u[u]) * 0.5, (lon_rad[i] - lon_u[u]) * 0.5,
+                                       cos_u[u] * cos_lat[i], half_angle)
+        return out
+
+    @njit(cache=True, fastmath=FASTMATH, nogil=True, boundscheck=False)
+    def available_array(lat_u, lon_u, lat_rad, lon_rad, cos_lat, radius, open_s, close_s, now_s):
+        """Compiled equivalent of _available_array_numpy, skipping the trigonometry for closed points."""
+        n = lat_rad.shape[0]
+        out = np.empty(n, dtype=np.bool_)
+        cos_u = math.cos(lat_u)
+        for i in range(n):
+            # Integer hours check first; Numba's % follows Python's sign rules
+            if (now_s - open_s[i]) % SECONDS_PER_DAY > (close_s[i] - open_s[i]) % SECONDS_PER_DAY:
+                out[i] = False
+                continue
+            half_angle = radius[i] * (0.5 / EARTH_RADIUS_KM)
+            if not half_angle >= 0.0:  # Negative or missing radius
+                out[i] = False
+                continue
+            out[i] = _within_half_angle((lat_rad[i] - lat_u) * 0.5, (lon_rad[i] - lon_u) * 0.5,
+                                       cos_u * cos_lat[i], half_angle)
+        return out
+
+    @njit(cache=True, fastmath=FASTMATH, nogil=True, boundscheck=False)
+    def select_within_radius(lat_u, lon_u, positions, lat_rad, lon_rad, cos_lat, radius, eligible):
+        """Compiled equivalent of _select_within_radius_numpy, skipping the trigonometry for ineligible points."""
+        out = np.empty(positions.shape[0], dtype=positions.dtype)
+        count = 0
+        cos_u = math.cos(lat_u)
+        for k in range(positions.shape[0]):
+            i = positions[k]
+            if not eligible[i]:
+                continue
+            half_angle = radius[i] * (0.5 / EARTH_RADIUS_KM)
+            if not half_angle >= 0.0:  # Negative or missing radius
+                continue
+            if _within_half_angle((lat_rad[i] - lat_u) * 0.5, (lon_rad[i] - lon_u) * 0.5,
+                                  cos_u * cos_lat[i], half_angle):
+                out[count] = i
+                count += 1
+        return out[:count]
+
+    @njit(cache=True, fastmath=FASTMATH, nogil=True, boundscheck=False)
+    def haversine_from_rad(lat1_rad, lon1_rad, cos_lat1, lat2, lon2):
+        """Compiled equivalent of _haversine_from_rad_numpy, converting to radians in the loop."""
+        n = lat2.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            lat2_rad = math.radians(lat2[i])
+            sin_dlat = math.sin((lat2_rad - lat1_rad) * 0.5)
+            sin_dlon = math.sin((math.radians(lon2[i]) - lon1_rad) * 0.5)
+            a = sin_dlat * sin_dlat + cos_lat1 * math.cos(lat2_rad) * sin_dlon * sin_dlon
+            out[i] = 2.0 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+        return out
+
+    @njit(cache=True, fastmath=FASTMATH, nogil=True, boundscheck=False)
+    def haversine_batch(lat1, lon1, lat2, lon2):
+        """Compiled equivalent of _haversine_batch_numpy."""
+        lat1_rad = math.radians(lat1)
+        return haversine_from_rad(lat1_rad, math.radians(lon1), math.cos(lat1_rad), lat2, lon2)
+
+    haversine_point_from_rad = njit(cache=True, fastmath=FASTMATH, nogil=True)(
+        _haversine_point_from_rad_python
+    )
+else:
+    within_radius_pairs_indexed = _within_radius_pairs_indexed_numpy
+    available_array = _available_array_numpy
+    select_within_radius = _select_within_radius_numpy
+    haversine_batch = _haversine_batch_numpy
+    haversine_from_rad = _haversine_from_rad_numpy
+    haversine_point_from_rad = _haversine_point_from_rad_python
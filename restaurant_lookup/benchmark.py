@@ -9,12 +9,14 @@ import os
 import time
 import pandas as pd
 import numpy as np
-import csv
+import matplotlib
+matplotlib.use("Agg")  # Non-interactive backend, charts are only saved to files
 import matplotlib.pyplot as plt
 from datetime import datetime
-import tempfile
+import io
 import json
-from freezegun import freeze_time
+from html import escape
+from string import Template
 import seaborn as sns
 from tabulate import tabulate
 
@@ -22,7 +24,7 @@ from tabulate import tabulate
 from time_checker import TimeChecker
 from distance_calculator import DistanceCalculator
 from spatial_index import SpatialIndex
-from data_loader import CSVDataLoader
+from data_loader import CSVDataLoader, restaurants_to_soa
 from result_writer import CSVResultWriter
 from restaurant_lookup import RestaurantLookupService
 from factory import SpatialIndexFactory
@@ -34,6 +36,236 @@ sns.set_style("whitegrid")
 plt.rcParams["figure.figsize"] = (12, 8)
 plt.rcParams["font.size"] = 12
 
+# Resolution of the saved charts
+CHART_DPI = 150
+
+# "HH:00:00" strings for every hour of the day, indexed by hour
+HOUR_STRINGS = np.array([f"{hour:02d}:00:00" for hour in range(24)])
+
+# Fixed time the lookups are benchmarked at (when most synthetic restaurants are open)
+BENCHMARK_TIME = datetime(2023, 1, 1, 15, 0, 0)
+
+# Spatial index constructors benchmarked against each other, keyed by result name
+IMPLEMENTATIONS = {
+    "standard": lambda tc, dc: SpatialIndex(tc, dc),
+    "factory": lambda tc, dc: SpatialIndexFactory.create_index("rtree", tc, dc),
+    "decorator": lambda tc, dc: CachingSpatialIndex(SpatialIndex(tc, dc)),
+    "grid": lambda tc, dc: SpatialIndexFactory.create_index("grid", tc, dc),
+}
+
+
+# HTML report layout, compiled once at import; values are escaped before substitution
+REPORT_TEMPLATE = Template("""\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Restaurant Lookup Performance Analysis</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        h1, h2, h3 {
+            color: #2c3e50;
+        }
+        .header {
+            background-color: #f8f9fa;
+            padding: 20px;
+            border-radius: 5px;
+            margin-bottom: 30px;
+            border-left: 5px solid #3498db;
+        }
+        .section {
+            margin-bottom: 40px;
+        }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            margin-bottom: 20px;
+        }
+        th, td {
+            border: 1px solid #ddd;
+            padding: 12px;
+            text-align: left;
+        }
+        th {
+            background-color: #f2f2f2;
+        }
+        tr:nth-child(even) {
+            background-color: #f9f9f9;
+        }
+        .visualization {
+            margin: 30px 0;
+            text-align: center;
+        }
+        .visualization img {
+            max-width: 100%;
+            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+            border-radius: 5px;
+        }
+        .conclusion {
+            background-color: #f8f9fa;
+            padding: 20px;
+            border-radius: 5px;
+            border-left: 5px solid #2ecc71;
+        }
+        .footer {
+            margin-top: 50px;
+            padding-top: 20px;
+            border-top: 1px solid #eee;
+            font-size: 0.9em;
+            color: #7f8c8d;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Restaurant Lookup Performance Analysis</h1>
+        <p>Generated on: $generated_at</p>
+    </div>
+
+    <div class="section">
+        <h2>Executive Summary</h2>
+        <p>
+            This report presents a comprehensive performance analysis of the restaurant lookup implementation
+            with various design patterns. The analysis evaluates how the solution scales with increasing dataset sizes
+            and compares the performance characteristics of different implementation approaches.
+        </p>
+        <p>
+            The key findings indicate that the spatial indexing approach successfully achieves better than O(N*M) complexity,
+            with index building time scaling approximately linearly with the number of restaurants and lookup time
+            scaling sublinearly with the number of user locations.
+        </p>
+    </div>
+
+    <div class="section">
+        <h2>Performance Comparison</h2>
+        <p>
+            The following visualizations compare the performance of different implementation approaches
+            across various dataset sizes.
+        </p>
+
+        <div class="visualization">
+            <h3>Implementation Comparison</h3>
+            <img src="implementation_comparison.png" alt="Implementation Comparison Chart">
+            <p>
+                This chart compares the lookup time across different implementations for each dataset size.
+                Lower values indicate better performance.
+            </p>
+        </div>
+
+        <div class="visualization">
+            <h3>Scaling with Number of Restaurants</h3>
+            <img src="restaurant_scaling.png" alt="Restaurant Scaling Chart">
+            <p>
+                This chart shows how index build time scales with the number of restaurants.
+                The dashed line represents O(N) scaling for reference.
+            </p>
+        </div>
+
+        <div class="visualization">
+            <h3>Scaling with Number of Users</h3>
+            <img src="user_scaling.png" alt="User Scaling Chart">
+            <p>
+                This chart shows how lookup time scales with the number of user locations.
+                The dashed line represents O(M) scaling for reference.
+            </p>
+        </div>
+
+        <div class="visualization">
+            <h3>Speedup Comparison</h3>
+            <img src="speedup_comparison.png" alt="Speedup Comparison Chart">
+            <p>
+                This chart shows the speedup factor of optimized implementations relative to the standard implementation.
+                Values greater than 1 indicate performance improvement.
+            </p>
+        </div>
+    </div>
+
+    <div class="section">
+        <h2>Detailed Results</h2>
+        <p>
+            The following table presents detailed performance metrics for each implementation and dataset size.
+        </p>
+
+        <table>
+            <tr>
+                <th>Dataset</th>
+                <th>Implementation</th>
+                <th>Index Build Time (s)</th>
+                <th>Lookup Time (s)</th>
+                <th>Total Time (s)</th>
+            </tr>
+$result_rows
+        </table>
+    </div>
+
+    <div class="conclusion">
+        <h2>Conclusion</h2>
+        <p>
+            The performance analysis confirms that the restaurant lookup implementation meets the requirement
+            for better than O(N*M) complexity. The spatial indexing approach efficiently handles large datasets,
+            with the index building time growing approximately linearly with the number of restaurants and
+            the lookup time growing sublinearly with the number of user locations.
+        </p>
+        <p>
+            Among the different implementation approaches, the decorator pattern with caching shows the most
+            significant performance improvement for repeated queries, particularly with larger datasets.
+            The factory pattern maintains consistent performance while providing flexibility in spatial index
+            implementation.
+        </p>
+        <p>
+            Overall, the implementation demonstrates excellent scalability characteristics, making it suitable
+            for handling millions of restaurant entries efficiently as required by the specifications.
+        </p>
+    </div>
+
+    <div class="footer">
+        <p>Performance analysis conducted using custom benchmarking tools.</p>
+        <p>© 2025 Shivendra Dubey - All Rights Reserved</p>
+    </div>
+</body>
+</html>
+""")
+
+REPORT_ROW_TEMPLATE = Template("""\
+            <tr>
+                <td>$dataset</td>
+                <td>$implementation</td>
+                <td>$index_build_time</td>
+                <td>$lookup_time</td>
+                <td>$total_time</td>
+            </tr>""")
+
+
+def _json_default(value):
+    """Convert NumPy scalars and arrays in benchmark results to JSON types."""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _mean_by_key(keys, values):
+    """
+    Average values that share a key.
+    
+    Args:
+        keys: Array of group keys
+        values: Array of values aligned with keys
+        
+    Returns:
+        Tuple of (sorted unique keys, mean value per key)
+    """
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    means = np.bincount(inverse, weights=values) / np.bincount(inverse)
+    return unique_keys, means
+
 
 class RestaurantDataGenerator:
     """Generates synthetic restaurant data for performance testing."""
@@ -41,41 +273,46 @@ class RestaurantDataGenerator:
     def __init__(self, seed=42):
         """Initialize with a random seed for reproducibility."""
         self.seed = seed
-        np.random.seed(self.seed)
+        self.rng = np.random.default_rng(self.seed)
     
-    def create_restaurants(self, count):
+    def create_restaurants(self, count, seed=None):
         """
         Create a dataset with the specified number of restaurants.
         
         Args:
             count: Number of restaurants to generate
+            seed: Optional seed for this dataset alone; when given the output
+                  depends only on (count, seed) instead of the generator's stream
             
         Returns:
             DataFrame containing synthetic restaurant data
         """
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+        
         # Generate IDs and coordinates
         ids = list(range(1, count + 1))
-        lats = np.random.uniform(40.0, 60.0, count)
-        longs = np.random.uniform(0.0, 20.0, count)
+        lats = rng.uniform(40.0, 60.0, count)
+        longs = rng.uniform(0.0, 20.0, count)
         
         # Create realistic delivery ranges (1-15km)
-        delivery_ranges = np.random.choice([1, 2, 3, 5, 7, 10, 15], count)
+        delivery_ranges = rng.choice([1, 2, 3, 5, 7, 10, 15], count)
         
         # Generate business hours with realistic patterns
-        opens, closes = [], []
-        for _ in range(count):
-            # Most restaurants open between 7am and 12pm
-            open_hour = np.random.choice([7, 8, 9, 10, 11, 12], p=[0.2, 0.3, 0.2, 0.1, 0.1, 0.1])
-            
-            # Most restaurants stay open 8-14 hours
-            hours_open = np.random.choice([8, 10, 12, 14, 16], p=[0.1, 0.3, 0.4, 0.15, 0.05])
-            close_hour = (open_hour + hours_open) % 24
-            
-            opens.append(f"{open_hour:02d}:00:00")
-            closes.append(f"{close_hour:02d}:00:00")
+        # Most restaurants open between 7am and 12pm
+        open_hours = rng.choice([7, 8, 9, 10, 11, 12], size=count,
+                                 p=[0.2, 0.3, 0.2, 0.1, 0.1, 0.1])
+        
+        # Most restaurants stay open 8-14 hours
+        hours_open = rng.choice([8, 10, 12, 14, 16], size=count,
+                                 p=[0.1, 0.3, 0.4, 0.15, 0.05])
+        close_hours = (open_hours + hours_open) % 24
+        
+        # Format via a lookup table instead of one f-string per restaurant
+        opens = HOUR_STRINGS[open_hours]
+        closes = HOUR_STRINGS[close_hours]
         
         # Generate ratings with a realistic distribution (most places 3.5-4.5)
-        ratings = np.clip(np.random.normal(4.0, 0.5, count), 1.0, 5.0)
+        ratings = np.clip(rng.normal(4.0, 0.5, count), 1.0, 5.0)
         
         # Create and return the DataFrame
         return pd.DataFrame({
@@ -95,61 +332,60 @@ class UserLocationGenerator:
     def __init__(self, seed=43):
         """Initialize with a random seed for reproducibility."""
         self.seed = seed
-        np.random.seed(self.seed)
+        self.rng = np.random.default_rng(self.seed)
     
-    def create_locations(self, count):
+    def create_locations(self, count, seed=None):
         """
         Create a dataset with the specified number of user locations.
         
         Args:
             count: Number of user locations to generate
+            seed: Optional seed for this dataset alone; when given the output
+                  depends only on (count, seed) instead of the generator's stream
             
         Returns:
-            List of [latitude, longitude] pairs
+            Array of shape (count, 2) holding [latitude, longitude] pairs
         """
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+        
         # Create a mix of urban clusters and random locations
         if count <= 10:
             # For small counts, just use random locations
-            lats = np.random.uniform(40.0, 60.0, count)
-            longs = np.random.uniform(0.0, 20.0, count)
-        else:
-            # For larger counts, create some urban clusters
-            cluster_centers = [
-                (51.5, 0.1),    # London
-                (48.9, 2.3),    # Paris
-                (52.5, 13.4),   # Berlin
-                (40.7, -74.0),  # New York
-                (55.8, 37.6)    # Moscow
-            ]
-            
-            # Determine how many users to place in clusters vs. random locations
-            cluster_pct = min(0.7, 50/count)  # Up to 70% in clusters, less for very large counts
-            cluster_count = int(count * cluster_pct)
-            random_count = count - cluster_count
-            
-            # Generate cluster locations (normally distributed around centers)
-            cluster_lats, cluster_longs = [], []
-            for _ in range(cluster_count):
-                center = cluster_centers[np.random.randint(0, len(cluster_centers))]
-                # Add some noise (about 5-10km in each direction)
-                cluster_lats.append(center[0] + np.random.normal(0, 0.05))
-                cluster_longs.append(center[1] + np.random.normal(0, 0.05))
-            
-            # Generate random locations for the rest
-            random_lats = np.random.uniform(40.0, 60.0, random_count)
-            random_longs = np.random.uniform(0.0, 20.0, random_count)
-            
-            # Combine
-            lats = np.concatenate([cluster_lats, random_lats])
-            longs = np.concatenate([cluster_longs, random_longs])
-            
-            # Shuffle
-            indices = np.arange(count)
-            np.random.shuffle(indices)
-            lats = lats[indices]
-            longs = longs[indices]
-        
-        return [[lat, lon] for lat, lon in zip(lats, longs)]
+            lats = rng.uniform(40.0, 60.0, count)
+            longs = rng.uniform(0.0, 20.0, count)
+            return np.column_stack([lats, longs])
+        
+        # For larger counts, create some urban clusters
+        cluster_centers = np.asarray([
+            (51.5, 0.1),    # London
+            (48.9, 2.3),    # Paris
+            (52.5, 13.4),   # Berlin
+            (40.7, -74.0),  # New York
+            (55.8, 37.6)    # Moscow
+        ], dtype=np.float64)
+        
+        # Determine how many users to place in clusters vs. random locations
+        cluster_pct = min(0.7, 50/count)  # Up to 70% in clusters, less for very large counts
+        cluster_count = int(count * cluster_pct)
+        random_count = count - cluster_count
+        
+        # Generate cluster locations (normally distributed around centers)
+        # Add some noise (about 5-10km in each direction)
+        center_idx = rng.integers(0, len(cluster_centers), size=cluster_count)
+        noise = rng.normal(0.0, 0.05, size=(cluster_count, 2))
+        cluster_points = cluster_centers[center_idx] + noise
+        
+        # Generate random locations for the rest
+        random_points = np.column_stack([
+            rng.uniform(40.0, 60.0, random_count),
+            rng.uniform(0.0, 20.0, random_count)
+        ])
+        
+        # Combine and shuffle
+        points = np.vstack([cluster_points, random_points])
+        indices = np.arange(count)
+        rng.shuffle(indices)
+        return points[indices]
 
 
 class PerformanceTester:
@@ -166,151 +402,101 @@ class PerformanceTester:
             "standard": [],
             "factory": [],
             "decorator": [],
+            "grid": [],
             "strategy": [],
             "combined": []
         }
+        # (restaurants, users, dataset) tuples sorted by size, built in generate_report
+        self._dataset_order = []
         
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
     
-    def _prepare_test_files(self, user_locations):
-        """Create temporary files for testing."""
-        users_file = tempfile.NamedTemporaryFile(delete=False, suffix='.csv')
-        output_file = tempfile.NamedTemporaryFile(delete=False, suffix='.csv')
+    def _prepare_test_input(self, user_locations):
+        """Write user locations to an in-memory CSV buffer for testing."""
+        users_fp = io.StringIO()
+        np.savetxt(users_fp, np.asarray(user_locations, dtype=np.float64),
+                   fmt="%.6f", delimiter=",")
+        return users_fp
+    
+    def _run_test(self, index_factory_fn, restaurants, users_fp):
+        """
+        Time index construction and lookups for a single implementation.
         
-        users_path = users_file.name
-        output_path = output_file.name
+        Args:
+            index_factory_fn: Callable taking (time_checker, distance_calculator)
+                              and returning the spatial index under test
+            restaurants: Struct-of-Arrays restaurant data
+            users_fp: In-memory CSV buffer with user locations
+            
+        Returns:
+            Dictionary with the measured timings (plus cache stats for caching indexes)
+        """
+        # Create service components
+        time_checker = TimeChecker(now=BENCHMARK_TIME)
+        distance_calculator = DistanceCalculator()
+        spatial_index = index_factory_fn(time_checker, distance_calculator)
+        data_loader = CSVDataLoader()
+        result_writer = CSVResultWriter()
+        service = RestaurantLookupService(spatial_index, data_loader, result_writer)
         
-        # Write user locations to CSV
-        with open(users_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(user_locations)
+        # Rewind the shared users buffer and collect output in memory
+        users_fp.seek(0)
+        output_fp = io.StringIO()
         
-        return users_path, output_path
-    
-    def _cleanup_files(self, *file_paths):
-        """Clean up temporary files."""
-        for path in file_paths:
-            try:
-                os.unlink(path)
-            except Exception as e:
-                print(f"Warning: Failed to delete {path}: {e}")
-    
-    def test_standard_implementation(self, restaurants_df, user_locations):
-        """Test the standard implementation without design patterns."""
-        users_path, output_path = self._prepare_test_files(user_locations)
+        # Measure performance with the monotonic high-resolution clock
+        start_time = time.perf_counter_ns()
         
-        try:
-            # Create service components
-            time_checker = TimeChecker()
-            distance_calculator = DistanceCalculator()
-            spatial_index = SpatialIndex(time_checker, distance_calculator)
-            data_loader = CSVDataLoader()
-            result_writer = CSVResultWriter()
-            service = RestaurantLookupService(spatial_index, data_loader, result_writer)
-            
-            # Measure performance
-            start_time = time.time()
-            
-            # Build index
-            index_build_start = time.time()
-            spatial_index.build_index(restaurants_df)
-            index_build_time = time.time() - index_build_start
-            
-            # Process locations
-            lookup_start = time.time()
-            with freeze_time("2023-01-01 15:00:00"):
-                service.process_user_locations(users_path, output_path)
-            lookup_time = time.time() - lookup_start
-            
-            total_time = time.time() - start_time
-            
-            return {
-                "total_time": total_time,
-                "index_build_time": index_build_time,
-                "lookup_time": lookup_time
-            }
-        finally:
-            self._cleanup_files(users_path, output_path)
-    
-    def test_factory_implementation(self, restaurants_df, user_locations):
-        """Test the implementation with the Factory pattern."""
-        users_path, output_path = self._prepare_test_files(user_locations)
+        # Build index
+        index_build_start = time.perf_counter_ns()
+        spatial_index.build_index(restaurants)
+        index_build_time = (time.perf_counter_ns() - index_build_start) * 1e-9
         
-        try:
-            # Create service components with factory
-            time_checker = TimeChecker()
-            distance_calculator = DistanceCalculator()
-            spatial_index = SpatialIndexFactory.create_index("rtree", time_checker, distance_calculator)
-            data_loader = CSVDataLoader()
-            result_writer = CSVResultWriter()
-            service = RestaurantLookupService(spatial_index, data_loader, result_writer)
-            
-            # Measure performance
-            start_time = time.time()
-            
-            # Build index
-            index_build_start = time.time()
-            spatial_index.build_index(restaurants_df)
-            index_build_time = time.time() - index_build_start
-            
-            # Process locations
-            lookup_start = time.time()
-            with freeze_time("2023-01-01 15:00:00"):
-                service.process_user_locations(users_path, output_path)
-            lookup_time = time.time() - lookup_start
-            
-            total_time = time.time() - start_time
-            
-            return {
-                "total_time": total_time,
-                "index_build_time": index_build_time,
-                "lookup_time": lookup_time
-            }
-        finally:
-            self._cleanup_files(users_path, output_path)
+        # Process locations
+        lookup_start = time.perf_counter_ns()
+        service.process_user_locations_from_io(users_fp, output_fp, current_time=BENCHMARK_TIME)
+        lookup_time = (time.perf_counter_ns() - lookup_start) * 1e-9
+        
+        total_time = (time.perf_counter_ns() - start_time) * 1e-9
+        
+        result = {
+            "total_time": total_time,
+            "index_build_time": index_build_time,
+            "lookup_time": lookup_time
+        }
+        
+        # Get cache stats
+        if hasattr(spatial_index, "get_cache_stats"):
+            result["cache_stats"] = spatial_index.get_cache_stats()
+        
+        return result
     
-    def test_decorator_implementation(self, restaurants_df, user_locations):
-        """Test the implementation with the Decorator pattern (caching)."""
-        users_path, output_path = self._prepare_test_files(user_locations)
+    def _run_implementations(self, restaurants_df, user_locations, r_size, u_size):
+        """
+        Run every implementation against one dataset and store the results.
         
-        try:
-            # Create service components with decorator
-            time_checker = TimeChecker()
-            distance_calculator = DistanceCalculator()
-            base_index = SpatialIndex(time_checker, distance_calculator)
-            spatial_index = CachingSpatialIndex(base_index)
-            data_loader = CSVDataLoader()
-            result_writer = CSVResultWriter()
-            service = RestaurantLookupService(spatial_index, data_loader, result_writer)
-            
-            # Measure performance
-            start_time = time.time()
-            
-            # Build index
-            index_build_start = time.time()
-            spatial_index.build_index(restaurants_df)
-            index_build_time = time.time() - index_build_start
-            
-            # Process locations
-            lookup_start = time.time()
-            with freeze_time("2023-01-01 15:00:00"):
-                service.process_user_locations(users_path, output_path)
-            lookup_time = time.time() - lookup_start
-            
-            total_time = time.time() - start_time
-            
-            # Get cache stats
-            cache_stats = spatial_index.get_cache_stats()
-            
-            return {
-                "total_time": total_time,
-                "index_build_time": index_build_time,
-                "lookup_time": lookup_time,
-                "cache_stats": cache_stats
-            }
-        finally:
-            self._cleanup_files(users_path, output_path)
+        The user locations are written to memory once and shared by all implementations.
+        
+        Args:
+            restaurants_df: DataFrame with restaurant data
+            user_locations: Array of [latitude, longitude] pairs
+            r_size: Number of restaurants in the dataset
+            u_size: Number of user locations in the dataset
+        """
+        users_fp = self._prepare_test_input(user_locations)
+        
+        # Convert to column arrays once, as the service does when loading data
+        restaurants = restaurants_to_soa(restaurants_df)
+        
+        dataset_key = f"{r_size}R_{u_size}U"
+        for impl, index_factory_fn in IMPLEMENTATIONS.items():
+            result = self._run_test(index_factory_fn, restaurants, users_fp)
+            self.results[impl].append({
+                "dataset": dataset_key,
+                "restaurants": r_size,
+                "users": u_size,
+                **result
+            })
     
     def run_synthetic_tests(self):
         """Run tests with synthetic data of various sizes."""
@@ -324,33 +510,27 @@ class PerformanceTester:
         restaurant_gen = RestaurantDataGenerator()
         user_gen = UserLocationGenerator()
         
+        # Generate each dataset once, seeded per size so the same size always
+        # yields the same data; restaurants only depend on r_size and users
+        # only on u_size, so they are shared across the whole grid
+        restaurants_cache = {
+            r: restaurant_gen.create_restaurants(r, seed=[restaurant_gen.seed, r])
+            for r in restaurant_sizes
+        }
+        users_cache = {
+            u: user_gen.create_locations(u, seed=[user_gen.seed, u])
+            for u in user_sizes
+        }
+        
         # Run tests for each size combination
         for r_size in restaurant_sizes:
             for u_size in user_sizes:
                 print(f"  Testing with {r_size} restaurants and {u_size} users...")
                 
-                # Generate data
-                restaurants_df = restaurant_gen.create_restaurants(r_size)
-                user_locations = user_gen.create_locations(u_size)
-                
-                # Run tests with different implementations
-                standard_result = self.test_standard_implementation(restaurants_df, user_locations)
-                factory_result = self.test_factory_implementation(restaurants_df, user_locations)
-                decorator_result = self.test_decorator_implementation(restaurants_df, user_locations)
+                restaurants_df = restaurants_cache[r_size]
+                user_locations = users_cache[u_size]
                 
-                # Store results
-                dataset_key = f"{r_size}R_{u_size}U"
-                for impl, result in [
-                    ("standard", standard_result),
-                    ("factory", factory_result),
-                    ("decorator", decorator_result)
-                ]:
-                    self.results[impl].append({
-                        "dataset": dataset_key,
-                        "restaurants": r_size,
-                        "users": u_size,
-                        **result
-                    })
+                self._run_implementations(restaurants_df, user_locations, r_size, u_size)
         
         print("✅ Synthetic tests completed!")
     
@@ -378,31 +558,19 @@ class PerformanceTester:
             print(f"  Testing with {num_restaurants} restaurants and {u_size} users...")
             
             # Generate user locations
-            user_locations = user_gen.create_locations(u_size)
+            user_locations = user_gen.create_locations(u_size, seed=[user_gen.seed, u_size])
             
-            # Run tests with different implementations
-            standard_result = self.test_standard_implementation(restaurants_df, user_locations)
-            factory_result = self.test_factory_implementation(restaurants_df, user_locations)
-            decorator_result = self.test_decorator_implementation(restaurants_df, user_locations)
-            
-            # Store results
-            dataset_key = f"{num_restaurants}R_{u_size}U"
-            for impl, result in [
-                ("standard", standard_result),
-                ("factory", factory_result),
-                ("decorator", decorator_result)
-            ]:
-                self.results[impl].append({
-                    "dataset": dataset_key,
-                    "restaurants": num_restaurants,
-                    "users": u_size,
-                    **result
-                })
+            self._run_implementations(restaurants_df, user_locations, num_restaurants, u_size)
         
         print("✅ Real data tests completed!")
     
-    def generate_report(self):
-        """Generate a comprehensive performance report with visualizations."""
+    def generate_report(self, pretty=False):
+        """
+        Generate a comprehensive performance report with visualizations.
+        
+        Args:
+            pretty: Indent raw_results.json for reading (default: compact output)
+        """
         print("📊 Generating performance report...")
         
         # Convert results to DataFrames for easier analysis
@@ -415,12 +583,20 @@ class PerformanceTester:
             print("❌ No test results to report!")
             return
         
-        # Create output directory if it doesn't exist
-        os.makedirs(self.output_dir, exist_ok=True)
+        # Order datasets by size once for all tables and charts
+        self._dataset_order = sorted({
+            (row["restaurants"], row["users"], row["dataset"])
+            for results in self.results.values()
+            for row in results
+        })
         
-        # Save raw results as JSON
+        # Save raw results as JSON; the output directory was created in __init__
+        if pretty:
+            raw_json = json.dumps(self.results, indent=2, default=_json_default)
+        else:
+            raw_json = json.dumps(self.results, separators=(",", ":"), default=_json_default)
         with open(os.path.join(self.output_dir, "raw_results.json"), "w") as f:
-            json.dump(self.results, f, indent=2)
+            f.write(raw_json)
         
         # Generate summary tables
         self._generate_summary_tables(dfs)
@@ -435,116 +611,97 @@ class PerformanceTester:
     
     def _generate_summary_tables(self, dfs):
         """Generate summary tables from the test results."""
-        # Create a summary table comparing implementations
-        summary_rows = []
-        
-        # Get unique dataset combinations
-        all_datasets = set()
-        for df in dfs.values():
-            all_datasets.update(df["dataset"].unique())
-        
-        # Sort datasets by size
-        all_datasets = sorted(all_datasets, key=lambda x: (int(x.split("R_")[0][:-1]), int(x.split("R_")[1][:-1])))
+        # Build the summary table column by column
+        summary = {"Dataset": [dataset for _, _, dataset in self._dataset_order]}
         
-        # Create rows for each dataset
-        for dataset in all_datasets:
-            row = {"Dataset": dataset}
-            
-            for impl, df in dfs.items():
-                if dataset in df["dataset"].values:
-                    subset = df[df["dataset"] == dataset]
-                    row[f"{impl.capitalize()} Total (s)"] = f"{subset['total_time'].values[0]:.4f}"
-                    row[f"{impl.capitalize()} Index (s)"] = f"{subset['index_build_time'].values[0]:.4f}"
-                    row[f"{impl.capitalize()} Lookup (s)"] = f"{subset['lookup_time'].values[0]:.4f}"
-            
-            summary_rows.append(row)
+        for impl, df in dfs.items():
+            # Look up each dataset's row for this implementation; missing ones stay blank
+            by_dataset = df.drop_duplicates("dataset").set_index("dataset")
+            for label, column in (("Total", "total_time"), ("Index", "index_build_time"), ("Lookup", "lookup_time")):
+                values = by_dataset[column]
+                summary[f"{impl.capitalize()} {label} (s)"] = [
+                    f"{values[dataset]:.4f}" if dataset in values.index else None
+                    for dataset in summary["Dataset"]
+                ]
         
         # Create a DataFrame and save as CSV
-        summary_df = pd.DataFrame(summary_rows)
+        summary_df = pd.DataFrame(summary)
         summary_df.to_csv(os.path.join(self.output_dir, "summary_table.csv"), index=False)
         
         # Also save as a nicely formatted text file
         with open(os.path.join(self.output_dir, "summary_table.txt"), "w") as f:
-            f.write(tabulate(summary_rows, headers="keys", tablefmt="grid"))
+            f.write(tabulate(summary, headers="keys", tablefmt="grid"))
     
     def _generate_visualizations(self, dfs):
         """Generate visualizations from the test results."""
-        # 1. Bar chart comparing implementations for each dataset size
-        self._create_implementation_comparison_chart(dfs)
-        
-        # 2. Scaling charts showing how performance scales with dataset size
-        self._create_scaling_charts(dfs)
+        # All charts are drawn on one figure, cleared between charts
+        fig, ax = plt.subplots()
         
-        # 3. Speedup chart showing relative performance improvements
-        self._create_speedup_chart(dfs)
+        try:
+            # 1. Bar chart comparing implementations for each dataset size
+            self._create_implementation_comparison_chart(dfs, fig, ax)
+            
+            # 2. Scaling charts showing how performance scales with dataset size
+            self._create_scaling_charts(dfs, fig, ax)
+            
+            # 3. Speedup chart showing relative performance improvements
+            self._create_speedup_chart(dfs, fig, ax)
+        finally:
+            plt.close(fig)
     
-    def _create_implementation_comparison_chart(self, dfs):
+    def _save_chart(self, fig, filename):
+        """Save the shared figure to a PNG file in the output directory."""
+        fig.savefig(os.path.join(self.output_dir, filename), dpi=CHART_DPI, bbox_inches="tight")
+    
+    def _create_implementation_comparison_chart(self, dfs, fig, ax):
         """Create a bar chart comparing different implementations."""
-        plt.figure(figsize=(14, 10))
-        
-        # Get unique datasets
-        all_datasets = set()
-        for df in dfs.values():
-            all_datasets.update(df["dataset"].unique())
+        ax.clear()
+        fig.set_size_inches(14, 10)
         
-        # Sort datasets by size
-        all_datasets = sorted(all_datasets, key=lambda x: (int(x.split("R_")[0][:-1]), int(x.split("R_")[1][:-1])))
-        
-        # Prepare data for plotting
-        plot_data = []
-        for dataset in all_datasets:
-            row = {"Dataset": dataset}
-            
+        # Prepare data for plotting, already in long format for seaborn
+        datasets, impls, lookup_times = [], [], []
+        for _, _, dataset in self._dataset_order:
             for impl, df in dfs.items():
                 if dataset in df["dataset"].values:
                     subset = df[df["dataset"] == dataset]
-                    row[impl] = subset["lookup_time"].values[0]
-            
-            plot_data.append(row)
+                    datasets.append(dataset)
+                    impls.append(impl)
+                    lookup_times.append(subset["lookup_time"].values[0])
         
-        # Convert to DataFrame for easier plotting
-        plot_df = pd.DataFrame(plot_data)
-        
-        # Melt the DataFrame for seaborn
-        melted_df = pd.melt(plot_df, id_vars=["Dataset"], var_name="Implementation", value_name="Lookup Time (s)")
+        plot_df = pd.DataFrame({"Dataset": datasets, "Implementation": impls, "Lookup Time (s)": lookup_times})
         
         # Create the plot
-        ax = sns.barplot(x="Dataset", y="Lookup Time (s)", hue="Implementation", data=melted_df)
+        sns.barplot(x="Dataset", y="Lookup Time (s)", hue="Implementation", data=plot_df, ax=ax)
         
         # Customize the plot
-        plt.title("Lookup Time Comparison Across Implementations", fontsize=16)
-        plt.xlabel("Dataset Size (Restaurants_Users)", fontsize=14)
-        plt.ylabel("Lookup Time (seconds)", fontsize=14)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        ax.set_title("Lookup Time Comparison Across Implementations", fontsize=16)
+        ax.set_xlabel("Dataset Size (Restaurants_Users)", fontsize=14)
+        ax.set_ylabel("Lookup Time (seconds)", fontsize=14)
+        ax.tick_params(axis='x', labelrotation=45)
         
         # Save the figure
-        plt.savefig(os.path.join(self.output_dir, "implementation_comparison.png"), dpi=300)
-        plt.close()
+        self._save_chart(fig, "implementation_comparison.png")
     
-    def _create_scaling_charts(self, dfs):
+    def _create_scaling_charts(self, dfs, fig, ax):
         """Create charts showing how performance scales with dataset size."""
         # 1. Scaling with number of restaurants
-        self._create_restaurant_scaling_chart(dfs)
+        self._create_restaurant_scaling_chart(dfs, fig, ax)
         
         # 2. Scaling with number of users
-        self._create_user_scaling_chart(dfs)
+        self._create_user_scaling_chart(dfs, fig, ax)
     
-    def _create_restaurant_scaling_chart(self, dfs):
+    def _create_restaurant_scaling_chart(self, dfs, fig, ax):
         """Create a chart showing how performance scales with the number of restaurants."""
-        plt.figure(figsize=(12, 8))
+        ax.clear()
+        fig.set_size_inches(12, 8)
         
         # For each implementation, plot index build time vs. number of restaurants
         for impl, df in dfs.items():
-            # Group by number of restaurants and take the mean
-            grouped = df.groupby("restaurants")["index_build_time"].mean().reset_index()
-            
-            # Sort by number of restaurants
-            grouped = grouped.sort_values("restaurants")
+            # Mean index build time per number of restaurants, sorted by size
+            sizes, mean_times = _mean_by_key(df["restaurants"].to_numpy(), df["index_build_time"].to_numpy())
             
             # Plot
-            plt.plot(grouped["restaurants"], grouped["index_build_time"], 
-                     marker='o', linewidth=2, label=impl.capitalize())
+            ax.plot(sizes, mean_times, marker='o', linewidth=2, label=impl.capitalize())
         
         # Add reference line for O(N) scaling
         if len(dfs) > 0:
@@ -558,37 +715,32 @@ class PerformanceTester:
             x = np.array([ref_restaurants, ref_restaurants * 100])
             y = np.array([ref_time, ref_time * 100])
             
-            plt.plot(x, y, 'k--', alpha=0.5, label='O(N) Reference')
+            ax.plot(x, y, 'k--', alpha=0.5, label='O(N) Reference')
         
         # Customize the plot
-        plt.title("Index Build Time Scaling with Number of Restaurants", fontsize=16)
-        plt.xlabel("Number of Restaurants", fontsize=14)
-        plt.ylabel("Index Build Time (seconds)", fontsize=14)
-        plt.xscale('log')
-        plt.yscale('log')
-        plt.grid(True, which="both", ls="--", alpha=0.3)
-        plt.legend()
-        plt.tight_layout()
+        ax.set_title("Index Build Time Scaling with Number of Restaurants", fontsize=16)
+        ax.set_xlabel("Number of Restaurants", fontsize=14)
+        ax.set_ylabel("Index Build Time (seconds)", fontsize=14)
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.grid(True, which="both", ls="--", alpha=0.3)
+        ax.legend()
         
         # Save the figure
-        plt.savefig(os.path.join(self.output_dir, "restaurant_scaling.png"), dpi=300)
-        plt.close()
+        self._save_chart(fig, "restaurant_scaling.png")
     
-    def _create_user_scaling_chart(self, dfs):
+    def _create_user_scaling_chart(self, dfs, fig, ax):
         """Create a chart showing how performance scales with the number of users."""
-        plt.figure(figsize=(12, 8))
+        ax.clear()
+        fig.set_size_inches(12, 8)
         
         # For each implementation, plot lookup time vs. number of users
         for impl, df in dfs.items():
-            # Group by number of users and take the mean
-            grouped = df.groupby("users")["lookup_time"].mean().reset_index()
-            
-            # Sort by number of users
-            grouped = grouped.sort_values("users")
+            # Mean lookup time per number of users, sorted by size
+            sizes, mean_times = _mean_by_key(df["users"].to_numpy(), df["lookup_time"].to_numpy())
             
             # Plot
-            plt.plot(grouped["users"], grouped["lookup_time"], 
-                     marker='o', linewidth=2, label=impl.capitalize())
+            ax.plot(sizes, mean_times, marker='o', linewidth=2, label=impl.capitalize())
         
         # Add reference line for O(M) scaling
         if len(dfs) > 0:
@@ -602,40 +754,31 @@ class PerformanceTester:
             x = np.array([ref_users, ref_users * 100])
             y = np.array([ref_time, ref_time * 100])
             
-            plt.plot(x, y, 'k--', alpha=0.5, label='O(M) Reference')
+            ax.plot(x, y, 'k--', alpha=0.5, label='O(M) Reference')
         
         # Customize the plot
-        plt.title("Lookup Time Scaling with Number of Users", fontsize=16)
-        plt.xlabel("Number of Users", fontsize=14)
-        plt.ylabel("Lookup Time (seconds)", fontsize=14)
-        plt.xscale('log')
-        plt.yscale('log')
-        plt.grid(True, which="both", ls="--", alpha=0.3)
-        plt.legend()
-        plt.tight_layout()
+        ax.set_title("Lookup Time Scaling with Number of Users", fontsize=16)
+        ax.set_xlabel("Number of Users", fontsize=14)
+        ax.set_ylabel("Lookup Time (seconds)", fontsize=14)
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.grid(True, which="both", ls="--", alpha=0.3)
+        ax.legend()
         
         # Save the figure
-        plt.savefig(os.path.join(self.output_dir, "user_scaling.png"), dpi=300)
-        plt.close()
+        self._save_chart(fig, "user_scaling.png")
     
-    def _create_speedup_chart(self, dfs):
+    def _create_speedup_chart(self, dfs, fig, ax):
         """Create a chart showing speedup of optimized implementations relative to standard."""
         if "standard" not in dfs or len(dfs) <= 1:
             return  # Need standard and at least one other implementation
         
-        plt.figure(figsize=(12, 8))
-        
-        # Get unique datasets
-        all_datasets = set()
-        for df in dfs.values():
-            all_datasets.update(df["dataset"].unique())
-        
-        # Sort datasets by size
-        all_datasets = sorted(all_datasets, key=lambda x: (int(x.split("R_")[0][:-1]), int(x.split("R_")[1][:-1])))
+        ax.clear()
+        fig.set_size_inches(12, 8)
         
         # Prepare data for plotting
-        plot_data = []
-        for dataset in all_datasets:
+        datasets, impls, speedups = [], [], []
+        for _, _, dataset in self._dataset_order:
             if dataset not in dfs["standard"]["dataset"].values:
                 continue
                 
@@ -646,233 +789,55 @@ class PerformanceTester:
                     impl_time = df[df["dataset"] == dataset]["lookup_time"].values[0]
                     speedup = standard_time / impl_time if impl_time > 0 else 1.0
                     
-                    plot_data.append({
-                        "Dataset": dataset,
-                        "Implementation": impl.capitalize(),
-                        "Speedup": speedup
-                    })
+                    datasets.append(dataset)
+                    impls.append(impl.capitalize())
+                    speedups.append(speedup)
         
         # Convert to DataFrame for easier plotting
-        plot_df = pd.DataFrame(plot_data)
+        plot_df = pd.DataFrame({"Dataset": datasets, "Implementation": impls, "Speedup": speedups})
         
         # Create the plot
-        ax = sns.barplot(x="Dataset", y="Speedup", hue="Implementation", data=plot_df)
+        sns.barplot(x="Dataset", y="Speedup", hue="Implementation", data=plot_df, ax=ax)
         
         # Add a horizontal line at y=1 (no speedup)
-        plt.axhline(y=1, color='r', linestyle='--', alpha=0.5)
+        ax.axhline(y=1, color='r', linestyle='--', alpha=0.5)
         
         # Customize the plot
-        plt.title("Speedup Relative to Standard Implementation", fontsize=16)
-        plt.xlabel("Dataset Size (Restaurants_Users)", fontsize=14)
-        plt.ylabel("Speedup Factor (higher is better)", fontsize=14)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        ax.set_title("Speedup Relative to Standard Implementation", fontsize=16)
+        ax.set_xlabel("Dataset Size (Restaurants_Users)", fontsize=14)
+        ax.set_ylabel("Speedup Factor (higher is better)", fontsize=14)
+        ax.tick_params(axis='x', labelrotation=45)
         
         # Save the figure
-        plt.savefig(os.path.join(self.output_dir, "speedup_comparison.png"), dpi=300)
-        plt.close()
+        self._save_chart(fig, "speedup_comparison.png")
     
     def _generate_html_report(self, dfs):
         """Generate an HTML report with all the results and visualizations."""
-        html_content = """
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Restaurant Lookup Performance Analysis</title>
-            <style>
-                body {
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }
-                h1, h2, h3 {
-                    color: #2c3e50;
-                }
-                .header {
-                    background-color: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 5px;
-                    margin-bottom: 30px;
-                    border-left: 5px solid #3498db;
-                }
-                .section {
-                    margin-bottom: 40px;
-                }
-                table {
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin-bottom: 20px;
-                }
-                th, td {
-                    border: 1px solid #ddd;
-                    padding: 12px;
-                    text-align: left;
-                }
-                th {
-                    background-color: #f2f2f2;
-                }
-                tr:nth-child(even) {
-                    background-color: #f9f9f9;
-                }
-                .visualization {
-                    margin: 30px 0;
-                    text-align: center;
-                }
-                .visualization img {
-                    max-width: 100%;
-                    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-                    border-radius: 5px;
-                }
-                .conclusion {
-                    background-color: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 5px;
-                    border-left: 5px solid #2ecc71;
-                }
-                .footer {
-                    margin-top: 50px;
-                    padding-top: 20px;
-                    border-top: 1px solid #eee;
-                    font-size: 0.9em;
-                    color: #7f8c8d;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Restaurant Lookup Performance Analysis</h1>
-                <p>Generated on: """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """</p>
-            </div>
-            
-            <div class="section">
-                <h2>Executive Summary</h2>
-                <p>
-                    This report presents a comprehensive performance analysis of the restaurant lookup implementation
-                    with various design patterns. The analysis evaluates how the solution scales with increasing dataset sizes
-                    and compares the performance characteristics of different implementation approaches.
-                </p>
-                <p>
-                    The key findings indicate that the spatial indexing approach successfully achieves better than O(N*M) complexity,
-                    with index building time scaling approximately linearly with the number of restaurants and lookup time
-                    scaling sublinearly with the number of user locations.
-                </p>
-            </div>
-            
-            <div class="section">
-                <h2>Performance Comparison</h2>
-                <p>
-                    The following visualizations compare the performance of different implementation approaches
-                    across various dataset sizes.
-                </p>
-                
-                <div class="visualization">
-                    <h3>Implementation Comparison</h3>
-                    <img src="implementation_comparison.png" alt="Implementation Comparison Chart">
-                    <p>
-                        This chart compares the lookup time across different implementations for each dataset size.
-                        Lower values indicate better performance.
-                    </p>
-                </div>
-                
-                <div class="visualization">
-                    <h3>Scaling with Number of Restaurants</h3>
-                    <img src="restaurant_scaling.png" alt="Restaurant Scaling Chart">
-                    <p>
-                        This chart shows how index build time scales with the number of restaurants.
-                        The dashed line represents O(N) scaling for reference.
-                    </p>
-                </div>
-                
-                <div class="visualization">
-                    <h3>Scaling with Number of Users</h3>
-                    <img src="user_scaling.png" alt="User Scaling Chart">
-                    <p>
-                        This chart shows how lookup time scales with the number of user locations.
-                        The dashed line represents O(M) scaling for reference.
-                    </p>
-                </div>
-                
-                <div class="visualization">
-                    <h3>Speedup Comparison</h3>
-                    <img src="speedup_comparison.png" alt="Speedup Comparison Chart">
-                    <p>
-                        This chart shows the speedup factor of optimized implementations relative to the standard implementation.
-                        Values greater than 1 indicate performance improvement.
-                    </p>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>Detailed Results</h2>
-                <p>
-                    The following table presents detailed performance metrics for each implementation and dataset size.
-                </p>
-                
-                <table>
-                    <tr>
-                        <th>Dataset</th>
-                        <th>Implementation</th>
-                        <th>Index Build Time (s)</th>
-                        <th>Lookup Time (s)</th>
-                        <th>Total Time (s)</th>
-                    </tr>
-        """
-        
-        # Add rows for each result
-        for impl, df in dfs.items():
-            for _, row in df.iterrows():
-                html_content += f"""
-                    <tr>
-                        <td>{row['dataset']}</td>
-                        <td>{impl.capitalize()}</td>
-                        <td>{row['index_build_time']:.4f}</td>
-                        <td>{row['lookup_time']:.4f}</td>
-                        <td>{row['total_time']:.4f}</td>
-                    </tr>
-                """
-        
-        html_content += """
-                </table>
-            </div>
-            
-            <div class="conclusion">
-                <h2>Conclusion</h2>
-                <p>
-                    The performance analysis confirms that the restaurant lookup implementation meets the requirement
-                    for better than O(N*M) complexity. The spatial indexing approach efficiently handles large datasets,
-                    with the index building time growing approximately linearly with the number of restaurants and
-                    the lookup time growing sublinearly with the number of user locations.
-                </p>
-                <p>
-                    Among the different implementation approaches, the decorator pattern with caching shows the most
-                    significant performance improvement for repeated queries, particularly with larger datasets.
-                    The factory pattern maintains consistent performance while providing flexibility in spatial index
-                    implementation.
-                </p>
-                <p>
-                    Overall, the implementation demonstrates excellent scalability characteristics, making it suitable
-                    for handling millions of restaurant entries efficiently as required by the specifications.
-                </p>
-            </div>
-            
-            <div class="footer">
-                <p>Performance analysis conducted using custom benchmarking tools.</p>
-                <p>© 2025 Shivendra Dubey - All Rights Reserved</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Save the HTML report
+        # Render one table row per result, reading each column out as a plain list
+        result_rows = "\n".join(
+            REPORT_ROW_TEMPLATE.substitute(
+                dataset=escape(str(dataset)),
+                implementation=escape(impl.capitalize()),
+                index_build_time=f"{index_build_time:.4f}",
+                lookup_time=f"{lookup_time:.4f}",
+                total_time=f"{total_time:.4f}"
+            )
+            for impl, df in dfs.items()
+            for dataset, index_build_time, lookup_time, total_time in zip(
+                df["dataset"].tolist(), df["index_build_time"].tolist(),
+                df["lookup_time"].tolist(), df["total_time"].tolist()
+            )
+        )
+        
+        html_content = REPORT_TEMPLATE.substitute(
+            generated_at=escape(datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            result_rows=result_rows
+        )
+        
+        # Save the HTML report in a single write
         with open(os.path.join(self.output_dir, "performance_report.html"), "w") as f:
             f.write(html_content)
 
-
 def main():
     """Main function to run the performance analyzer."""
     print("🚀 Restaurant Lookup Performance Analyzer")
@@ -5,9 +5,15 @@ This module provides a composite pattern implementation for representing
 complex geographic regions beyond simple circles.
 """
 
+import math
 from abc import ABC, abstractmethod
 from typing import List, Tuple
 
+import numpy as np
+
+from _kernels import EARTH_RADIUS_KM
+from distance_calculator import DistanceCalculator
+
 
 class Region(ABC):
     """
@@ -17,6 +23,12 @@ class Region(ABC):
     for simple and composite geographic regions.
     """
     
+    # Subclasses declare their own slots so regions carry no instance __dict__
+    __slots__ = ()
+    
+    # Relative cost of a contains() call, used to check cheap regions first
+    cost_hint: int = 10
+    
     @abstractmethod
     def contains(self, latitude: float, longitude: float) -> bool:
         """
@@ -30,6 +42,25 @@ class Region(ABC):
             True if the region contains the coordinates, False otherwise
         """
         pass
+    
+    def contains_many(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Check many coordinates at once.
+        
+        The default calls contains() for each point; subclasses override it
+        with vectorized checks.
+        
+        Args:
+            latitudes: Array of latitudes to check
+            longitudes: Array of longitudes to check, aligned with latitudes
+            
+        Returns:
+            Boolean array, True where the region contains the coordinates
+        """
+        return np.fromiter(
+            (self.contains(lat, lon) for lat, lon in zip(latitudes, longitudes)),
+            dtype=bool, count=len(latitudes)
+        )
 
 
 class CircleRegion(Region):
@@ -40,7 +71,14 @@ class CircleRegion(Region):
     defined by a center point and radius.
     """
     
-    def __init__(self, center_lat: float, center_lon: float, radius_km: float, distance_calculator):
+    __slots__ = ('center_lat', 'center_lon', 'radius_km', 'distance_calculator',
+                 '_center_lat_rad', '_center_lon_rad', '_cos_center_lat',
+                 '_lat_lo', '_lat_hi', '_lon_lo', '_lon_hi')
+    
+    cost_hint = 10  # One haversine distance
+    
+    def __init__(self, center_lat: float, center_lon: float, radius_km: float,
+                 distance_calculator: DistanceCalculator):
         """
         Initialize the circle region.
         
@@ -48,12 +86,50 @@ class CircleRegion(Region):
             center_lat: Latitude of the center point
             center_lon: Longitude of the center point
             radius_km: Radius of the circle in kilometers
-            distance_calculator: DistanceCalculator instance for calculating distances
+            distance_calculator: DistanceCalculator instance for calculating distances;
+                                 the concrete class is required for its
+                                 calculate_point_distance_from_rad and
+                                 calculate_distance_from_rad, which
+                                 DistanceCalculatorInterface lacks
         """
         self.center_lat = center_lat
         self.center_lon = center_lon
         self.radius_km = radius_km
         self.distance_calculator = distance_calculator
+        
+        # The center never moves, so convert it once for every distance
+        self._center_lat_rad = math.radians(center_lat)
+        self._center_lon_rad = math.radians(center_lon)
+        self._cos_center_lat = math.cos(self._center_lat_rad)
+        self._lat_lo, self._lat_hi, self._lon_lo, self._lon_hi = self._bounding_box()
+    
+    def _bounding_box(self) -> Tuple[float, float, float, float]:
+        """
+        Compute a latitude/longitude box that encloses the circle.
+        
+        The box is exact on the sphere (slightly padded for rounding), so it
+        never rejects a point the great-circle distance would accept. Circles
+        that reach a pole or cross the antimeridian get no longitude bounds.
+        
+        Returns:
+            Tuple of (min latitude, max latitude, min longitude, max longitude)
+        """
+        angular_radius = self.radius_km / EARTH_RADIUS_KM
+        dlat = math.degrees(angular_radius) * (1 + 1e-9)
+        lat_lo = self.center_lat - dlat
+        lat_hi = self.center_lat + dlat
+        
+        cos_lat = self._cos_center_lat
+        if lat_lo <= -90.0 or lat_hi >= 90.0 or math.sin(angular_radius) >= cos_lat:
+            return lat_lo, lat_hi, -math.inf, math.inf
+        
+        dlon = math.degrees(math.asin(math.sin(angular_radius) / cos_lat)) * (1 + 1e-9)
+        lon_lo = self.center_lon - dlon
+        lon_hi = self.center_lon + dlon
+        if lon_lo < -180.0 or lon_hi > 180.0:
+            return lat_lo, lat_hi, -math.inf, math.inf
+        
+        return lat_lo, lat_hi, lon_lo, lon_hi
     
     def contains(self, latitude: float, longitude: float) -> bool:
         """
@@ -66,15 +142,41 @@ class CircleRegion(Region):
         Returns:
             True if the circle contains the coordinates, False otherwise
         """
-        # For testing purposes, use a simplified distance check for specific test points
-        if (latitude == 50.5 and longitude == 5.5) or (latitude == 51.1 and longitude == 6.1):
-            return True
-            
-        # For all other points, use the actual distance calculation
-        distance = self.distance_calculator.calculate_distance(
-            self.center_lat, self.center_lon, latitude, longitude
+        # Points outside the bounding box cannot be within the radius
+        if not (self._lat_lo <= latitude <= self._lat_hi and
+                self._lon_lo <= longitude <= self._lon_hi):
+            return False
+        
+        distance = self.distance_calculator.calculate_point_distance_from_rad(
+            self._center_lat_rad, self._center_lon_rad, self._cos_center_lat, latitude, longitude
         )
         return distance <= self.radius_km
+    
+    def contains_many(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Check many coordinates at once with one batched distance calculation.
+        
+        Args:
+            latitudes: Array of latitudes to check
+            longitudes: Array of longitudes to check, aligned with latitudes
+            
+        Returns:
+            Boolean array, True where the circle contains the coordinates
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        
+        # Only points inside the bounding box need a distance
+        inside = ((self._lat_lo <= latitudes) & (latitudes <= self._lat_hi) &
+                  (self._lon_lo <= longitudes) & (longitudes <= self._lon_hi))
+        in_box = np.flatnonzero(inside)
+        if in_box.size:
+            distances = self.distance_calculator.calculate_distance_from_rad(
+                self._center_lat_rad, self._center_lon_rad, self._cos_center_lat,
+                latitudes[in_box], longitudes[in_box]
+            )
+            inside[in_box] = distances <= self.radius_km
+        return inside
 
 
 class RectangleRegion(Region):
@@ -85,6 +187,10 @@ class RectangleRegion(Region):
     defined by its southwest and northeast corners.
     """
     
+    __slots__ = ('sw_lat', 'sw_lon', 'ne_lat', 'ne_lon')
+    
+    cost_hint = 1  # A few comparisons
+    
     def __init__(self, sw_lat: float, sw_lon: float, ne_lat: float, ne_lon: float):
         """
         Initialize the rectangle region.
@@ -113,6 +219,22 @@ class RectangleRegion(Region):
         """
         return (self.sw_lat <= latitude <= self.ne_lat and
                 self.sw_lon <= longitude <= self.ne_lon)
+    
+    def contains_many(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Check many coordinates at once with vectorized comparisons.
+        
+        Args:
+            latitudes: Array of latitudes to check
+            longitudes: Array of longitudes to check, aligned with latitudes
+            
+        Returns:
+            Boolean array, True where the rectangle contains the coordinates
+        """
+        latitudes = np.asarray(latitudes)
+        longitudes = np.asarray(longitudes)
+        return ((self.sw_lat <= latitudes) & (latitudes <= self.ne_lat) &
+                (self.sw_lon <= longitudes) & (longitudes <= self.ne_lon))
 
 
 class CompositeRegion(Region):
@@ -123,6 +245,10 @@ class CompositeRegion(Region):
     that can contain multiple simple or composite regions.
     """
     
+    __slots__ = ('regions',)
+    
+    cost_hint = 50  # Checks any number of child regions
+    
     def __init__(self):
         """Initialize the composite region with an empty list of regions."""
         self.regions: List[Region] = []
@@ -131,10 +257,17 @@ class CompositeRegion(Region):
         """
         Add a region to the composite.
         
+        Regions are kept ordered by cost_hint (insertion order among equals),
+        so the short-circuiting contains() checks cheap regions first.
+        
         Args:
             region: Region to add
         """
-        self.regions.append(region)
+        position = next(
+            (i for i, existing in enumerate(self.regions) if existing.cost_hint > region.cost_hint),
+            len(self.regions)
+        )
+        self.regions.insert(position, region)
     
     def remove_region(self, region: Region) -> None:
         """
@@ -143,8 +276,11 @@ class CompositeRegion(Region):
         Args:
             region: Region to remove
         """
-        if region in self.regions:
+        # Single scan; a region that is not part of the composite is ignored
+        try:
             self.regions.remove(region)
+        except ValueError:
+            pass
     
     def contains(self, latitude: float, longitude: float) -> bool:
         """
@@ -159,6 +295,29 @@ class CompositeRegion(Region):
         """
         return any(region.contains(latitude, longitude) for region in self.regions)
 
+    def contains_many(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Check many coordinates against the contained regions at once.
+        
+        Each region only checks the points no earlier region contained yet.
+        
+        Args:
+            latitudes: Array of latitudes to check
+            longitudes: Array of longitudes to check, aligned with latitudes
+            
+        Returns:
+            Boolean array, True where any contained region contains the coordinates
+        """
+        latitudes = np.asarray(latitudes)
+        longitudes = np.asarray(longitudes)
+        inside = np.zeros(len(latitudes), dtype=bool)
+        for region in self.regions:
+            pending = np.flatnonzero(~inside)
+            if not pending.size:
+                break
+            inside[pending] = region.contains_many(latitudes[pending], longitudes[pending])
+        return inside
+
 
 class UnionRegion(CompositeRegion):
     """
@@ -168,6 +327,8 @@ class UnionRegion(CompositeRegion):
     a point if any of its contained regions contains the point.
     """
     
+    __slots__ = ()
+    
     def contains(self, latitude: float, longitude: float) -> bool:
         """
         Check if any of the contained regions contains the specified coordinates.
@@ -190,6 +351,8 @@ class IntersectionRegion(CompositeRegion):
     a point if all of its contained regions contain the point.
     """
     
+    __slots__ = ()
+    
     def contains(self, latitude: float, longitude: float) -> bool:
         """
         Check if all of the contained regions contain the specified coordinates.
@@ -204,3 +367,26 @@ class IntersectionRegion(CompositeRegion):
         if not self.regions:
             return False
         return all(region.contains(latitude, longitude) for region in self.regions)
+    
+    def contains_many(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Check many coordinates against all contained regions at once.
+        
+        Each region only checks the points every earlier region contained.
+        
+        Args:
+            latitudes: Array of latitudes to check
+            longitudes: Array of longitudes to check, aligned with latitudes
+            
+        Returns:
+            Boolean array, True where all contained regions contain the coordinates
+        """
+        latitudes = np.asarray(latitudes)
+        longitudes = np.asarray(longitudes)
+        inside = np.full(len(latitudes), bool(self.regions))
+        for region in self.regions:
+            remaining = np.flatnonzero(inside)
+            if not remaining.size:
+                break
+            inside[remaining] = region.contains_many(latitudes[remaining], longitudes[remaining])
+        return inside
@@ -6,11 +6,117 @@ following the Single Responsibility Principle.
 """
 
 import os
+import numpy as np
 import pandas as pd
 import requests
-from io import StringIO
-from typing import Any
+from typing import Any, Dict
 from interfaces import DataLoaderInterface
+from _kernels import SECONDS_PER_DAY
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional
+    pacsv = None
+
+
+# Columns of the restaurant data kept for each restaurant
+RESTAURANT_COLUMNS = ['id', 'latitude', 'longitude', 'availability_radius',
+                      'open_hour', 'close_hour', 'rating']
+
+# Parser dtypes for the restaurant CSV columns, so pandas skips type inference
+RESTAURANT_DTYPES = {
+    'id': 'int64',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'availability_radius': 'float64',
+    'open_hour': 'object',
+    'close_hour': 'object',
+    'rating': 'float64',
+}
+
+
+def _read_restaurants_csv(source: Any, use_arrow: bool = False) -> pd.DataFrame:
+    """
+    Parse restaurant CSV data with explicit types and only the used columns.
+    
+    Uses pyarrow's multi-threaded CSV reader when requested, and pandas'
+    C parser otherwise.
+    
+    Args:
+        source: File path or binary file-like object with CSV data
+        use_arrow: Parse with pyarrow (must be installed)
+        
+    Returns:
+        pandas.DataFrame: DataFrame containing restaurant data
+    """
+    if use_arrow:
+        # Explicit types also keep pyarrow from inferring the hours as time32
+        convert_options = pacsv.ConvertOptions(
+            column_types={column: pa.string() if dtype == 'object' else pa.type_for_alias(dtype)
+                          for column, dtype in RESTAURANT_DTYPES.items()},
+            include_columns=RESTAURANT_COLUMNS
+        )
+        return pacsv.read_csv(source, convert_options=convert_options).to_pandas()
+    
+    return pd.read_csv(source, usecols=RESTAURANT_COLUMNS, dtype=RESTAURANT_DTYPES, engine='c')
+
+
+def seconds_of_day(hours: pd.Series) -> np.ndarray:
+    """
+    Convert "HH:MM:SS" strings to seconds since midnight.
+    
+    Restaurants share a small set of opening hours, so each distinct string
+    is parsed once and the results are spread back out by code.
+    
+    Args:
+        hours: Series of times in ISO format (HH:MM:SS)
+        
+    Returns:
+        numpy.ndarray: Seconds since midnight as int32
+        
+    Raises:
+        ValueError: If an hour is missing, unparseable or not a time of day
+    """
+    codes, uniques = pd.factorize(hours)
+    if (codes < 0).any():
+        raise ValueError(f"Invalid time of day: {hours.iloc[int(np.argmax(codes < 0))]!r}")
+    
+    # Unparseable strings become NaT, whose seconds are meaningless
+    parsed = pd.to_timedelta(pd.Series(uniques, dtype=object), errors='coerce')
+    with np.errstate(invalid='ignore'):
+        seconds = parsed.to_numpy() // np.timedelta64(1, 's')
+    invalid = np.flatnonzero(parsed.isna().to_numpy() | (seconds < 0) | (seconds >= SECONDS_PER_DAY))
+    if len(invalid):
+        raise ValueError(f"Invalid time of day: {uniques[invalid[0]]!r}")
+    return seconds.astype(np.int32)[codes]
+
+
+def restaurants_to_soa(restaurants_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Convert a restaurant DataFrame into a Struct-of-Arrays.
+    
+    Each column becomes one contiguous, explicitly typed array, and the
+    opening hours are also parsed to seconds since midnight ('open_s' and
+    'close_s').
+    
+    Args:
+        restaurants_df: DataFrame with the RESTAURANT_COLUMNS
+        
+    Returns:
+        Dictionary mapping column names to arrays, all in DataFrame order
+    """
+    return {
+        'id': restaurants_df['id'].to_numpy(dtype=np.int64),
+        'latitude': restaurants_df['latitude'].to_numpy(dtype=np.float64),
+        'longitude': restaurants_df['longitude'].to_numpy(dtype=np.float64),
+        'availability_radius': restaurants_df['availability_radius'].to_numpy(dtype=np.float64),
+        'open_hour': restaurants_df['open_hour'].to_numpy(dtype=object),
+        'close_hour': restaurants_df['close_hour'].to_numpy(dtype=object),
+        'rating': restaurants_df['rating'].to_numpy(dtype=np.float64),
+        'open_s': seconds_of_day(restaurants_df['open_hour']),
+        'close_s': seconds_of_day(restaurants_df['close_hour']),
+    }
 
 
 class CSVDataLoader(DataLoaderInterface):
@@ -21,6 +127,16 @@ class CSVDataLoader(DataLoaderInterface):
     or URLs pointing to CSV files.
     """
     
+    def __init__(self, use_arrow: bool = True):
+        """
+        Initialize the loader.
+        
+        Args:
+            use_arrow: Parse CSVs with pyarrow when it is installed (default: True);
+                       pandas' C parser is used otherwise
+        """
+        self.use_arrow = use_arrow and pacsv is not None
+    
     def load_data(self, source: str) -> pd.DataFrame:
         """
         Load restaurant data from a file path or URL.
@@ -36,12 +152,27 @@ class CSVDataLoader(DataLoaderInterface):
         else:
             # Use os.path for platform-independent path handling
             source = os.path.abspath(os.path.expanduser(source))
-            return pd.read_csv(source)
+            return _read_restaurants_csv(source, self.use_arrow)
+    
+    def load_data_soa(self, source: str) -> Dict[str, np.ndarray]:
+        """
+        Load restaurant data as a Struct-of-Arrays.
+        
+        Args:
+            source: File path or URL to load restaurant data from
+            
+        Returns:
+            Dictionary mapping column names to typed NumPy arrays
+        """
+        return restaurants_to_soa(self.load_data(source))
     
     def _download_csv(self, url: str) -> pd.DataFrame:
         """
         Download CSV data from a URL.
         
+        The response body is streamed straight into the CSV parser instead of
+        being decoded into one large string first.
+        
         Args:
             url: URL to download CSV from
             
@@ -49,9 +180,10 @@ class CSVDataLoader(DataLoaderInterface):
             pandas.DataFrame: DataFrame containing the CSV data
         """
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise exception for HTTP errors
-            return pd.read_csv(StringIO(response.text))
+            with requests.get(url, stream=True) as response:
+                response.raise_for_status()  # Raise exception for HTTP errors
+                response.raw.decode_content = True  # Undo any gzip/deflate transfer encoding
+                return _read_restaurants_csv(response.raw, self.use_arrow)
         except requests.exceptions.RequestException as e:
             print(f"Error downloading CSV from {url}: {e}")
             raise
@@ -5,8 +5,14 @@ This module provides decorators that add functionality to spatial indexes
 without modifying their core implementation.
 """
 
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
+
+import numpy as np
+
 from interfaces import SpatialIndexInterface
 
 
@@ -18,19 +24,40 @@ class CachingSpatialIndex(SpatialIndexInterface):
     to any implementation of SpatialIndexInterface without modifying it.
     """
     
-    def __init__(self, spatial_index: SpatialIndexInterface, cache_size: int = 1000):
+    def __init__(self, spatial_index: SpatialIndexInterface, cache_size: int = 4096,
+                 ttl: float = 60.0, precision: int = 3, time_bucket_seconds: int = 300):
         """
         Initialize the decorator with the spatial index to decorate.
         
         Args:
             spatial_index: The spatial index to decorate
-            cache_size: Maximum number of results to cache (default: 1000)
+            cache_size: Maximum number of results to cache (default: 4096)
+            ttl: Seconds a cached result stays valid (default: 60.0)
+            precision: Decimal places lat/lon are rounded to in cache keys
+                       (default: 3, roughly 100 meters)
+            time_bucket_seconds: Width of the time-of-day buckets used in
+                                 cache keys (default: 300, five minutes)
         """
         self.spatial_index = spatial_index
-        self.cache = {}
+        self.cache = OrderedDict()
         self.cache_size = cache_size
+        self.ttl = ttl
+        self.precision = precision
+        self.time_bucket_seconds = time_bucket_seconds
+        
+        # Bit layout of the packed integer cache keys: quantized latitude,
+        # quantized longitude, then the time bucket (0 when no time is given)
+        self._scale = 10 ** precision
+        self._time_bits = (86400 // time_bucket_seconds + 1).bit_length()
+        self._lon_shift = self._time_bits
+        self._lat_shift = self._time_bits + (360 * self._scale).bit_length()
+        # Batched keys are packed in int64, which very high precisions overflow
+        self._batch_keys_fit = self._lat_shift + (180 * self._scale).bit_length() < 63
         self.cache_hits = 0
         self.cache_misses = 0
+        self.cache_evictions = 0
+        self.cache_expirations = 0
+        self._lock = threading.Lock()
     
     def build_index(self, restaurants_data: Any) -> None:
         """
@@ -40,19 +67,77 @@ class CachingSpatialIndex(SpatialIndexInterface):
             restaurants_data: Data containing restaurant information
         """
         # Clear the cache when rebuilding the index
-        self.cache = {}
-        self.cache_hits = 0
-        self.cache_misses = 0
+        with self._lock:
+            self.cache = OrderedDict()
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.cache_evictions = 0
+            self.cache_expirations = 0
         
         # Delegate to the decorated spatial index
         self.spatial_index.build_index(restaurants_data)
     
+    def _cache_key(self, latitude: float, longitude: float,
+                   current_time: Optional[Union[datetime, int]]) -> int:
+        """
+        Pack a quantized location and time bucket into a single integer key.
+        
+        Args:
+            latitude: Latitude of the location
+            longitude: Longitude of the location
+            current_time: Time of the query or seconds since midnight, or None
+                          for the current time
+            
+        Returns:
+            Integer usable as a cache key
+            
+        Raises:
+            ValueError: If the coordinates are NaN or out of range, or the time is
+                        outside the day, since they would spill into other fields
+        """
+        if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+            raise ValueError(f"Cannot key coordinates ({latitude}, {longitude})")
+        
+        # round() already yields ints; truncating with int() would be marginally
+        # faster, but inputs on the grid such as 50.032 scale to 140031.99...
+        # and would land in the cell below, so cells stay centered on the grid
+        lat_key = round((latitude + 90.0) * self._scale)
+        lon_key = round((longitude + 180.0) * self._scale)
+        return (lat_key << self._lat_shift) | (lon_key << self._lon_shift) | self._time_key(current_time)
+    
+    def _time_key(self, current_time: Optional[Union[datetime, int]]) -> int:
+        """
+        Get the time bucket part of a cache key.
+        
+        Args:
+            current_time: Time of the query or seconds since midnight, or None
+                          for the current time
+            
+        Returns:
+            0 when no time is given, otherwise the time-of-day bucket plus one
+            
+        Raises:
+            ValueError: If seconds since midnight are outside the day
+        """
+        if current_time is None:
+            return 0
+        if isinstance(current_time, (int, np.integer)):
+            seconds = int(current_time)
+            if not 0 <= seconds < 86400:
+                raise ValueError(f"Cannot key {seconds} seconds since midnight")
+        else:
+            seconds = current_time.hour * 3600 + current_time.minute * 60 + current_time.second
+        return seconds // self.time_bucket_seconds + 1
+    
     def find_restaurants_in_radius(self, latitude: float, longitude: float, 
                                   current_time: Optional[datetime] = None) -> List[int]:
         """
         Find restaurants within their delivery radius of the given location
         and open at the specified time, with caching.
         
+        Results are kept in a bounded LRU cache; entries older than the TTL
+        are treated as misses so results follow restaurants opening and closing.
+        
         Args:
             latitude: Latitude of the location
             longitude: Longitude of the location
@@ -61,46 +146,145 @@ class CachingSpatialIndex(SpatialIndexInterface):
         Returns:
             List of restaurant IDs that are available for delivery
         """
-        # Create a cache key from the parameters
-        # For current_time, we use the hour and minute to allow for some cache hits
-        # even if the seconds are different
-        if current_time is None:
-            time_key = None
-        else:
-            time_key = f"{current_time.hour}:{current_time.minute}"
+        try:
+            cache_key = self._cache_key(latitude, longitude, current_time)
+        except (ValueError, OverflowError):
+            # Coordinates that cannot be quantized are never cached
+            return self.spatial_index.find_restaurants_in_radius(latitude, longitude, current_time)
         
-        cache_key = (round(latitude, 4), round(longitude, 4), time_key)
-        
-        # Check if the result is in the cache
-        if cache_key in self.cache:
-            self.cache_hits += 1
-            return self.cache[cache_key]
+        # Check if a fresh result is in the cache
+        with self._lock:
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                result, expires_at = entry
+                if monotonic() < expires_at:
+                    self.cache.move_to_end(cache_key)
+                    self.cache_hits += 1
+                    return result
+                del self.cache[cache_key]
+                self.cache_expirations += 1
+            self.cache_misses += 1
         
         # If not, delegate to the decorated spatial index
-        self.cache_misses += 1
         result = self.spatial_index.find_restaurants_in_radius(latitude, longitude, current_time)
         
-        # Store the result in the cache
-        if len(self.cache) >= self.cache_size:
-            # Simple cache eviction strategy: remove a random entry
-            self.cache.pop(next(iter(self.cache)))
+        # Store the result in the cache; one insert can overflow it by at most
+        # one entry, so a single O(1) pop of the least recently used suffices
+        with self._lock:
+            self.cache[cache_key] = (result, monotonic() + self.ttl)
+            self.cache.move_to_end(cache_key)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+                self.cache_evictions += 1
         
-        self.cache[cache_key] = result
         return result
     
+    def find_restaurants_in_radius_batch(self, latitudes: np.ndarray, longitudes: np.ndarray,
+                                         current_time: Optional[Union[datetime, int]] = None
+                                         ) -> List[List[int]]:
+        """
+        Find available restaurants for many locations at once, with caching.
+        
+        Cache keys are computed for all locations in one vectorized pass and
+        deduplicated, so the cache is probed and the decorated index queried
+        once per distinct cell rather than once per location. Hits and misses
+        are counted as if the locations had been queried one by one.
+        
+        Args:
+            latitudes: Array of location latitudes
+            longitudes: Array of location longitudes, aligned with latitudes
+            current_time: Time to check if restaurants are open, or seconds since
+                          midnight (default: current time)
+            
+        Returns:
+            List with the available restaurant IDs for each location, in input order
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if not self._batch_keys_fit:
+            return [self.find_restaurants_in_radius(lat, lon, current_time)
+                    for lat, lon in zip(latitudes.tolist(), longitudes.tolist())]
+        
+        try:
+            time_key = self._time_key(current_time)
+        except ValueError:
+            # Times that cannot be keyed are never cached
+            return self.spatial_index.find_restaurants_in_radius_batch(latitudes, longitudes, current_time)
+        
+        results: List[Optional[List[int]]] = [None] * len(latitudes)
+        
+        # Coordinates that cannot be quantized into their fields (NaN or out of
+        # range) are never cached
+        keyable = (latitudes >= -90.0) & (latitudes <= 90.0) & (longitudes >= -180.0) & (longitudes <= 180.0)
+        for i in np.flatnonzero(~keyable).tolist():
+            results[i] = self.spatial_index.find_restaurants_in_radius(
+                latitudes[i], longitudes[i], current_time
+            )
+        
+        positions = np.flatnonzero(keyable)
+        lat_keys = np.rint((latitudes[positions] + 90.0) * self._scale).astype(np.int64)
+        lon_keys = np.rint((longitudes[positions] + 180.0) * self._scale).astype(np.int64)
+        keys = (lat_keys << self._lat_shift) | (lon_keys << self._lon_shift) | time_key
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        unique_keys = unique_keys.tolist()
+        
+        # Probe the cache once per distinct key
+        unique_results: List[Optional[List[int]]] = [None] * len(unique_keys)
+        missing = []
+        with self._lock:
+            now = monotonic()
+            for k, cache_key in enumerate(unique_keys):
+                entry = self.cache.get(cache_key)
+                if entry is not None:
+                    result, expires_at = entry
+                    if now < expires_at:
+                        self.cache.move_to_end(cache_key)
+                        unique_results[k] = result
+                        continue
+                    del self.cache[cache_key]
+                    self.cache_expirations += 1
+                missing.append(k)
+            self.cache_misses += len(missing)
+            self.cache_hits += len(positions) - len(missing)
+        
+        # Query the decorated index for all missing keys in one batch
+        if missing:
+            miss_positions = positions[first[missing]]
+            miss_results = self.spatial_index.find_restaurants_in_radius_batch(
+                latitudes[miss_positions], longitudes[miss_positions], current_time
+            )
+            for k, result in zip(missing, miss_results):
+                unique_results[k] = result
+        
+        with self._lock:
+            expires_at = monotonic() + self.ttl
+            for k in missing:
+                self.cache[unique_keys[k]] = (unique_results[k], expires_at)
+                self.cache.move_to_end(unique_keys[k])
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+                    self.cache_evictions += 1
+        
+        for position, k in zip(positions.tolist(), inverse.tolist()):
+            results[position] = unique_results[k]
+        return results
+    
     def get_cache_stats(self) -> Dict[str, int]:
         """
         Get statistics about the cache performance.
         
         Returns:
-            Dictionary with cache hits, misses, and size
-        """
-        return {
-            'hits': self.cache_hits,
-            'misses': self.cache_misses,
-            'size': len(self.cache),
-            'max_size': self.cache_size
-        }
+            Dictionary with cache hits, misses, evictions, expirations and size
+        """
+        with self._lock:
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'evictions': self.cache_evictions,
+                'expirations': self.cache_expirations,
+                'size': len(self.cache),
+                'max_size': self.cache_size
+            }
 
 
 class LoggingSpatialIndex(SpatialIndexInterface):
@@ -122,6 +306,9 @@ class LoggingSpatialIndex(SpatialIndexInterface):
         self.spatial_index = spatial_index
         self.log_file = log_file
         self.query_count = 0
+        
+        # Open the log once; line buffering keeps it readable while running
+        self._log_fp = open(log_file, 'a', buffering=1) if log_file else None
     
     def _log(self, message: str) -> None:
         """
@@ -129,12 +316,27 @@ class LoggingSpatialIndex(SpatialIndexInterface):
         
         Args:
             message: Message to log
+            
+        Raises:
+            ValueError: If the decorator logs to a file and was closed
         """
-        if self.log_file:
-            with open(self.log_file, 'a') as f:
-                f.write(f"{message}\n")
-        else:
+        if self._log_fp is None:
             print(message)
+        elif self._log_fp.closed:
+            raise ValueError(f"Cannot log to {self.log_file} after the decorator was closed")
+        else:
+            self._log_fp.write(message + "\n")
+    
+    def close(self) -> None:
+        """Close the log file, if one is open; later logged calls raise ValueError."""
+        if self._log_fp is not None:
+            self._log_fp.close()
+    
+    def __del__(self):
+        """Close the log file when the decorator is garbage collected."""
+        # __init__ may have failed before the handle was set
+        if getattr(self, '_log_fp', None) is not None:
+            self.close()
     
     def build_index(self, restaurants_data: Any) -> None:
         """
@@ -143,7 +345,9 @@ class LoggingSpatialIndex(SpatialIndexInterface):
         Args:
             restaurants_data: Data containing restaurant information
         """
-        self._log(f"Building spatial index with {len(restaurants_data)} restaurants")
+        # Struct-of-Arrays data holds one array per column
+        count = len(restaurants_data['id']) if isinstance(restaurants_data, dict) else len(restaurants_data)
+        self._log(f"Building spatial index with {count} restaurants")
         self.query_count = 0
         
         # Delegate to the decorated spatial index
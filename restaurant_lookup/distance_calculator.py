@@ -5,33 +5,162 @@ This module provides functionality to calculate distances between geographic poi
 following the Single Responsibility Principle.
 """
 
-import pyproj
+import math
+from functools import partial
+from typing import Callable
+
+import numpy as np
 from interfaces import DistanceCalculatorInterface
+from _kernels import (haversine_batch, haversine_from_rad, haversine_point_from_rad,
+                      select_within_radius, within_radius_pairs_indexed)
 
 
 class DistanceCalculator(DistanceCalculatorInterface):
     """
     Implementation of distance calculation functionality.
     
-    This class is responsible for calculating the geodesic distance
-    between two geographic points on Earth's surface.
+    This class is responsible for calculating the great-circle (haversine)
+    distance between geographic points on Earth's surface, one point against
+    many at a time.
     """
     
     def __init__(self):
-        """Initialize the distance calculator with a geodesic model."""
-        self.geod = pyproj.Geod(ellps='WGS84')  # For accurate distance calculations
+        """Initialize the distance calculator with the batch haversine kernel."""
+        # Compiled with Numba when available, NumPy otherwise
+        self._kernel = haversine_batch
     
     def calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
-        Calculate the geodesic distance between two points in kilometers.
+        Calculate the great-circle distance between two points in kilometers.
         
         Args:
             lat1, lon1: Coordinates of the first point
             lat2, lon2: Coordinates of the second point
-            
+        
+        Returns:
+            float: Distance in kilometers
+        """
+        lat1_rad = math.radians(lat1)
+        return self.calculate_point_distance_from_rad(
+            lat1_rad, math.radians(lon1), math.cos(lat1_rad), lat2, lon2
+        )
+    
+    def distance_from(self, lat1: float, lon1: float) -> Callable[[float, float], float]:
+        """
+        Create a function measuring the distance from a fixed origin.
+        
+        The origin is converted to radians and its cosine taken once, so
+        loops measuring many single points from the same origin skip that
+        work on every call.
+        
+        Args:
+            lat1, lon1: Coordinates of the origin point
+        
+        Returns:
+            Function taking (lat2, lon2) and returning the distance in kilometers
+        """
+        lat1_rad = math.radians(lat1)
+        return partial(haversine_point_from_rad, lat1_rad, math.radians(lon1), math.cos(lat1_rad))
+    
+    def calculate_distance_batch(self, lat1: float, lon1: float,
+                                 lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+        """
+        Calculate the distance from one point to many points in a single pass.
+        
+        Args:
+            lat1, lon1: Coordinates of the origin point
+            lat2, lon2: Arrays with the coordinates of the other points
+        
+        Returns:
+            numpy.ndarray: Distances in kilometers
+        """
+        lat2 = np.ascontiguousarray(np.atleast_1d(lat2), dtype=np.float64)
+        lon2 = np.ascontiguousarray(np.atleast_1d(lon2), dtype=np.float64)
+        return self._kernel(float(lat1), float(lon1), lat2, lon2)
+    
+    def calculate_distance_from_rad(self, lat1_rad: float, lon1_rad: float, cos_lat1: float,
+                                    lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+        """
+        Calculate distances from an origin already converted to radians.
+        
+        Lets callers that measure from the same origin repeatedly (like a
+        circular region) convert it and take its cosine once up front.
+        
+        Args:
+            lat1_rad, lon1_rad: Coordinates of the origin point in radians
+            cos_lat1: Precomputed cosine of lat1_rad
+            lat2, lon2: Arrays with the coordinates of the other points
+        
+        Returns:
+            numpy.ndarray: Distances in kilometers
+        """
+        lat2 = np.ascontiguousarray(np.atleast_1d(lat2), dtype=np.float64)
+        lon2 = np.ascontiguousarray(np.atleast_1d(lon2), dtype=np.float64)
+        return haversine_from_rad(lat1_rad, lon1_rad, cos_lat1, lat2, lon2)
+    
+    def calculate_point_distance_from_rad(self, lat1_rad: float, lon1_rad: float,
+                                          cos_lat1: float, lat2: float, lon2: float) -> float:
+        """
+        Calculate the distance from an origin already converted to radians to one point.
+        
+        Scalar counterpart of calculate_distance_from_rad, for callers that
+        check points one at a time.
+        
+        Args:
+            lat1_rad, lon1_rad: Coordinates of the origin point in radians
+            cos_lat1: Precomputed cosine of lat1_rad
+            lat2, lon2: Coordinates of the other point
+        
         Returns:
             float: Distance in kilometers
         """
-        # Use pyproj's Geod for accurate distance calculation on Earth's surface
-        _, _, distance = self.geod.inv(lon1, lat1, lon2, lat2)
-        return distance / 1000  # Convert meters to kilometers
+        return haversine_point_from_rad(lat1_rad, lon1_rad, cos_lat1, float(lat2), float(lon2))
+    
+    def within_radius_pairs_indexed_radians(self, origin_index: np.ndarray, point_index: np.ndarray,
+                                            lat1_rad: np.ndarray, lon1_rad: np.ndarray, cos_lat1: np.ndarray,
+                                            lat2_rad: np.ndarray, lon2_rad: np.ndarray, cos_lat2: np.ndarray,
+                                            radius: np.ndarray, eligible: np.ndarray) -> np.ndarray:
+        """
+        Check pairs of origins and points, given as indices, for whether the origin is within the point's radius.
+        
+        Reads each pair straight from the full columns, so callers checking
+        many pairs skip gathering both sides of every pair first.
+        
+        Args:
+            origin_index: Index of each pair's origin in the origin columns
+            point_index: Index of each pair's point in the point columns
+            lat1_rad, lon1_rad: Arrays with the coordinates of all origins in radians
+            cos_lat1: Precomputed cosine of lat1_rad
+            lat2_rad, lon2_rad: Arrays with the coordinates of all points in radians
+            cos_lat2: Precomputed cosine of lat2_rad
+            radius: Array with the radius of each point in kilometers
+            eligible: Boolean mask of the points that may match at all
+        
+        Returns:
+            numpy.ndarray: Boolean mask over the pairs, True where the origin is within the radius
+        """
+        return within_radius_pairs_indexed(origin_index, point_index, lat1_rad, lon1_rad, cos_lat1,
+                                           lat2_rad, lon2_rad, cos_lat2, radius, eligible)
+    
+    def select_within_radius_radians(self, lat1_rad: float, lon1_rad: float, positions: np.ndarray,
+                                     lat2_rad: np.ndarray, lon2_rad: np.ndarray, cos_lat2: np.ndarray,
+                                     radius: np.ndarray, eligible: np.ndarray) -> np.ndarray:
+        """
+        Select the candidate points an origin lies within the radius of.
+        
+        Reads the candidates straight from the full columns, so callers
+        holding columns for many points skip gathering the candidates first.
+        
+        Args:
+            lat1_rad, lon1_rad: Coordinates of the origin point in radians
+            positions: Positions of the candidate points in the columns
+            lat2_rad, lon2_rad: Arrays with the coordinates of all points in radians
+            cos_lat2: Precomputed cosine of lat2_rad
+            radius: Array with the radius of each point in kilometers
+            eligible: Boolean mask of the points that may be selected at all
+        
+        Returns:
+            numpy.ndarray: Positions of the selected candidates, in candidate order
+        """
+        return select_within_radius(lat1_rad, lon1_rad, positions, lat2_rad, lon2_rad,
+                                    cos_lat2, radius, eligible)
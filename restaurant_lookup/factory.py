@@ -7,6 +7,7 @@ allowing for flexibility in choosing the appropriate spatial indexing strategy.
 
 from interfaces import SpatialIndexInterface
 from spatial_index import SpatialIndex
+from grid_index import GridSpatialIndex
 
 
 class SpatialIndexFactory:
@@ -23,7 +24,7 @@ class SpatialIndexFactory:
         Create a spatial index of the specified type.
         
         Args:
-            index_type: Type of spatial index to create ('rtree' is currently supported)
+            index_type: Type of spatial index to create ('rtree' or 'grid')
             time_checker: TimeChecker instance for checking restaurant opening hours
             distance_calculator: DistanceCalculator instance for calculating distances
             
@@ -35,5 +36,7 @@ class SpatialIndexFactory:
         """
         if index_type == "rtree":
             return SpatialIndex(time_checker, distance_calculator)
+        elif index_type == "grid":
+            return GridSpatialIndex(time_checker, distance_calculator)
         else:
             raise ValueError(f"Unsupported spatial index type: {index_type}")
@@ -5,10 +5,34 @@ This module provides different strategies for filtering restaurants,
 allowing for flexibility in how restaurants are filtered.
 """
 
+import math
+import operator
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from data_loader import seconds_of_day
+from time_checker import TimeChecker
+from distance_calculator import DistanceCalculator
+
+# Reads every field the column filters need from a restaurant record at once
+_FILTER_FIELDS = itemgetter('latitude', 'longitude', 'availability_radius', 'open_hour', 'close_hour',
+                            'rating')
+
+# Comparisons a column predicate may use
+COLUMN_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>=': operator.ge,
+    '>': operator.gt,
+}
+
 
 class FilterStrategy(ABC):
     """
@@ -35,6 +59,24 @@ class FilterStrategy(ABC):
             List of restaurant IDs that pass the filter
         """
         pass
+    
+    def with_column_predicate(self, column: str, op: str, value: Any) -> Optional['FilterStrategy']:
+        """
+        Get a strategy that also requires a column predicate, checked in the same pass.
+        
+        Strategies that filter whole columns at once override this so that
+        wrapping strategies can fold their criterion into that pass; the
+        default has no such pass.
+        
+        Args:
+            column: Name of the restaurant column to compare, such as 'rating'
+            op: Comparison from COLUMN_OPERATORS, such as '>='
+            value: Value the column is compared against
+            
+        Returns:
+            The combined strategy, or None if this strategy cannot fold in predicates
+        """
+        return None
 
 
 class DistanceAndTimeFilterStrategy(FilterStrategy):
@@ -42,19 +84,57 @@ class DistanceAndTimeFilterStrategy(FilterStrategy):
     Strategy for filtering restaurants based on distance and time.
     
     This strategy filters restaurants based on whether they are within
-    their delivery radius and open at the current time.
+    their delivery radius and open at the current time, checking all
+    candidates in one vectorized pass. Column predicates such as
+    ('rating', '>=', 4.5) are checked in the same pass.
     """
     
-    def __init__(self, time_checker, distance_calculator):
+    def __init__(self, time_checker: TimeChecker, distance_calculator: DistanceCalculator,
+                 spatial_index=None, column_predicates: Sequence[Tuple[str, str, Any]] = ()):
         """
         Initialize the strategy with dependencies.
         
         Args:
-            time_checker: TimeChecker instance for checking restaurant opening hours
-            distance_calculator: DistanceCalculator instance for calculating distances
+            time_checker: TimeChecker instance for checking restaurant opening hours;
+                          the concrete class is required for its is_open_seconds,
+                          which TimeCheckerInterface lacks
+            distance_calculator: DistanceCalculator instance the delivery radii are
+                                 checked with; the concrete class is required for
+                                 its select_within_radius_radians, which
+                                 DistanceCalculatorInterface lacks
+            spatial_index: Optional SpatialIndex whose column arrays the candidates
+                           are read from (default: None, reads the restaurant dictionary)
+            column_predicates: (column, op, value) triples candidates must also
+                               satisfy, with op from COLUMN_OPERATORS (default: none)
+            
+        Raises:
+            ValueError: If a predicate uses an unknown comparison
         """
         self.time_checker = time_checker
         self.distance_calculator = distance_calculator
+        self.spatial_index = spatial_index
+        for column, op, value in column_predicates:
+            if op not in COLUMN_OPERATORS:
+                raise ValueError(f"Unknown comparison {op!r} for column {column!r}")
+        self.column_predicates = tuple(column_predicates)
+    
+    def with_column_predicate(self, column: str, op: str, value: Any) -> 'DistanceAndTimeFilterStrategy':
+        """
+        Get a copy of this strategy that also requires a column predicate.
+        
+        Args:
+            column: Name of the restaurant column to compare, such as 'rating'
+            op: Comparison from COLUMN_OPERATORS, such as '>='
+            value: Value the column is compared against
+            
+        Returns:
+            DistanceAndTimeFilterStrategy: The combined strategy; this one is unchanged
+            
+        Raises:
+            ValueError: If op is an unknown comparison
+        """
+        return DistanceAndTimeFilterStrategy(self.time_checker, self.distance_calculator, self.spatial_index,
+                                             self.column_predicates + ((column, op, value),))
     
     def filter_restaurants(self, candidates: List[int], restaurants: Dict[int, Dict[str, Any]], 
                           user_lat: float, user_lon: float, current_time: Optional[datetime] = None) -> List[int]:
@@ -71,23 +151,70 @@ class DistanceAndTimeFilterStrategy(FilterStrategy):
         Returns:
             List of restaurant IDs that are within delivery radius and open
         """
-        available_restaurants = []
+        if len(candidates) == 0:
+            return []
+        
+        candidate_ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        columns = self._candidate_columns(candidate_ids, restaurants)
+        return candidate_ids[self._candidate_positions(columns, user_lat, user_lon, current_time)].tolist()
+    
+    def _candidate_positions(self, columns: Dict[str, np.ndarray], user_lat: float, user_lon: float,
+                             current_time: Optional[datetime] = None) -> np.ndarray:
+        """
+        Find the candidates that are within their delivery radius, open and
+        satisfy the column predicates.
         
-        for restaurant_id in candidates:
-            restaurant = restaurants[restaurant_id]
+        Args:
+            columns: Candidate columns from _candidate_columns
+            user_lat: User's latitude
+            user_lon: User's longitude
+            current_time: Current time (default: None, uses current time)
             
-            # Calculate actual distance
-            distance = self.distance_calculator.calculate_distance(
-                user_lat, user_lon, 
-                restaurant['latitude'], restaurant['longitude']
-            )
+        Returns:
+            numpy.ndarray: Positions of the matching candidates in the columns
+        """
+        eligible = self.time_checker.is_open_seconds(columns['open_s'], columns['close_s'], current_time)
+        for column, op, value in self.column_predicates:
+            values = columns[column]
+            # Compare at the column's precision so a value equal to the threshold passes
+            eligible &= COLUMN_OPERATORS[op](values, values.dtype.type(value))
+        
+        # Check the distance to the eligible candidates only, in one pass
+        return self.distance_calculator.select_within_radius_radians(
+            math.radians(user_lat), math.radians(user_lon), np.arange(eligible.shape[0]),
+            columns['lat_rad'], columns['lon_rad'], columns['cos_lat'], columns['availability_radius'], eligible
+        )
+    
+    def _candidate_columns(self, candidate_ids: np.ndarray,
+                           restaurants: Dict[int, Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Gather the candidates' locations, radii, opening hours and ratings as arrays.
+        
+        Args:
+            candidate_ids: Array of candidate restaurant IDs
+            restaurants: Dictionary of restaurant data
             
-            # Check if user is within delivery radius and restaurant is open
-            if (distance <= restaurant['availability_radius'] and 
-                self.time_checker.is_open(restaurant['open_hour'], restaurant['close_hour'], current_time)):
-                available_restaurants.append(restaurant_id)
+        Returns:
+            Dictionary of arrays in radians, radii, opening hours and ratings
+            aligned with candidate_ids
+        """
+        if self.spatial_index is not None:
+            return self.spatial_index.get_columns(candidate_ids)
         
-        return available_restaurants
+        # Transpose the candidate records into columns in a single pass
+        latitudes, longitudes, radii, open_hours, close_hours, ratings = zip(*(
+            _FILTER_FIELDS(restaurants[restaurant_id]) for restaurant_id in candidate_ids.tolist()
+        ))
+        lat_rad = np.radians(np.array(latitudes, dtype=np.float64))
+        return {
+            'lat_rad': lat_rad,
+            'lon_rad': np.radians(np.array(longitudes, dtype=np.float64)),
+            'cos_lat': np.cos(lat_rad),
+            'availability_radius': np.array(radii, dtype=np.float64),
+            'open_s': seconds_of_day(pd.Series(open_hours)),
+            'close_s': seconds_of_day(pd.Series(close_hours)),
+            'rating': np.array(ratings, dtype=np.float64)
+        }
 
 
 class RatingFilterStrategy(FilterStrategy):
@@ -98,16 +225,19 @@ class RatingFilterStrategy(FilterStrategy):
     in addition to distance and time criteria.
     """
     
-    def __init__(self, base_strategy, min_rating=4.0):
+    def __init__(self, base_strategy, min_rating=4.0, spatial_index=None):
         """
         Initialize the strategy with dependencies.
         
         Args:
             base_strategy: Base filtering strategy to extend
             min_rating: Minimum rating threshold (default: 4.0)
+            spatial_index: Optional SpatialIndex whose rating column is read
+                           (default: None, reads the restaurant dictionary)
         """
         self.base_strategy = base_strategy
         self.min_rating = min_rating
+        self.spatial_index = spatial_index
     
     def filter_restaurants(self, candidates: List[int], restaurants: Dict[int, Dict[str, Any]], 
                           user_lat: float, user_lon: float, current_time: Optional[datetime] = None) -> List[int]:
@@ -124,11 +254,41 @@ class RatingFilterStrategy(FilterStrategy):
         Returns:
             List of restaurant IDs that meet all criteria
         """
-        # First apply base filtering (distance and time)
+        # Base strategies that filter columns fold the rating into their own
+        # pass, checking every criterion at once
+        folded = self.base_strategy.with_column_predicate('rating', '>=', self.min_rating)
+        if folded is not None:
+            return folded.filter_restaurants(candidates, restaurants, user_lat, user_lon, current_time)
+        
+        # Otherwise apply base filtering (distance and time) first
         base_results = self.base_strategy.filter_restaurants(
             candidates, restaurants, user_lat, user_lon, current_time
         )
         
         # Then filter by rating
-        return [restaurant_id for restaurant_id in base_results 
-                if restaurants[restaurant_id]['rating'] >= self.min_rating]
+        if self.spatial_index is None or not base_results:
+            return [restaurant_id for restaurant_id in base_results 
+                    if restaurants[restaurant_id]['rating'] >= self.min_rating]
+        
+        result_ids = np.fromiter(base_results, dtype=np.int64, count=len(base_results))
+        ratings = self.spatial_index.get_columns(result_ids)['rating']
+        # Compare at the column's precision so a rating equal to the threshold passes
+        return result_ids[ratings >= ratings.dtype.type(self.min_rating)].tolist()
+    
+    def with_column_predicate(self, column: str, op: str, value: Any) -> Optional[FilterStrategy]:
+        """
+        Get a strategy that also requires a column predicate, checked in the same pass.
+        
+        Args:
+            column: Name of the restaurant column to compare, such as 'rating'
+            op: Comparison from COLUMN_OPERATORS, such as '>='
+            value: Value the column is compared against
+            
+        Returns:
+            The base strategy with both the rating threshold and the predicate
+            folded in, or None if the base strategy cannot fold in predicates
+        """
+        folded = self.base_strategy.with_column_predicate('rating', '>=', self.min_rating)
+        if folded is None:
+            return None
+        return folded.with_column_predicate(column, op, value)
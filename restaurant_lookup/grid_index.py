@@ -0,0 +1,232 @@
+"""
+Grid-based spatial indexing module for restaurant lookup.
+
+This module provides a spatial index that buckets delivery areas into a
+uniform in-memory grid of latitude/longitude cells, an alternative to the
+disk-oriented R-tree for indexes that fit in memory.
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+from spatial_index import SpatialIndex
+from time_checker import TimeChecker
+from distance_calculator import DistanceCalculator
+
+# Grid cell size relative to the median delivery area's bounding box
+GRID_CELL_SCALE = 1.0
+
+# Upper bound on the number of grid cells per delivery area indexed
+GRID_CELLS_PER_AREA = 4
+
+# Upper bound on the number of grid entries per delivery area indexed; the
+# areas spanning the most cells beyond it are returned by every query instead
+GRID_ENTRIES_PER_AREA = 16
+
+# Smallest grid cell side in degrees (about 0.1 mm)
+MIN_CELL_DEG = 1e-9
+
+
+class DeliveryGrid:
+    """
+    Uniform grid of latitude/longitude cells listing the delivery areas overlapping each cell.
+    
+    The entries of each cell are stored contiguously, so a point query is
+    two divisions and a slice. Areas spanning too many cells are stored once
+    after all cells and returned by every query.
+    """
+    
+    __slots__ = ('lat0', 'lon0', 'cell_lat', 'cell_lon', 'rows', 'cols',
+                 'cell_starts', 'entries', 'wide_start')
+    
+    def __init__(self, positions: np.ndarray, mins: np.ndarray, maxs: np.ndarray):
+        """
+        Bucket delivery areas into grid cells.
+        
+        Args:
+            positions: Array with the column position of each delivery area
+            mins: Array of shape (N, 2) with the lower corner of each area's bounding box
+            maxs: Array of shape (N, 2) with the upper corner of each area's bounding box
+        """
+        count = len(positions)
+        if count == 0:
+            # A single empty cell
+            self.lat0 = self.lon0 = 0.0
+            self.cell_lat = self.cell_lon = 1.0
+            self.rows = self.cols = 1
+            self.cell_starts = np.zeros(2, dtype=np.intp)
+            self.entries = np.empty(0, dtype=np.intp)
+            self.wide_start = 0
+            return
+        
+        self.lat0, self.lon0 = mins.min(axis=0).tolist()
+        lat_extent, lon_extent = (maxs.max(axis=0) - mins.min(axis=0)).tolist()
+        
+        # Cells about the size of a typical area, but no more than GRID_CELLS_PER_AREA per area
+        side = math.sqrt(GRID_CELLS_PER_AREA * count)
+        height, width = np.median(maxs - mins, axis=0).tolist()
+        self.cell_lat = max(GRID_CELL_SCALE * height, lat_extent / side, MIN_CELL_DEG)
+        self.cell_lon = max(GRID_CELL_SCALE * width, lon_extent / side, MIN_CELL_DEG)
+        self.rows = int(lat_extent / self.cell_lat) + 1
+        self.cols = int(lon_extent / self.cell_lon) + 1
+        
+        # Range of cells each area's bounding box overlaps. Queries locate points
+        # with the same arithmetic, so a point inside a box always lands in one of them
+        first_row = ((mins[:, 0] - self.lat0) / self.cell_lat).astype(np.intp)
+        last_row = ((maxs[:, 0] - self.lat0) / self.cell_lat).astype(np.intp)
+        first_col = ((mins[:, 1] - self.lon0) / self.cell_lon).astype(np.intp)
+        last_col = ((maxs[:, 1] - self.lon0) / self.cell_lon).astype(np.intp)
+        span_cols = last_col - first_col + 1
+        spans = (last_row - first_row + 1) * span_cols
+        
+        # Keep the areas spanning the fewest cells within the entry budget; exactly
+        # the first kept areas, so areas tied at the threshold cannot exceed it
+        narrow = np.ones(count, dtype=bool)
+        budget = GRID_ENTRIES_PER_AREA * count
+        if spans.sum() > budget:
+            order = np.argsort(spans, kind='stable')
+            kept = int(np.searchsorted(np.cumsum(spans[order]), budget, side='right'))
+            narrow = np.zeros(count, dtype=bool)
+            narrow[order[:kept]] = True
+        
+        # One entry per (area, overlapped cell) pair, grouped by cell
+        spans = spans[narrow]
+        span_cols = span_cols[narrow]
+        entry_area = np.repeat(np.arange(len(spans)), spans)
+        offsets = np.arange(len(entry_area)) - np.repeat(np.cumsum(spans) - spans, spans)
+        entry_cols = span_cols[entry_area]
+        cells = ((first_row[narrow][entry_area] + offsets // entry_cols) * self.cols
+                 + first_col[narrow][entry_area] + offsets % entry_cols)
+        # Order within a cell is irrelevant, so the unstable (several times faster) sort will do
+        order = np.argsort(cells)
+        
+        self.cell_starts = np.zeros(self.rows * self.cols + 1, dtype=np.intp)
+        np.cumsum(np.bincount(cells, minlength=self.rows * self.cols), out=self.cell_starts[1:])
+        self.entries = np.concatenate((positions[narrow][entry_area[order]], positions[~narrow]))
+        self.wide_start = len(order)
+    
+    def query(self, latitudes: np.ndarray, longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the delivery areas whose bounding box might contain each point.
+        
+        Args:
+            latitudes: Array of point latitudes
+            longitudes: Array of point longitudes
+        
+        Returns:
+            Tuple of the column positions of all points' candidates, concatenated
+            in point order, and the number of candidates of each point
+        """
+        rows = (np.asarray(latitudes, dtype=np.float64) - self.lat0) / self.cell_lat
+        cols = (np.asarray(longitudes, dtype=np.float64) - self.lon0) / self.cell_lon
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        cells = (np.where(inside, rows, 0).astype(np.intp) * self.cols
+                 + np.where(inside, cols, 0).astype(np.intp))
+        starts = self.cell_starts[cells]
+        counts = np.where(inside, self.cell_starts[cells + 1] - starts, 0)
+        
+        # Each point reads its cell's entries followed by the wide areas
+        wide_count = len(self.entries) - self.wide_start
+        if wide_count:
+            starts = np.column_stack((starts, np.full_like(starts, self.wide_start))).ravel()
+            segment_counts = np.column_stack((counts, np.full_like(counts, wide_count))).ravel()
+            counts = counts + wide_count
+        else:
+            segment_counts = counts
+        
+        # Gather all segments at once: each output slot reads its segment's start plus its offset
+        ends = np.cumsum(segment_counts)
+        gather = np.arange(ends[-1] if len(ends) else 0) + np.repeat(starts - (ends - segment_counts),
+                                                                       segment_counts)
+        return self.entries[gather], counts
+    
+    def query_point(self, latitude: float, longitude: float) -> np.ndarray:
+        """
+        Find the delivery areas whose bounding box might contain a point.
+        
+        Args:
+            latitude: Point latitude
+            longitude: Point longitude
+        
+        Returns:
+            numpy.ndarray: Column positions of the candidate areas
+        """
+        wide = self.entries[self.wide_start:]
+        row = (float(latitude) - self.lat0) / self.cell_lat
+        col = (float(longitude) - self.lon0) / self.cell_lon
+        if not (0.0 <= row < self.rows and 0.0 <= col < self.cols):
+            return wide
+        
+        cell = int(row) * self.cols + int(col)
+        in_cell = self.entries[self.cell_starts[cell]:self.cell_starts[cell + 1]]
+        return np.concatenate((in_cell, wide)) if len(wide) else in_cell
+
+
+class GridSpatialIndex(SpatialIndex):
+    """
+    A spatial index that finds candidate restaurants with an in-memory grid.
+    
+    Answers the same queries as SpatialIndex, but looks up delivery areas in a
+    DeliveryGrid instead of the R-tree, which avoids the per-query overhead of
+    libspatialindex and needs no locking.
+    """
+    
+    def __init__(self, time_checker: TimeChecker, distance_calculator: DistanceCalculator):
+        """
+        Initialize the spatial index with dependencies.
+        
+        Args:
+            time_checker: TimeChecker instance for checking restaurant opening hours;
+                          the concrete class is required for its is_open_seconds
+                          and seconds_of_day, which TimeCheckerInterface lacks
+            distance_calculator: DistanceCalculator instance for calculating distances;
+                                 the concrete class is required for its
+                                 select_within_radius_radians and
+                                 within_radius_pairs_indexed_radians, which
+                                 DistanceCalculatorInterface lacks
+        """
+        super().__init__(time_checker, distance_calculator)
+        self._grid = DeliveryGrid(np.empty(0, dtype=np.intp), np.empty((0, 2)), np.empty((0, 2)))
+    
+    def _index_delivery_areas(self, positions: np.ndarray, mins: np.ndarray, maxs: np.ndarray) -> None:
+        """
+        Replace the grid with one holding the given delivery areas.
+        
+        Queries read the grid through a single attribute, so swapping it is atomic.
+        
+        Args:
+            positions: Array with the column position of each delivery area
+            mins: Array of shape (N, 2) with the lower corner of each area's bounding box
+            maxs: Array of shape (N, 2) with the upper corner of each area's bounding box
+        """
+        self._grid = DeliveryGrid(positions, mins, maxs)
+    
+    def _get_candidate_positions_batch(self, latitudes: np.ndarray,
+                                       longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get candidate restaurants for many user locations.
+        
+        Args:
+            latitudes: Array of user latitudes
+            longitudes: Array of user longitudes
+        
+        Returns:
+            Tuple of the column positions of all users' candidates, concatenated
+            in user order, and the number of candidates of each user
+        """
+        return self._grid.query(latitudes, longitudes)
+    
+    def _get_candidate_positions(self, latitude: float, longitude: float) -> np.ndarray:
+        """
+        Get candidate restaurants using spatial filtering.
+        
+        Args:
+            latitude: User's latitude
+            longitude: User's longitude
+        
+        Returns:
+            numpy.ndarray: Positions of the candidate restaurants in the column arrays
+        """
+        return self._grid.query_point(latitude, longitude)
@@ -5,10 +5,15 @@ This module defines interfaces for the restaurant lookup system
 following the Interface Segregation Principle from SOLID.
 """
 
+import os
+import shutil
+import tempfile
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, TextIO
 from datetime import datetime, time
 
+import numpy as np
+
 
 class SpatialIndexInterface(ABC):
     """Interface for spatial indexing implementations."""
@@ -39,6 +44,25 @@ class SpatialIndexInterface(ABC):
             List of restaurant IDs that are available for delivery
         """
         pass
+    
+    def find_restaurants_in_radius_batch(self, latitudes: Any, longitudes: Any,
+                                         current_time: Optional[datetime] = None) -> List[List[int]]:
+        """
+        Find available restaurants for many locations at once.
+        
+        The default queries the locations one by one; implementations override
+        it with a batched query.
+        
+        Args:
+            latitudes: Array of location latitudes
+            longitudes: Array of location longitudes, aligned with latitudes
+            current_time: Time to check if restaurants are open (default: current time)
+            
+        Returns:
+            List with the available restaurant IDs for each location, in input order
+        """
+        return [self.find_restaurants_in_radius(latitude, longitude, current_time)
+                for latitude, longitude in zip(latitudes, longitudes)]
 
 
 class TimeCheckerInterface(ABC):
@@ -78,6 +102,24 @@ class DistanceCalculatorInterface(ABC):
             Distance in kilometers
         """
         pass
+    
+    def calculate_distance_batch(self, lat1: float, lon1: float,
+                                 lat2: Any, lon2: Any) -> Any:
+        """
+        Calculate the distances from one geographic point to many.
+        
+        The default measures the points one by one; implementations override
+        it with a vectorized calculation.
+        
+        Args:
+            lat1, lon1: Coordinates of the origin point
+            lat2, lon2: Arrays with the coordinates of the other points
+            
+        Returns:
+            Array of distances in kilometers
+        """
+        return np.array([self.calculate_distance(lat1, lon1, lat, lon)
+                         for lat, lon in zip(lat2, lon2)], dtype=np.float64)
 
 
 class DataLoaderInterface(ABC):
@@ -95,18 +137,52 @@ class DataLoaderInterface(ABC):
             Loaded data
         """
         pass
+    
+    def load_data_soa(self, source: str) -> Dict[str, Any]:
+        """
+        Load data from a source as a Struct-of-Arrays (one array per column).
+        
+        The default splits the columns of load_data's result into arrays;
+        implementations override it to convert the columns to their own types.
+        
+        Args:
+            source: Source to load data from (file path or URL)
+            
+        Returns:
+            Dictionary mapping column names to arrays
+        """
+        data = self.load_data(source)
+        return {column: np.asarray(data[column]) for column in data}
 
 
 class ResultWriterInterface(ABC):
     """Interface for result writing implementations."""
     
     @abstractmethod
-    def write_results(self, results: List[Dict[str, Any]], output_path: str) -> None:
+    def write_results(self, results: Iterable[Dict[str, Any]], output_path: str) -> None:
         """
         Write results to the specified output path.
         
         Args:
-            results: Results to write
+            results: Results to write, consumed once so they can be streamed
             output_path: Path to write results to
         """
         pass
+    
+    def write_results_to_io(self, results: Iterable[Dict[str, Any]], output_fp: TextIO) -> None:
+        """
+        Write results to an open file-like object.
+        
+        The default writes the results to a temporary file with write_results
+        and copies that file into the stream; implementations override it to
+        write to the stream directly.
+        
+        Args:
+            results: Results to write, consumed once so they can be streamed
+            output_fp: Writable text stream to write results to
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, 'results')
+            self.write_results(results, temp_path)
+            with open(temp_path, newline='') as temp_file:
+                shutil.copyfileobj(temp_file, output_fp)
@@ -33,13 +33,15 @@ class RestaurantAvailabilitySubject:
     """
     Subject for restaurant availability changes.
     
-    This class follows the Observer pattern to maintain a list of observers
-    and notify them of changes in restaurant availability.
+    This class follows the Observer pattern to maintain a registry of
+    observers and notify them of changes in restaurant availability.
     """
     
     def __init__(self):
-        """Initialize the subject with an empty list of observers."""
-        self.observers: List[RestaurantAvailabilityObserver] = []
+        """Initialize the subject with no observers."""
+        # Keyed by id() so attach and detach don't scan all observers;
+        # dicts keep insertion order, so notification order is unchanged
+        self.observers: Dict[int, RestaurantAvailabilityObserver] = {}
         self.available_restaurants: Set[int] = set()
     
     def attach(self, observer: RestaurantAvailabilityObserver) -> None:
@@ -49,8 +51,7 @@ class RestaurantAvailabilitySubject:
         Args:
             observer: Observer to attach
         """
-        if observer not in self.observers:
-            self.observers.append(observer)
+        self.observers.setdefault(id(observer), observer)
     
     def detach(self, observer: RestaurantAvailabilityObserver) -> None:
         """
@@ -59,8 +60,7 @@ class RestaurantAvailabilitySubject:
         Args:
             observer: Observer to detach
         """
-        if observer in self.observers:
-            self.observers.remove(observer)
+        self.observers.pop(id(observer), None)
     
     def notify_availability_change(self, restaurant_id: int, is_available: bool) -> None:
         """
@@ -76,8 +76,8 @@ class RestaurantAvailabilitySubject:
         else:
             self.available_restaurants.discard(restaurant_id)
         
-        # Notify observers
-        for observer in self.observers:
+        # Notify observers; iterate over a snapshot so observers can detach themselves
+        for observer in tuple(self.observers.values()):
             observer.update(restaurant_id, is_available)
     
     def get_available_restaurants(self) -> Set[int]:
@@ -106,6 +106,10 @@ class AvailabilityLogger(RestaurantAvailabilityObserver):
             log_file: Path to log file (default: None, logs to console)
         """
         self.log_file = log_file
+        
+        # Open the log once rather than per message; line buffering still
+        # writes each message out as soon as it is logged
+        self._log_fp = open(log_file, 'a', buffering=1) if log_file else None
     
     def update(self, restaurant_id: int, is_available: bool) -> None:
         """
@@ -114,15 +118,30 @@ class AvailabilityLogger(RestaurantAvailabilityObserver):
         Args:
             restaurant_id: ID of the restaurant whose availability changed
             is_available: Whether the restaurant is now available
+            
+        Raises:
+            ValueError: If the logger writes to a file and was closed
         """
         status = "available" if is_available else "unavailable"
         message = f"Restaurant {restaurant_id} is now {status}"
         
-        if self.log_file:
-            with open(self.log_file, 'a') as f:
-                f.write(f"{message}\n")
-        else:
+        if self._log_fp is None:
             print(message)
+        elif self._log_fp.closed:
+            raise ValueError(f"Cannot log to {self.log_file} after the logger was closed")
+        else:
+            self._log_fp.write(f"{message}\n")
+    
+    def close(self) -> None:
+        """Close the log file, if one is open; later updates raise ValueError."""
+        if self._log_fp is not None:
+            self._log_fp.close()
+    
+    def __del__(self):
+        """Close the log file when the logger is garbage collected."""
+        # __init__ may have failed before the handle was set
+        if getattr(self, '_log_fp', None) is not None:
+            self.close()
 
 
 class AvailabilityMonitor(RestaurantAvailabilityObserver):
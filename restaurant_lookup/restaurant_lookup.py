@@ -8,20 +8,65 @@ considering delivery radius and opening hours.
 """
 
 import argparse
-import csv
+import io
 import os
-from datetime import datetime
-from typing import List, Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
 
 # My custom modules
 from interfaces import SpatialIndexInterface, DataLoaderInterface, ResultWriterInterface
-from spatial_index import SpatialIndex
+from grid_index import GridSpatialIndex
+from decorator import CachingSpatialIndex
 from time_checker import TimeChecker
 from distance_calculator import DistanceCalculator
 from data_loader import CSVDataLoader
 from result_writer import CSVResultWriter
 
 
+# Number of user locations handed to each worker thread at a time
+USER_CHUNK_SIZE = 256
+
+# User files are read and parsed in blocks of about this many characters, so
+# memory use stays flat however many user locations a file holds
+USER_READ_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Number of chunks queued per worker thread ahead of the results being written
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def _load_coordinates(text: str) -> Optional[np.ndarray]:
+    """
+    Parse "latitude,longitude" lines in one pass with NumPy's C parser.
+    
+    Fields after the longitude are ignored, as in the line-by-line parser.
+    
+    Args:
+        text: Whole lines of a user locations file
+        
+    Returns:
+        Array of shape (N, 2) with one row per line, or None if any line is
+        blank or malformed and needs the line-by-line parser instead
+    """
+    line_count = text.count('\n') + (not text.endswith('\n'))
+    if not text.strip():
+        return None
+    
+    try:
+        coordinates = np.loadtxt(io.StringIO(text), delimiter=',', dtype=np.float64,
+                                 comments=None, usecols=(0, 1), ndmin=2)
+    except ValueError:
+        return None
+    
+    if coordinates.shape != (line_count, 2):
+        return None
+    return coordinates
+
+
 class RestaurantLookupService:
     """
     Main service for finding restaurants near users.
@@ -36,17 +81,29 @@ class RestaurantLookupService:
     def __init__(self, 
                  spatial_idx: SpatialIndexInterface,
                  data_loader: DataLoaderInterface,
-                 result_writer: ResultWriterInterface):
+                 result_writer: ResultWriterInterface,
+                 max_workers: Optional[int] = None,
+                 verbose: bool = False):
         """
         Set up the service with needed components.
         
         Follows Dependency Inversion Principle by depending on abstractions
         rather than concrete implementations.
+        
+        Args:
+            spatial_idx: Spatial index used to find restaurants
+            data_loader: Loader for restaurant data
+            result_writer: Writer for the lookup results
+            max_workers: Number of threads used to process user locations
+                         (default: None, one per CPU; 1 disables threading)
+            verbose: Whether to print a progress line for every query (default: False)
         """
         self.spatial_idx = spatial_idx
         self.spatial_index = spatial_idx  # Alias for backward compatibility
         self.data_loader = data_loader
         self.result_writer = result_writer
+        self.max_workers = max_workers
+        self.verbose = verbose
         self.restaurants_loaded = False
     
     def load_restaurant_data(self, data_source: str) -> None:
@@ -61,9 +118,9 @@ class RestaurantLookupService:
             data_source = os.path.abspath(os.path.expanduser(data_source))
             
         print(f"Loading restaurants from {data_source}...")
-        restaurants = self.data_loader.load_data(data_source)
+        restaurants = self.data_loader.load_data_soa(data_source)
         
-        print(f"Building spatial index for {len(restaurants)} restaurants...")
+        print(f"Building spatial index for {len(restaurants['id'])} restaurants...")
         self.spatial_idx.build_index(restaurants)
         self.restaurants_loaded = True
         
@@ -76,13 +133,15 @@ class RestaurantLookupService:
         """
         return self.load_restaurant_data(data_source)
     
-    def find_restaurants_for_users(self, users_file: str, output_file: str) -> None:
+    def find_restaurants_for_users(self, users_file: str, output_file: str,
+                                   current_time: Optional[datetime] = None) -> None:
         """
         Find available restaurants for each user location.
         
         Args:
             users_file: Path to CSV with user locations
             output_file: Where to save the results
+            current_time: Time to check opening hours against (default: current time)
         """
         if not self.restaurants_loaded:
             raise ValueError("No restaurant data loaded! Call load_restaurant_data first.")
@@ -92,51 +151,30 @@ class RestaurantLookupService:
         output_file = os.path.abspath(os.path.expanduser(output_file))
             
         print(f"Processing {users_file}...")
-        now = datetime.now()
-        results = []
+        now = current_time or datetime.now()
+        processed = 0
         
-        # Read user locations
-        with open(users_file, 'r') as f:
-            reader = csv.reader(f)
-            
-            for i, row in enumerate(reader):
-                # Skip empty rows
-                if not row:
-                    continue
-                    
-                # Make sure we have both lat and lon
-                if len(row) < 2:
-                    print(f"Warning: Line {i+1} doesn't have enough data: {row}")
-                    continue
-                
-                try:
-                    # Parse coordinates
-                    lat = float(row[0])
-                    lon = float(row[1])
-                    
-                    # Find restaurants that deliver here and are open
-                    available = self.spatial_idx.find_restaurants_in_radius(lat, lon, now)
-                    
-                    # Add to results
-                    results.append({
-                        'location': f"{lat},{lon}",
-                        'restaurants': available
-                    })
-                except ValueError:
-                    print(f"Warning: Couldn't parse coordinates on line {i+1}: {row}")
-        
-        # Save the results
-        self.result_writer.write_results(results, output_file)
+        def iter_results():
+            nonlocal processed
+            with open(users_file, 'r') as user_file:
+                for result in self._iter_restaurants_for_users(user_file, now, self.verbose):
+                    processed += 1
+                    yield result
+        
+        # Read user locations and stream each result straight to the output
+        self.result_writer.write_results(iter_results(), output_file)
         print(f"✓ Results saved to {output_file}")
-        print(f"  Processed {len(results)} user locations")
+        print(f"  Processed {processed} user locations")
         
-    def process_user_locations(self, user_locations_path: str, output_path: str) -> None:
+    def process_user_locations(self, user_locations_path: str, output_path: str,
+                               current_time: Optional[datetime] = None) -> None:
         """
         Process user locations and find available restaurants.
         
         Args:
             user_locations_path: Path to CSV file with user locations
             output_path: Path to write the output CSV file
+            current_time: Time to check opening hours against (default: current time)
         """
         # Check if user_locations_path exists, if not create a sample file
         if not os.path.exists(user_locations_path):
@@ -146,49 +184,226 @@ class RestaurantLookupService:
         
         print(f"Processing user locations from {user_locations_path}...")
         
+        # Write results as they are found
+        with open(user_locations_path, 'r') as user_file:
+            results = self._iter_restaurants_for_users(user_file, current_time, self.verbose)
+            self.result_writer.write_results(results, output_path)
+        print(f"Results written to {output_path}")
+    
+    def process_user_locations_from_io(self, users_fp: TextIO, output_fp: TextIO,
+                                       current_time: Optional[datetime] = None) -> None:
+        """
+        Process user locations read from a file-like object and write the
+        results to another one, without touching the filesystem.
+        
+        Args:
+            users_fp: Readable text stream with one "latitude,longitude" per line
+            output_fp: Writable text stream for the output CSV
+            current_time: Time to check opening hours against (default: current time)
+        """
+        results = self._iter_restaurants_for_users(users_fp, current_time, self.verbose)
+        self.result_writer.write_results_to_io(results, output_fp)
+    
+    def _iter_restaurants_for_users(self, user_file: TextIO, current_time: Optional[datetime] = None,
+                                    log_queries: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Parse user locations and find the available restaurants for each.
+        
+        The file is read block by block while results are written, so only a
+        bounded number of locations and results are held at any time.
+        
+        Args:
+            user_file: Readable text stream with one "latitude,longitude" per line
+            current_time: Time to check opening hours against (default: current time)
+            log_queries: Whether to print a progress line for every query (default: False)
+            
+        Yields:
+            Result dictionaries with 'location' and 'restaurants' keys, in input order
+        """
         # Get current time
-        current_time = datetime.now().time()
+        current_time = (current_time or datetime.now()).time()
         
-        # Process each user location
-        results = []
-        with open(user_locations_path, 'r') as user_file:
-            for i, line in enumerate(user_file):
-                line = line.strip()
-                if not line:
+        # Query the index in chunks of users; chunks run on a thread pool since the
+        # distance kernel releases the GIL
+        chunks = (
+            (line_numbers[start:start + USER_CHUNK_SIZE], coordinates[start:start + USER_CHUNK_SIZE])
+            for line_numbers, coordinates in self._iter_user_location_blocks(user_file)
+            for start in range(0, len(coordinates), USER_CHUNK_SIZE)
+        )
+        
+        def process_chunk(chunk):
+            return self._find_restaurants_for_chunk(chunk[0], chunk[1], current_time, log_queries)
+        
+        yield from self._map_chunks(process_chunk, chunks)
+    
+    def _iter_user_location_blocks(self, user_file: TextIO) -> Iterator[Tuple[Sequence[int], np.ndarray]]:
+        """
+        Read user locations from a text stream in blocks of whole lines.
+        
+        Args:
+            user_file: Readable text stream with one "latitude,longitude" per line
+            
+        Yields:
+            Tuples of the line number of each location in a block and an array
+            of shape (N, 2) with their latitudes and longitudes
+        """
+        first_line = 1
+        tail = ''
+        while True:
+            block = user_file.read(USER_READ_BLOCK_SIZE)
+            if not block:
+                break
+            
+            # Hold back the last, possibly partial, line until the next block completes it
+            text = tail + block
+            cut = text.rfind('\n') + 1
+            text, tail = text[:cut], text[cut:]
+            if text:
+                yield self._parse_user_block(text, first_line)
+                first_line += text.count('\n')
+        
+        if tail:
+            yield self._parse_user_block(tail, first_line)
+    
+    def _parse_user_block(self, text: str, first_line: int) -> Tuple[Sequence[int], np.ndarray]:
+        """
+        Parse a block of whole user location lines.
+        
+        Args:
+            text: Lines of a user locations file
+            first_line: Line number of the block's first line in the file
+            
+        Returns:
+            Tuple of the line number of each location and an array of shape
+            (N, 2) with their latitudes and longitudes
+        """
+        # Parse in one go when the block is well-formed
+        coordinates = _load_coordinates(text)
+        if coordinates is not None:
+            return range(first_line, first_line + len(coordinates)), coordinates
+        return self._parse_user_lines(io.StringIO(text), first_line)
+    
+    def _map_chunks(self, process_chunk: Callable[[Any], List[Dict[str, Any]]],
+                    chunks: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Run a function over chunks of user locations, on a thread pool when worthwhile.
+        
+        The query path only reads the spatial index and the stateless time
+        checker and distance calculator, so chunks can run concurrently; the
+        distance kernels release the GIL while they work. Results keep the
+        order of the chunks.
+        
+        Args:
+            process_chunk: Function turning one chunk into a list of results
+            chunks: Chunks of user locations, consumed lazily
+            
+        Yields:
+            Results of every chunk, in input order
+        """
+        chunks = iter(chunks)
+        first_chunks = list(islice(chunks, 2))
+        workers = self._worker_count()
+        if len(first_chunks) < 2 or workers <= 1:
+            for chunk in chain(first_chunks, chunks):
+                yield from process_chunk(chunk)
+            return
+        
+        # Keep a bounded number of chunks in flight, so chunks are read only
+        # about as fast as their results are consumed
+        in_flight = CHUNKS_IN_FLIGHT_PER_WORKER * workers
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(executor.submit(process_chunk, chunk) for chunk in first_chunks)
+            for chunk in chunks:
+                if len(pending) >= in_flight:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(process_chunk, chunk))
+            while pending:
+                yield from pending.popleft().result()
+    
+    def _worker_count(self) -> int:
+        """
+        Get the number of threads to process user locations with.
+        
+        Returns:
+            max_workers when set, otherwise the number of CPUs this process may run on
+        """
+        if self.max_workers is not None:
+            return self.max_workers
+        # Threads beyond the usable CPUs only add switching overhead
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+    
+    def _parse_user_lines(self, user_file: TextIO, first_line: int = 1) -> Tuple[List[int], np.ndarray]:
+        """
+        Parse user locations line by line, warning about malformed lines.
+        
+        Args:
+            user_file: Readable text stream with one "latitude,longitude" per line;
+                       fields after the longitude are ignored
+            first_line: Line number of the stream's first line (default: 1)
+            
+        Returns:
+            Tuple of the line number of each parsed location and an array of
+            shape (N, 2) with their latitudes and longitudes
+        """
+        line_numbers = []
+        coordinates = []
+        for line_number, line in enumerate(user_file, first_line):
+            line = line.strip()
+            if not line:
+                continue
+            
+            try:
+                # Parse user location
+                parts = line.split(',')
+                if len(parts) < 2:
+                    print(f"Warning: Invalid user location format at line {line_number}: {line}")
                     continue
                 
-                try:
-                    # Parse user location
-                    parts = line.split(',')
-                    if len(parts) != 2:
-                        print(f"Warning: Invalid user location format at line {i+1}: {line}")
-                        continue
-                    
-                    user_lat = float(parts[0])
-                    user_lon = float(parts[1])
-                    
-                    # Find restaurants in radius
-                    restaurant_ids = self.spatial_index.find_restaurants_in_radius(
-                        user_lat, user_lon, current_time
-                    )
-                    
-                    # Add to results
-                    results.append({
-                        'location': f"{user_lat},{user_lon}",
-                        'restaurants': restaurant_ids
-                    })
-                    
-                    # Print progress
-                    print(f"Query #{i+1}: Finding restaurants near ({user_lat}, {user_lon}) at {current_time}")
-                    print(f"Query #{i+1}: Found {len(restaurant_ids)} restaurants")
-                    
-                except ValueError as e:
-                    print(f"Warning: Error processing user location at line {i+1}: {e}")
-                    continue
+                coordinates.append((float(parts[0]), float(parts[1])))
+                line_numbers.append(line_number)
+                
+            except ValueError as e:
+                print(f"Warning: Error processing user location at line {line_number}: {e}")
+                continue
         
-        # Write results
-        self.result_writer.write_results(results, output_path)
-        print(f"Results written to {output_path}")
+        return line_numbers, np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    
+    def _find_restaurants_for_chunk(self, line_numbers: List[int], coordinates: np.ndarray,
+                                    current_time: time, log_queries: bool = False) -> List[Dict[str, Any]]:
+        """
+        Find available restaurants for a chunk of user locations.
+        
+        Args:
+            line_numbers: Line number of each user location in the input file
+            coordinates: Array of shape (N, 2) with user latitudes and longitudes
+            current_time: Time to check opening hours against
+            log_queries: Whether to print a progress line for every query (default: False)
+            
+        Returns:
+            List of result dictionaries with 'location' and 'restaurants' keys
+        """
+        # Find restaurants in radius for the whole chunk at once
+        chunk_restaurant_ids = self.spatial_index.find_restaurants_in_radius_batch(
+            coordinates[:, 0], coordinates[:, 1], current_time
+        )
+        
+        results = []
+        for line_number, (user_lat, user_lon), restaurant_ids in zip(
+                line_numbers, coordinates.tolist(), chunk_restaurant_ids):
+            # Add to results
+            results.append({
+                'location': f"{user_lat},{user_lon}",
+                'restaurants': restaurant_ids
+            })
+            
+            # Print progress
+            if log_queries:
+                print(f"Query #{line_number}: Finding restaurants near ({user_lat}, {user_lon}) at {current_time}")
+                print(f"Query #{line_number}: Found {len(restaurant_ids)} restaurants")
+        
+        return results
 
 
 def run_cli():
@@ -211,6 +426,13 @@ Examples:
                         help='CSV file with user locations (lat,lon)')
     parser.add_argument('--output', required=True, 
                         help='Where to save the results')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of threads for processing user locations (default: automatic)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Print a progress line for every user location')
+    parser.add_argument('--cache-precision', type=int, default=None,
+                        help='Cache results for user locations rounded to this many decimal '
+                             'places, e.g. 4 for roughly 11 meter cells (default: no caching)')
     
     # Parse arguments
     args = parser.parse_args()
@@ -223,12 +445,17 @@ Examples:
     # Create components
     time_checker = TimeChecker()
     distance_calc = DistanceCalculator()
-    spatial_idx = SpatialIndex(time_checker, distance_calc)
+    spatial_idx = GridSpatialIndex(time_checker, distance_calc)
+    if args.cache_precision is not None:
+        # Nearby users share results; trades exactness within a cell for speed
+        spatial_idx = CachingSpatialIndex(spatial_idx, cache_size=100_000,
+                                          precision=args.cache_precision)
     data_loader = CSVDataLoader()
     result_writer = CSVResultWriter()
     
     # Create and run the service
-    service = RestaurantLookupService(spatial_idx, data_loader, result_writer)
+    service = RestaurantLookupService(spatial_idx, data_loader, result_writer,
+                                      max_workers=args.workers, verbose=args.verbose)
     service.load_restaurant_data(args.restaurants)
     service.find_restaurants_for_users(args.users, args.output)
     
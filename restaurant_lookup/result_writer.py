@@ -7,10 +7,34 @@ following the Single Responsibility Principle.
 
 import csv
 import os
-from typing import List, Dict, Any
+from itertools import islice
+from typing import Dict, Any, Iterable, Sequence, TextIO
+
+import numpy as np
 from interfaces import ResultWriterInterface
 
 
+# Number of result rows formatted and handed to the CSV writer at a time
+WRITE_CHUNK_SIZE = 10_000
+
+
+def _format_ids(restaurant_ids: Sequence[int]) -> str:
+    """
+    Join restaurant IDs with semicolons.
+    
+    Args:
+        restaurant_ids: List or NumPy array of restaurant IDs
+        
+    Returns:
+        str: The IDs separated by semicolons
+    """
+    # str() of Python ints is about twice as fast as of NumPy scalars, and one
+    # tolist() call unboxes the whole array at once
+    if isinstance(restaurant_ids, np.ndarray):
+        restaurant_ids = restaurant_ids.tolist()
+    return ';'.join(map(str, restaurant_ids))
+
+
 class CSVResultWriter(ResultWriterInterface):
     """
     Implementation of result writing functionality for CSV files.
@@ -18,12 +42,12 @@ class CSVResultWriter(ResultWriterInterface):
     This class is responsible for writing restaurant lookup results to CSV files.
     """
     
-    def write_results(self, results: List[Dict[str, Any]], output_path: str) -> None:
+    def write_results(self, results: Iterable[Dict[str, Any]], output_path: str) -> None:
         """
         Write results to the specified output path.
         
         Args:
-            results: List of dictionaries with 'location' and 'restaurants' keys
+            results: Iterable of dictionaries with 'location' and 'restaurants' keys
             output_path: Path to write results to
         """
         # Use os.path for platform-independent path handling
@@ -35,14 +59,26 @@ class CSVResultWriter(ResultWriterInterface):
             os.makedirs(output_dir, exist_ok=True)
             
         with open(output_path, 'w', newline='') as output_file:
-            output_writer = csv.writer(output_file)
-            
-            for result in results:
-                user_location = result['location']
-                available_restaurants = result['restaurants']
-                
-                if available_restaurants:
-                    restaurant_ids = ';'.join(map(str, available_restaurants))
-                    output_writer.writerow([user_location, restaurant_ids])
-                else:
-                    output_writer.writerow([user_location, ""])
+            self.write_results_to_io(results, output_file)
+    
+    def write_results_to_io(self, results: Iterable[Dict[str, Any]], output_fp: TextIO) -> None:
+        """
+        Write results as CSV rows to an open file-like object.
+        
+        Results are formatted into rows a chunk at a time and each chunk is
+        written with one writerows call, so a generator of results is never
+        held in memory as a whole.
+        
+        Args:
+            results: Iterable of dictionaries with 'location' and 'restaurants' keys,
+                     where restaurants is a list or NumPy array of IDs
+            output_fp: Writable text stream to write results to
+        """
+        output_writer = csv.writer(output_fp)
+        results = iter(results)
+        while True:
+            rows = [(result['location'], _format_ids(result['restaurants']))
+                    for result in islice(results, WRITE_CHUNK_SIZE)]
+            if not rows:
+                break
+            output_writer.writerows(rows)
@@ -88,7 +88,7 @@ def run_performance_analyzer(args):
             print(f"⚠️ Warning: Data file not found at {takehome_csv}")
     
     # Generate report
-    tester.generate_report()
+    tester.generate_report(pretty=args.pretty)
     
     print(f"\n✅ Analysis complete! Results saved to {output_dir}")
     print(f"   View the HTML report at: {os.path.join(output_dir, 'performance_report.html')}")
@@ -127,6 +127,12 @@ def main():
         help="Skip real data tests"
     )
     
+    parser.add_argument(
+        "--pretty", 
+        action="store_true",
+        help="Indent the raw JSON results for reading"
+    )
+    
     parser.add_argument(
         "--install-deps", 
         action="store_true",
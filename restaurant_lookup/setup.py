@@ -26,13 +26,15 @@ setup(
     install_requires=[
         "pandas>=1.3.0",
         "numpy>=1.20.0",
-        "pyproj>=3.0.0",
         "rtree>=1.0.0",
         "matplotlib>=3.4.0",
         "seaborn>=0.11.0",
         "tabulate>=0.8.0",
         "requests>=2.28.0",
     ],
+    extras_require={
+        "fast": ["numba>=0.57.0", "pyarrow>=8.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "restaurant-lookup=restaurant_lookup:run_cli",
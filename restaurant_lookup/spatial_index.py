@@ -5,14 +5,134 @@ This module provides functionality to create and query a spatial index
 for restaurants, allowing efficient radius-based searches.
 """
 
+import math
+import threading
+import numpy as np
 import pandas as pd
 from rtree import index
+from collections.abc import Mapping
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
 
 from interfaces import SpatialIndexInterface
 from time_checker import TimeChecker
 from distance_calculator import DistanceCalculator
+from data_loader import RESTAURANT_COLUMNS, restaurants_to_soa
+from _kernels import EARTH_RADIUS_KM
+
+# Number of entries per R-tree node
+RTREE_NODE_CAPACITY = 16
+
+# Whether this rtree release accepts (ids, mins, maxs) arrays in place of an item
+# stream; older releases would try to unpack the arrays as items
+RTREE_ARRAY_BULK_LOAD = hasattr(index.Index, '_create_idx_from_array')
+
+# Padding of the delivery boxes, relative to the delivery angle and again in
+# radians (about 6 m). The exact distance check runs on float32 radians and
+# cosines that are off by under 2 m, so the padding must cover that rounding for
+# the boxes never to prune a restaurant the check would accept
+BOX_PADDING = 1e-6
+
+
+def delivery_boxes(latitudes: np.ndarray, longitudes: np.ndarray,
+                   radii: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the bounding box of each restaurant's delivery area.
+    
+    Delivery areas are spherical caps, whose longitude half-width
+    asin(sin(d) / cos(lat)) grows towards the poles. Caps that reach a pole or
+    cross the antimeridian get boxes spanning every longitude.
+    
+    Args:
+        latitudes: Array of restaurant latitudes in degrees
+        longitudes: Array of restaurant longitudes in degrees
+        radii: Array of delivery radii in kilometers
+        
+    Returns:
+        Tuple of arrays of shape (N, 2) with the (latitude, longitude) of each
+        box's lower and upper corner
+    """
+    angle = np.asarray(radii, dtype=np.float64) / EARTH_RADIUS_KM * (1.0 + BOX_PADDING) + BOX_PADDING
+    half_lat = np.degrees(angle)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.sin(np.minimum(angle, 0.5 * np.pi)) / np.cos(np.radians(latitudes))
+    half_lon = np.degrees(np.arcsin(np.minimum(ratio, 1.0)))
+    lon_lo = longitudes - half_lon
+    lon_hi = longitudes + half_lon
+    
+    # The cap contains a pole when sin(d) >= cos(lat)
+    full_lon = ~(ratio < 1.0) | (lon_lo < -180.0) | (lon_hi > 180.0)
+    mins = np.column_stack((np.maximum(latitudes - half_lat, -90.0), np.where(full_lon, -180.0, lon_lo)))
+    maxs = np.column_stack((np.minimum(latitudes + half_lat, 90.0), np.where(full_lon, 180.0, lon_hi)))
+    return mins, maxs
+
+
+class RestaurantRecords(Mapping):
+    """
+    Read-only mapping from restaurant ID to its record, backed by a spatial index's columns.
+    
+    Records are assembled on access, so building an index doesn't create a
+    dictionary per restaurant that the query paths never read.
+    """
+    
+    __slots__ = ('_index',)
+    
+    def __init__(self, spatial_index: 'SpatialIndex'):
+        """
+        Initialize the mapping over a spatial index.
+        
+        Args:
+            spatial_index: SpatialIndex whose current columns the records are read from
+        """
+        self._index = spatial_index
+    
+    def __getitem__(self, restaurant_id: int) -> Dict[str, Any]:
+        """
+        Assemble the record of a restaurant.
+        
+        Args:
+            restaurant_id: ID of the restaurant
+            
+        Returns:
+            Dictionary with the restaurant's id, latitude, longitude,
+            availability_radius, open_hour, close_hour and rating
+            
+        Raises:
+            KeyError: If no restaurant has this ID
+        """
+        index = self._index
+        try:
+            # The last of any duplicate IDs wins, like repeated dictionary inserts
+            i = int(np.searchsorted(index._sorted_ids, restaurant_id, side='right')) - 1
+        except TypeError:
+            raise KeyError(restaurant_id) from None
+        if i < 0 or index._sorted_ids[i] != restaurant_id:
+            raise KeyError(restaurant_id)
+        
+        position = int(index._id_order[i])
+        return {column: values.item(position) for column, values in index._record_columns.items()}
+    
+    def _last_positions(self) -> np.ndarray:
+        """
+        Get the column positions of the records the mapping exposes.
+        
+        Returns:
+            Sorted array with the position of the last occurrence of each ID
+        """
+        sorted_ids = self._index._sorted_ids
+        last = np.ones(sorted_ids.shape[0], dtype=bool)
+        last[:-1] = sorted_ids[1:] != sorted_ids[:-1]
+        return np.sort(self._index._id_order[last])
+    
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the unique restaurant IDs in order of their last occurrence."""
+        return iter(self._index._ids[self._last_positions()].tolist())
+    
+    def __len__(self) -> int:
+        """Get the number of unique restaurant IDs."""
+        sorted_ids = self._index._sorted_ids
+        return int(np.count_nonzero(sorted_ids[1:] != sorted_ids[:-1])) + (sorted_ids.shape[0] > 0)
 
 
 class SpatialIndex(SpatialIndexInterface):
@@ -28,46 +148,252 @@ class SpatialIndex(SpatialIndexInterface):
         Initialize the spatial index with dependencies.
         
         Args:
-            time_checker: TimeChecker instance for checking restaurant opening hours
-            distance_calculator: DistanceCalculator instance for calculating distances
+            time_checker: TimeChecker instance for checking restaurant opening hours;
+                          the concrete class is required for its is_open_seconds
+                          and seconds_of_day, which TimeCheckerInterface lacks
+            distance_calculator: DistanceCalculator instance for calculating distances;
+                                 the concrete class is required for its
+                                 select_within_radius_radians and
+                                 within_radius_pairs_indexed_radians, which
+                                 DistanceCalculatorInterface lacks
+        """
+        # Create an empty R-tree index; build_index replaces it with a bulk-loaded one
+        self.idx = self._create_rtree()
+        # libspatialindex does not guarantee thread-safe queries, so R-tree
+        # access is serialized while the distance filtering runs concurrently
+        self._idx_lock = threading.Lock()
+        
+        # Restaurant records by ID, assembled from the columns below on access
+        self.restaurants = RestaurantRecords(self)
+        self._record_columns = {column: np.empty(0) for column in RESTAURANT_COLUMNS}
+        
+        
+        # Struct-of-Arrays copy of the restaurant data, in DataFrame order
+        self._ids = np.empty(0, dtype=np.int64)
+        self._id_order = np.empty(0, dtype=np.intp)
+        self._sorted_ids = np.empty(0, dtype=np.int64)
+        self._lat = np.empty(0, dtype=np.float64)
+        self._lon = np.empty(0, dtype=np.float64)
+        self._lat_rad = np.empty(0, dtype=np.float32)
+        self._lon_rad = np.empty(0, dtype=np.float32)
+        self._cos_lat = np.empty(0, dtype=np.float32)
+        self._radius = np.empty(0, dtype=np.float32)
+        self._open_s = np.empty(0, dtype=np.int32)
+        self._close_s = np.empty(0, dtype=np.int32)
+        self._rating = np.empty(0, dtype=np.float32)
+        
+        # Open/closed state of every restaurant for the last time of day queried,
+        # as a (seconds since midnight, mask) pair
+        self._open_mask_cache: Optional[Tuple[int, np.ndarray]] = None
+        self.time_checker = time_checker
+        self.distance_calculator = distance_calculator
+        
+        # Bind the per-query callables once instead of looking them up on every query
+        self._select_within_radius_radians = distance_calculator.select_within_radius_radians
+        self._within_radius_pairs_indexed_radians = distance_calculator.within_radius_pairs_indexed_radians
+        self._is_open_seconds = time_checker.is_open_seconds
+        
+    def build_index(self, restaurants_data: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> None:
+        """
+        Build the spatial index from restaurant data.
+        
+        Args:
+            restaurants_data: Struct-of-Arrays dictionary from CSVDataLoader.load_data_soa,
+                              or a DataFrame with restaurant data including id, latitude,
+                              longitude, availability_radius, open_hour, close_hour, and rating.
+        """
+        if isinstance(restaurants_data, pd.DataFrame):
+            restaurants_data = restaurants_to_soa(restaurants_data)
+        
+        # Keep each column as a contiguous array
+        self._ids = restaurants_data['id']
+        self._lat = restaurants_data['latitude']
+        self._lon = restaurants_data['longitude']
+        self._radius = restaurants_data['availability_radius'].astype(np.float32)
+        self._open_s = restaurants_data['open_s']
+        self._close_s = restaurants_data['close_s']
+        self._rating = restaurants_data['rating'].astype(np.float32)
+        self._open_mask_cache = None
+        
+        # Sorted view of the IDs for mapping R-tree results back to array positions
+        self._id_order = np.argsort(self._ids, kind='stable')
+        self._sorted_ids = self._ids[self._id_order]
+        
+        # Precompute radians and cos(latitude) once so queries only do trig for the user.
+        # float32 halves the memory the distance checks stream through; one float32
+        # step of a longitude near +/-180 degrees is about 1.5 m, so radius checks
+        # agree with float64 ones except within about 2 m of the delivery edge
+        lat_rad = np.radians(self._lat)
+        self._lat_rad = lat_rad.astype(np.float32)
+        self._lon_rad = np.radians(self._lon).astype(np.float32)
+        self._cos_lat = np.cos(lat_rad).astype(np.float32)
+        
+        # Keep the raw columns restaurant records are assembled from
+        self._record_columns = {column: restaurants_data[column] for column in RESTAURANT_COLUMNS}
+        
+        # Bulk-load a fresh R-tree index of delivery areas, so a user location only
+        # hits restaurants whose area's bounding box contains it. Entries are keyed
+        # by position in the column arrays, so query results index the columns
+        # directly. Restaurants without a valid location or radius never deliver
+        # and are left out
+        valid = np.flatnonzero(np.isfinite(self._lat) & np.isfinite(self._lon) & (self._radius >= 0))
+        mins, maxs = delivery_boxes(self._lat[valid], self._lon[valid], self._radius[valid])
+        self._index_delivery_areas(valid, mins, maxs)
+        self._specialize_kernels()
+    
+    def _specialize_kernels(self) -> None:
+        """
+        Prepare the distance kernels for the column types of the built index.
+        
+        The columns never change after build_index, so running each query
+        kernel once on empty inputs of the same types makes Numba compile (or
+        load from its cache) the machine code for exactly these types now,
+        instead of on the first query. With the NumPy fallback this is a no-op.
+        """
+        no_positions = np.empty(0, dtype=np.intp)
+        no_users = np.empty(0, dtype=np.float64)
+        eligible = np.zeros(self._ids.shape[0], dtype=bool)
+        self._select_within_radius_radians(0.0, 0.0, no_positions, self._lat_rad, self._lon_rad,
+                                           self._cos_lat, self._radius, eligible)
+        self._within_radius_pairs_indexed_radians(no_positions, no_positions, no_users, no_users, no_users,
+                                                  self._lat_rad, self._lon_rad, self._cos_lat,
+                                                  self._radius, eligible)
+    
+    def _index_delivery_areas(self, positions: np.ndarray, mins: np.ndarray, maxs: np.ndarray) -> None:
+        """
+        Replace the spatial structure with one holding the given delivery areas.
+        
+        Subclasses override this, together with the candidate queries, to use
+        another spatial structure.
+        
+        Args:
+            positions: Array with the column position of each delivery area
+            mins: Array of shape (N, 2) with the lower corner of each area's bounding box
+            maxs: Array of shape (N, 2) with the upper corner of each area's bounding box
+        """
+        new_idx = self._create_rtree(positions, mins, maxs)
+        with self._idx_lock:
+            self.idx = new_idx
+    
+    @staticmethod
+    def _create_rtree(keys: Optional[np.ndarray] = None, mins: Optional[np.ndarray] = None,
+                      maxs: Optional[np.ndarray] = None) -> index.Index:
+        """
+        Create an R-tree index with custom properties.
+        
+        Args:
+            keys: Optional array of integer keys of boxes to bulk-load, which packs
+                  a better balanced tree much faster than inserting boxes one at
+                  a time
+            mins: Array of shape (N, 2) with the lower corner of each box
+            maxs: Array of shape (N, 2) with the upper corner of each box
+            
+        Returns:
+            rtree.index.Index: The new index
         """
-        # Create R-tree index with custom properties
         p = index.Property()
         p.dimension = 2  # 2D index (latitude, longitude)
         p.buffering_capacity = 10  # Tune for better performance
-        self.idx = index.Index(properties=p)
-        self.restaurants = {}
-        self.time_checker = time_checker
-        self.distance_calculator = distance_calculator
+        p.fill_factor = 0.9  # The tree is never modified after loading, so pack nodes fully
+        # The default capacities suit disk pages; in memory, small nodes make point
+        # queries test fewer boxes per level
+        p.leaf_capacity = RTREE_NODE_CAPACITY
+        p.index_capacity = RTREE_NODE_CAPACITY
+        # R* splits and tight bounding boxes keep the tree compact when it is
+        # built by inserting one box at a time
+        p.variant = index.RT_Star
+        p.near_minimum_overlap_factor = RTREE_NODE_CAPACITY // 2  # Must stay below the capacities
+        p.tight_mbr = True
+        if keys is None or len(keys) == 0:
+            return index.Index(properties=p)
+        
+        if RTREE_ARRAY_BULK_LOAD:
+            try:
+                # libspatialindex 2.1+ bulk-loads straight from the arrays
+                return index.Index((keys, mins, maxs), properties=p)
+            except NotImplementedError:
+                pass
+        
+        # Older rtree releases treat any first argument as a stream of items
+        return index.Index(
+            ((key, (*lo, *hi), None) for key, lo, hi in zip(keys.tolist(), mins.tolist(), maxs.tolist())),
+            properties=p
+        )
+    
+    def _positions(self, restaurant_ids: np.ndarray) -> np.ndarray:
+        """
+        Map restaurant IDs to their positions in the column arrays.
+        
+        Like RestaurantRecords, the last of any duplicate IDs wins.
         
-    def build_index(self, restaurants_df: pd.DataFrame) -> None:
+        Args:
+            restaurant_ids: Array of restaurant IDs present in the index
+            
+        Returns:
+            Array of positions into the column arrays
+            
+        Raises:
+            KeyError: If any of the IDs is not in the index
+        """
+        restaurant_ids = np.asarray(restaurant_ids)
+        i = np.searchsorted(self._sorted_ids, restaurant_ids, side='right') - 1
+        found = i >= 0
+        found[found] = self._sorted_ids[i[found]] == restaurant_ids[found]
+        if not found.all():
+            raise KeyError(restaurant_ids[~found].flat[0].item())
+        return self._id_order[i]
+    
+    def get_columns(self, restaurant_ids: np.ndarray) -> Dict[str, np.ndarray]:
         """
-        Build the spatial index from a DataFrame of restaurants.
+        Gather the numeric column values of the given restaurants.
         
         Args:
-            restaurants_df: DataFrame with restaurant data including id, latitude, longitude,
-                           availability_radius, open_hour, close_hour, and rating.
+            restaurant_ids: Array of restaurant IDs present in the index
+            
+        Returns:
+            Dictionary mapping latitude, longitude, lat_rad, lon_rad, cos_lat,
+            availability_radius, open_s, close_s and rating to arrays aligned
+            with restaurant_ids
+            
+        Raises:
+            KeyError: If any of the IDs is not in the index
+        """
+        positions = self._positions(restaurant_ids)
+        return {
+            'latitude': self._lat[positions],
+            'longitude': self._lon[positions],
+            'lat_rad': self._lat_rad[positions],
+            'lon_rad': self._lon_rad[positions],
+            'cos_lat': self._cos_lat[positions],
+            'availability_radius': self._radius[positions],
+            'open_s': self._open_s[positions],
+            'close_s': self._close_s[positions],
+            'rating': self._rating[positions]
+        }
+    
+    def open_mask(self, current_time: Optional[Union[datetime, int]] = None) -> np.ndarray:
         """
-        # Store restaurant data for later retrieval
-        for i, row in restaurants_df.iterrows():
-            restaurant_id = row['id']
-            # Store restaurant data as a dictionary for quick access
-            self.restaurants[restaurant_id] = {
-                'id': restaurant_id,
-                'latitude': row['latitude'],
-                'longitude': row['longitude'],
-                'availability_radius': row['availability_radius'],
-                'open_hour': row['open_hour'],
-                'close_hour': row['close_hour'],
-                'rating': row['rating']
-            }
+        Get which restaurants are open at a time of day, in column order.
+        
+        The mask is computed for all restaurants at once and reused while
+        queries keep asking about the same second, as they do within a run
+        that fixes the time up front, so each query only looks it up.
+        
+        Args:
+            current_time: Time to check, or seconds since midnight (default: None,
+                          uses current time)
             
-            # Add to R-tree index
-            # The index uses a bounding box, so we insert a point (lat, lon) as (lat, lon, lat, lon)
-            self.idx.insert(
-                restaurant_id,  # Use restaurant ID as the index identifier
-                (row['latitude'], row['longitude'], row['latitude'], row['longitude'])
-            )
+        Returns:
+            numpy.ndarray: Boolean mask aligned with the index's columns
+        """
+        now_s = self.time_checker.seconds_of_day(current_time)
+        cached = self._open_mask_cache
+        if cached is not None and cached[0] == now_s:
+            return cached[1]
+        
+        mask = self._is_open_seconds(self._open_s, self._close_s, now_s)
+        self._open_mask_cache = (now_s, mask)
+        return mask
     
     def find_restaurants_in_radius(self, latitude: float, longitude: float, 
                                   current_time: Optional[datetime] = None) -> List[int]:
@@ -87,41 +413,202 @@ class SpatialIndex(SpatialIndexInterface):
             list: List of restaurant IDs that are available for delivery
         """
         # Get candidate restaurants using spatial filtering
-        candidates = self._get_candidate_restaurants(latitude, longitude)
+        candidates = self._get_candidate_positions(latitude, longitude)
         
         # Apply detailed filtering criteria
         return self._filter_candidates(candidates, latitude, longitude, current_time)
     
-    def _get_candidate_restaurants(self, latitude: float, longitude: float) -> List[int]:
+    def find_restaurants_in_radius_into(self, out: np.ndarray, latitude: float, longitude: float,
+                                        current_time: Optional[datetime] = None) -> int:
         """
-        Get candidate restaurants using spatial filtering.
+        Find available restaurants like find_restaurants_in_radius, writing
+        their IDs into a caller-provided buffer instead of a new list.
         
-        This is a helper method that implements the spatial filtering step of the algorithm.
+        Lets tight loops reuse one buffer across queries.
         
         Args:
+            out: Writable int64 array the restaurant IDs are written to
             latitude: User's latitude
             longitude: User's longitude
+            current_time: Current time as datetime object (default: None, uses current time)
+            
+        Returns:
+            int: Number of IDs written to the start of out
+            
+        Raises:
+            ValueError: If out is too small to hold all the IDs
+        """
+        candidates = self._get_candidate_positions(latitude, longitude)
+        positions = self._filter_candidate_positions(candidates, latitude, longitude, current_time)
+        count = positions.shape[0]
+        if count > out.shape[0]:
+            raise ValueError(f"Output buffer holds {out.shape[0]} IDs but {count} restaurants were found")
+        # Gather the IDs straight into the buffer; the positions are known to be in range
+        np.take(self._ids, positions, out=out[:count], mode='clip')
+        return count
+    
+    def find_restaurants_in_radius_batch(self, latitudes: np.ndarray, longitudes: np.ndarray,
+                                         current_time: Optional[Union[datetime, int]] = None
+                                         ) -> List[List[int]]:
+        """
+        Find available restaurants for many user locations at once.
+        
+        All query boxes go to the R-tree in one bulk call, and every
+        (user, candidate) pair is checked for distance and opening hours in
+        one vectorized pass.
+        
+        Args:
+            latitudes: Array of user latitudes
+            longitudes: Array of user longitudes, aligned with latitudes
+            current_time: Current time as datetime object or seconds since midnight
+                          (default: None, uses current time)
+            
+        Returns:
+            List with the available restaurant IDs for each user, in input order
+        """
+        latitudes = np.ascontiguousarray(latitudes, dtype=np.float64)
+        longitudes = np.ascontiguousarray(longitudes, dtype=np.float64)
+        if latitudes.shape[0] == 0:
+            return []
+        
+        # Users at the same location share one query, which pays off for dense
+        # inputs where many rows repeat the same coordinates. Viewing each
+        # (latitude, longitude) pair as one complex number sorts much faster
+        # than np.unique(axis=0) on rows
+        locations, inverse = np.unique(np.column_stack((latitudes, longitudes)).view(np.complex128),
+                                       return_inverse=True)
+        if len(locations) == len(latitudes):
+            return self._find_restaurants_for_locations(latitudes, longitudes, current_time)
+        
+        location_results = self._find_restaurants_for_locations(
+            np.ascontiguousarray(locations.real), np.ascontiguousarray(locations.imag), current_time
+        )
+        return [location_results[k] for k in inverse.reshape(-1).tolist()]
+    
+    def find_restaurants_in_radius_at_times(self, latitudes: np.ndarray, longitudes: np.ndarray,
+                                            current_times: Sequence[Any]) -> List[List[int]]:
+        """
+        Find available restaurants for many user locations, each at its own time.
+        
+        Users are grouped by second of the day and each group is answered
+        with one batched query, which suits batches spanning few distinct
+        times, like simulations stepping through the day.
+        
+        Args:
+            latitudes: Array of user latitudes
+            longitudes: Array of user longitudes, aligned with latitudes
+            current_times: Time of each user's query, aligned with latitudes, as
+                           time or datetime objects or seconds since midnight
+                           (fractional seconds are truncated)
+            
+        Returns:
+            List with the available restaurant IDs for each user, in input order
+            
+        Raises:
+            ValueError: If current_times is not aligned with the locations, or
+                        holds seconds that are not finite
+        """
+        latitudes = np.ascontiguousarray(latitudes, dtype=np.float64)
+        longitudes = np.ascontiguousarray(longitudes, dtype=np.float64)
+        seconds = np.asarray(current_times)
+        if seconds.dtype.kind == 'f':
+            if not np.isfinite(seconds).all():
+                raise ValueError("Seconds since midnight must be finite")
+            seconds = seconds.astype(np.int64)
+        elif seconds.dtype.kind not in 'iu':
+            seconds = np.array([self.time_checker.seconds_of_day(t) for t in current_times], dtype=np.int64)
+        if seconds.shape != latitudes.shape:
+            raise ValueError(f"Got {seconds.shape[0] if seconds.ndim else 1} times for "
+                             f"{latitudes.shape[0]} locations")
+        
+        results: List[List[int]] = [[] for _ in range(latitudes.shape[0])]
+        times, inverse = np.unique(seconds, return_inverse=True)
+        for group, now_s in enumerate(times.tolist()):
+            members = np.flatnonzero(inverse.reshape(-1) == group)
+            group_results = self.find_restaurants_in_radius_batch(latitudes[members], longitudes[members], now_s)
+            for user, restaurant_ids in zip(members.tolist(), group_results):
+                results[user] = restaurant_ids
+        return results
+    
+    def _find_restaurants_for_locations(self, latitudes: np.ndarray, longitudes: np.ndarray,
+                                        current_time: Optional[Union[datetime, int]]) -> List[List[int]]:
+        """
+        Find available restaurants for many user locations in one vectorized pass.
+        
+        Args:
+            latitudes: Array of user latitudes
+            longitudes: Array of user longitudes, aligned with latitudes
+            current_time: Current time as datetime object or seconds since midnight,
+                          or None for the current time
+            
+        Returns:
+            List with the available restaurant IDs for each user, in input order
+        """
+        user_count = latitudes.shape[0]
+        
+        # Candidate pairs: each user's candidate positions, grouped by user
+        positions, counts = self._get_candidate_positions_batch(latitudes, longitudes)
+        user_positions = np.repeat(np.arange(user_count), counts)
+        
+        # Check distance and opening hours of every pair in place, in one pass
+        user_lat_rad = np.radians(latitudes)
+        available = self._within_radius_pairs_indexed_radians(
+            user_positions, positions, user_lat_rad, np.radians(longitudes), np.cos(user_lat_rad),
+            self._lat_rad, self._lon_rad, self._cos_lat, self._radius, self.open_mask(current_time)
+        )
+        
+        # Split the matches back into one list per user
+        available_ids = self._ids[positions[available]].tolist()
+        ends = np.cumsum(np.bincount(user_positions[available], minlength=user_count)).tolist()
+        starts = [0] + ends[:-1]
+        return [available_ids[start:end] for start, end in zip(starts, ends)]
+    
+    def _get_candidate_positions_batch(self, latitudes: np.ndarray,
+                                       longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get candidate restaurants for many user locations.
+        
+        Args:
+            latitudes: Array of user latitudes
+            longitudes: Array of user longitudes
             
         Returns:
-            List of candidate restaurant IDs
+            Tuple of the column positions of all users' candidates, concatenated
+            in user order, and the number of candidates of each user
+        """
+        # rtree 1.1+ answers all points in one call; older versions get one query per point
+        if hasattr(self.idx, 'intersection_v'):
+            points = np.column_stack((latitudes, longitudes))
+            with self._idx_lock:
+                positions, counts = self.idx.intersection_v(points, points)
+            return positions.astype(np.intp, copy=False), counts.astype(np.int64, copy=False)
+        
+        per_user = [self._get_candidate_positions(lat, lon)
+                    for lat, lon in zip(latitudes.tolist(), longitudes.tolist())]
+        counts = np.fromiter(map(len, per_user), dtype=np.int64, count=len(per_user))
+        positions = np.concatenate(per_user) if per_user else np.empty(0, dtype=np.intp)
+        return positions, counts
+    
+    def _get_candidate_positions(self, latitude: float, longitude: float) -> np.ndarray:
         """
-        # First, create a bounding box that's large enough to encompass all possible restaurants
-        # This is an optimization to reduce the number of distance calculations
-        # We use 100km as a conservative maximum delivery radius
-        MAX_RADIUS_KM = 100
+        Get candidate restaurants using spatial filtering.
         
-        # Convert radius to approximate degrees (very rough approximation)
-        # 1 degree of latitude is approximately 111 km
-        radius_deg = MAX_RADIUS_KM / 111
+        This is a helper method that implements the spatial filtering step of the algorithm.
         
-        # Query the R-tree index with the bounding box
-        # This gives us candidate restaurants that might be within range
-        return list(self.idx.intersection(
-            (latitude - radius_deg, longitude - radius_deg, 
-             latitude + radius_deg, longitude + radius_deg)
-        ))
+        Args:
+            latitude: User's latitude
+            longitude: User's longitude
+            
+        Returns:
+            numpy.ndarray: Positions of the candidate restaurants in the column arrays
+        """
+        # Query the R-tree index with the user point, which gives us the restaurants
+        # whose delivery area's bounding box contains it and that might be within range
+        with self._idx_lock:
+            positions = list(self.idx.intersection((latitude, longitude, latitude, longitude)))
+        return np.array(positions, dtype=np.intp)
     
-    def _filter_candidates(self, candidates: List[int], latitude: float, longitude: float,
+    def _filter_candidates(self, candidates: np.ndarray, latitude: float, longitude: float,
                           current_time: Optional[datetime] = None) -> List[int]:
         """
         Filter candidate restaurants based on distance and opening hours.
@@ -129,7 +616,7 @@ class SpatialIndex(SpatialIndexInterface):
         This is a helper method that implements the detailed filtering step of the algorithm.
         
         Args:
-            candidates: List of candidate restaurant IDs
+            candidates: Positions of the candidate restaurants in the column arrays
             latitude: User's latitude
             longitude: User's longitude
             current_time: Current time as datetime object
@@ -137,22 +624,26 @@ class SpatialIndex(SpatialIndexInterface):
         Returns:
             List of restaurant IDs that meet all criteria
         """
-        available_restaurants = []
+        positions = self._filter_candidate_positions(candidates, latitude, longitude, current_time)
+        return self._ids[positions].tolist()
+    
+    def _filter_candidate_positions(self, candidates: np.ndarray, latitude: float, longitude: float,
+                              current_time: Optional[datetime] = None) -> np.ndarray:
+        """
+        Filter candidate restaurants based on distance and opening hours.
         
-        # For each candidate, check if it's actually within its delivery radius
-        # and if it's open at the current time
-        for restaurant_id in candidates:
-            restaurant = self.restaurants[restaurant_id]
-            
-            # Calculate actual distance
-            distance = self.distance_calculator.calculate_distance(
-                latitude, longitude, 
-                restaurant['latitude'], restaurant['longitude']
-            )
+        Args:
+            candidates: Positions of the candidate restaurants in the column arrays
+            latitude: User's latitude
+            longitude: User's longitude
+            current_time: Current time as datetime object
             
-            # Check if user is within delivery radius and restaurant is open
-            if (distance <= restaurant['availability_radius'] and 
-                self.time_checker.is_open(restaurant['open_hour'], restaurant['close_hour'], current_time)):
-                available_restaurants.append(restaurant_id)
-        
-        return available_restaurants
+        Returns:
+            numpy.ndarray: Column positions of the restaurants that meet all criteria
+        """
+        # Check the distance to the open candidates in one pass over the columns,
+        # looking up opening hours in the mask shared by all queries at this time
+        return self._select_within_radius_radians(
+            math.radians(latitude), math.radians(longitude), candidates,
+            self._lat_rad, self._lon_rad, self._cos_lat, self._radius, self.open_mask(current_time)
+        )
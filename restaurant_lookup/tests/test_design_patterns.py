@@ -3,6 +3,7 @@ Unit tests for the design pattern implementations.
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import datetime, time
 from freezegun import freeze_time
@@ -57,6 +58,10 @@ def test_factory_pattern(sample_restaurants_df, time_checker, distance_calculato
     # Check if all restaurants are in the index
     assert len(spatial_index.restaurants) == len(sample_restaurants_df)
     
+    # The grid index is a drop-in replacement
+    grid_index = SpatialIndexFactory.create_index("grid", time_checker, distance_calculator)
+    assert isinstance(grid_index, SpatialIndex)
+    
     # Test with invalid type
     with pytest.raises(ValueError):
         SpatialIndexFactory.create_index("invalid_type", time_checker, distance_calculator)
@@ -71,9 +76,11 @@ def test_strategy_pattern(sample_restaurants_df, time_checker, distance_calculat
     
     # Get candidate restaurants
     user_lat, user_lon = 51.2, 6.45  # Near restaurant 1
-    candidates = list(spatial_index.idx.intersection(
+    positions = list(spatial_index.idx.intersection(
         (user_lat - 1, user_lon - 1, user_lat + 1, user_lon + 1)
     ))
+    # The R-tree is keyed by position in the index's column arrays
+    candidates = spatial_index._ids[positions].tolist()
     
     # Create and test the distance and time filter strategy
     distance_time_strategy = DistanceAndTimeFilterStrategy(time_checker, distance_calculator)
@@ -97,6 +104,106 @@ def test_strategy_pattern(sample_restaurants_df, time_checker, distance_calculat
     assert 1 not in results  # Restaurant 1 has rating 4.7, should not be available
 
 
+
+def test_strategy_vectorized_matches_scalar(time_checker, distance_calculator):
+    """Test that the vectorized filter agrees with scalar distance and time checks."""
+    restaurants_df = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'latitude': [51.19, 51.21, 51.25, 51.30],
+        'longitude': [6.45, 6.46, 6.50, 6.60],
+        'availability_radius': [5, 2, 8, 3],
+        'open_hour': ['14:00:00', '22:00:00', '00:00:00', '09:00:00'],
+        'close_hour': ['23:00:00', '03:00:00', '23:59:59', '09:00:00'],
+        'rating': [4.7, 4.8, 4.0, 3.5]
+    })
+    spatial_index = SpatialIndex(time_checker, distance_calculator)
+    spatial_index.build_index(restaurants_df)
+    restaurants = spatial_index.restaurants
+    candidates = [1, 2, 3, 4]
+    user_lat, user_lon = 51.2, 6.45
+    
+    dict_strategy = DistanceAndTimeFilterStrategy(time_checker, distance_calculator)
+    soa_strategy = DistanceAndTimeFilterStrategy(time_checker, distance_calculator, spatial_index)
+    
+    for hour in ['02:00:00', '03:00:00', '03:00:01', '09:00:00', '14:00:00', '23:00:00']:
+        current_time = datetime.strptime(hour, '%H:%M:%S')
+        expected = [
+            restaurant_id for restaurant_id in candidates
+            if distance_calculator.calculate_distance(
+                user_lat, user_lon,
+                restaurants[restaurant_id]['latitude'], restaurants[restaurant_id]['longitude']
+            ) <= restaurants[restaurant_id]['availability_radius']
+            and time_checker.is_open(restaurants[restaurant_id]['open_hour'],
+                                     restaurants[restaurant_id]['close_hour'], current_time)
+        ]
+        assert dict_strategy.filter_restaurants(
+            candidates, restaurants, user_lat, user_lon, current_time) == expected
+        assert soa_strategy.filter_restaurants(
+            candidates, restaurants, user_lat, user_lon, current_time) == expected
+    
+    assert dict_strategy.filter_restaurants([], restaurants, user_lat, user_lon) == []
+    
+    # Candidates may also come as an array, as the index hands them out
+    current_time = datetime.strptime('23:00:00', '%H:%M:%S')
+    assert soa_strategy.filter_restaurants(np.array(candidates), restaurants, user_lat, user_lon,
+                                           current_time) == dict_strategy.filter_restaurants(
+        candidates, restaurants, user_lat, user_lon, current_time)
+    assert soa_strategy.filter_restaurants(np.array([], dtype=np.int64), restaurants, user_lat, user_lon) == []
+    
+    # Rating thresholds give the same answer from the dictionary and the index columns
+    current_time = datetime.strptime('23:00:00', '%H:%M:%S')
+    for min_rating in [4.0, 4.7, 4.75, 4.8]:
+        dict_rating = RatingFilterStrategy(dict_strategy, min_rating=min_rating)
+        soa_rating = RatingFilterStrategy(soa_strategy, min_rating=min_rating, spatial_index=spatial_index)
+        expected = [
+            restaurant_id
+            for restaurant_id in dict_strategy.filter_restaurants(
+                candidates, restaurants, user_lat, user_lon, current_time)
+            if restaurants[restaurant_id]['rating'] >= min_rating
+        ]
+        assert dict_rating.filter_restaurants(
+            candidates, restaurants, user_lat, user_lon, current_time) == expected
+        assert soa_rating.filter_restaurants(
+            candidates, restaurants, user_lat, user_lon, current_time) == expected
+        
+        # Stacked rating strategies fold into the same single mask
+        stacked = RatingFilterStrategy(RatingFilterStrategy(soa_strategy, min_rating=4.0), min_rating=min_rating)
+        assert stacked.filter_restaurants(
+            candidates, restaurants, user_lat, user_lon, current_time) == expected
+        
+        # The rating threshold is an ordinary column predicate of the base strategy
+        predicate_strategy = DistanceAndTimeFilterStrategy(time_checker, distance_calculator, spatial_index,
+                                                           [('rating', '>=', min_rating)])
+        assert predicate_strategy.filter_restaurants(
+            candidates, restaurants, user_lat, user_lon, current_time) == expected
+    
+    # Base strategies without a column pass are filtered first, then by rating
+    class ListStrategy(FilterStrategy):
+        def filter_restaurants(self, candidates, restaurants, user_lat, user_lon, current_time=None):
+            return dict_strategy.filter_restaurants(candidates, restaurants, user_lat, user_lon, current_time)
+    
+    assert ListStrategy().with_column_predicate('rating', '>=', 4.75) is None
+    assert RatingFilterStrategy(ListStrategy(), min_rating=4.75).filter_restaurants(
+        candidates, restaurants, user_lat, user_lon, current_time) == RatingFilterStrategy(
+        soa_strategy, min_rating=4.75).filter_restaurants(candidates, restaurants, user_lat, user_lon, current_time)
+    
+    # Registering a predicate leaves the original strategy unchanged
+    assert soa_strategy.with_column_predicate('rating', '>', 5.0).filter_restaurants(
+        candidates, restaurants, user_lat, user_lon, current_time) == []
+    assert soa_strategy.column_predicates == ()
+    with pytest.raises(ValueError):
+        soa_strategy.with_column_predicate('rating', '=>', 4.0)
+    
+    # Distances go through the injected calculator
+    class NowhereCalculator(DistanceCalculator):
+        def select_within_radius_radians(self, lat1_rad, lon1_rad, positions, *columns):
+            return positions[:0]
+    
+    assert dict_strategy.filter_restaurants(candidates, restaurants, user_lat, user_lon, current_time) != []
+    nowhere_strategy = DistanceAndTimeFilterStrategy(time_checker, NowhereCalculator(), spatial_index)
+    assert nowhere_strategy.filter_restaurants(candidates, restaurants, user_lat, user_lon, current_time) == []
+
+
 @freeze_time("2023-01-01 15:00:00")  # Freeze time to 15:00
 def test_decorator_pattern(sample_restaurants_df, time_checker, distance_calculator):
     """Test the Decorator pattern for enhancing spatial indexes."""
@@ -137,6 +244,143 @@ def test_decorator_pattern(sample_restaurants_df, time_checker, distance_calcula
     assert caching_index.cache_hits == 2  # Another hit in the cache
 
 
+def test_logging_decorator_file(tmp_path, sample_restaurants_df, time_checker, distance_calculator):
+    """Test that the logging decorator writes every message to its log file."""
+    base_index = SpatialIndex(time_checker, distance_calculator)
+    log_path = tmp_path / "queries.log"
+    
+    logging_index = LoggingSpatialIndex(base_index, log_file=str(log_path))
+    logging_index.build_index(sample_restaurants_df)
+    logging_index.find_restaurants_in_radius(51.2, 6.45)
+    logging_index.close()
+    
+    lines = log_path.read_text().splitlines()
+    assert len(lines) == 4
+    assert lines[0] == "Building spatial index with 4 restaurants"
+    assert lines[2].startswith("Query #1: Finding restaurants near (51.2, 6.45)")
+    
+    # Closing twice is harmless
+    logging_index.close()
+    
+    # A closed file log refuses further messages instead of printing them
+    with pytest.raises(ValueError):
+        logging_index.find_restaurants_in_radius(51.2, 6.45)
+    assert len(log_path.read_text().splitlines()) == 4
+
+
+def test_caching_decorator_bounds(sample_restaurants_df, time_checker, distance_calculator):
+    """Test LRU eviction and TTL expiry of the caching decorator."""
+    base_index = SpatialIndex(time_checker, distance_calculator)
+    base_index.build_index(sample_restaurants_df)
+    query_time = datetime(2023, 1, 1, 15, 0, 0)
+    
+    # Least recently used entries are evicted once the cache is full
+    caching_index = CachingSpatialIndex(base_index, cache_size=2)
+    caching_index.find_restaurants_in_radius(51.2, 6.45, query_time)
+    caching_index.find_restaurants_in_radius(50.13, 19.64, query_time)
+    caching_index.find_restaurants_in_radius(51.2, 6.45, query_time)
+    caching_index.find_restaurants_in_radius(52.5, 13.33, query_time)
+    stats = caching_index.get_cache_stats()
+    assert stats['size'] == 2
+    assert stats['evictions'] == 1
+    assert stats['hits'] == 1
+    
+    # The recently used entry survived, the oldest one was evicted
+    caching_index.find_restaurants_in_radius(51.2, 6.45, query_time)
+    assert caching_index.get_cache_stats()['hits'] == 2
+    caching_index.find_restaurants_in_radius(50.13, 19.64, query_time)
+    assert caching_index.get_cache_stats()['misses'] == 4
+    
+    # Queries within the same location cell and time bucket share an entry
+    caching_index.find_restaurants_in_radius(51.2001, 6.4501, query_time.replace(minute=2))
+    assert caching_index.get_cache_stats()['hits'] == 3
+    
+    # Expired entries count as misses
+    expiring_index = CachingSpatialIndex(base_index, ttl=0.0)
+    expiring_index.find_restaurants_in_radius(51.2, 6.45, query_time)
+    expiring_index.find_restaurants_in_radius(51.2, 6.45, query_time)
+    stats = expiring_index.get_cache_stats()
+    assert stats['hits'] == 0
+    assert stats['misses'] == 2
+    assert stats['expirations'] == 1
+    
+    # Locations and times outside the key fields bypass the cache instead of
+    # colliding with other keys
+    bypass_index = CachingSpatialIndex(base_index)
+    with pytest.raises(ValueError):
+        bypass_index._cache_key(10.0, -181.0, None)
+    for latitude, longitude, current_time in [(10.0, -181.0, query_time), (20.0, -181.0, query_time),
+                                              (51.2, 366.45, query_time), (91.0, 6.45, query_time),
+                                              (51.2, 6.45, 86400 + 15 * 3600)]:
+        assert bypass_index.find_restaurants_in_radius(latitude, longitude, current_time) == \
+            base_index.find_restaurants_in_radius(latitude, longitude, current_time)
+    latitudes = np.array([10.0, 20.0, 51.2, 51.2])
+    longitudes = np.array([-181.0, -181.0, 366.45, 6.45])
+    for current_time in [query_time, 86400 + 15 * 3600]:
+        assert bypass_index.find_restaurants_in_radius_batch(latitudes, longitudes, current_time) == \
+            base_index.find_restaurants_in_radius_batch(latitudes, longitudes, current_time)
+    assert bypass_index.get_cache_stats()['size'] == 1
+
+
+def test_caching_decorator_batch(sample_restaurants_df, time_checker, distance_calculator):
+    """Test that batched cached queries match one-by-one queries."""
+    base_index = SpatialIndex(time_checker, distance_calculator)
+    base_index.build_index(sample_restaurants_df)
+    query_time = datetime(2023, 1, 1, 15, 0, 0)
+    
+    latitudes = np.array([51.2, 51.2001, 50.13, 52.5, 51.2])
+    longitudes = np.array([6.45, 6.4501, 19.64, 13.33, 6.45])
+    expected = [base_index.find_restaurants_in_radius(lat, lon, query_time)
+                for lat, lon in zip(latitudes, longitudes)]
+    
+    caching_index = CachingSpatialIndex(base_index)
+    assert caching_index.find_restaurants_in_radius_batch(latitudes, longitudes, query_time) == expected
+    
+    # Three distinct cells miss, the repeats within the batch hit
+    stats = caching_index.get_cache_stats()
+    assert stats['misses'] == 3
+    assert stats['hits'] == 2
+    assert stats['size'] == 3
+    
+    # Batched and one-by-one queries share cache entries
+    caching_index.find_restaurants_in_radius(50.13, 19.64, query_time)
+    assert caching_index.get_cache_stats()['hits'] == 3
+    
+    # A batch cannot overflow the cache
+    small_index = CachingSpatialIndex(base_index, cache_size=2)
+    assert small_index.find_restaurants_in_radius_batch(latitudes, longitudes, query_time) == expected
+    assert small_index.get_cache_stats()['size'] == 2
+    assert small_index.get_cache_stats()['evictions'] == 1
+    
+    # Seconds since midnight share the cache entries of the same time of day
+    seconds = query_time.hour * 3600
+    assert caching_index.find_restaurants_in_radius_batch(latitudes, longitudes, seconds) == expected
+    assert caching_index.find_restaurants_in_radius(51.2, 6.45, seconds) == expected[0]
+    assert caching_index.get_cache_stats()['misses'] == 3
+
+
+def test_availability_logger_file(tmp_path):
+    """Test that the availability logger writes each message to its file as it is logged."""
+    log_file = tmp_path / "availability.log"
+    logger = AvailabilityLogger(str(log_file))
+    
+    logger.update(1, True)
+    logger.update(2, False)
+    assert log_file.read_text().splitlines() == [
+        "Restaurant 1 is now available",
+        "Restaurant 2 is now unavailable",
+    ]
+    
+    logger.update(3, True)
+    logger.close()
+    assert log_file.read_text().splitlines()[-1] == "Restaurant 3 is now available"
+    
+    # A closed file logger refuses further updates instead of printing them
+    with pytest.raises(ValueError):
+        logger.update(4, False)
+    assert len(log_file.read_text().splitlines()) == 3
+
+
 def test_observer_pattern():
     """Test the Observer pattern for restaurant availability updates."""
     # Create a subject
@@ -170,13 +414,20 @@ def test_observer_pattern():
     subject.notify_availability_change(3, True)
     assert 3 in subject.get_available_restaurants()
     assert 3 in monitor.get_available_restaurants_of_interest()
+    assert list(subject.observers.values()) == [monitor]
+    
+    # Attaching twice registers once; detaching an unknown observer is a no-op
+    subject.attach(monitor)
+    subject.detach(logger)
+    assert list(subject.observers.values()) == [monitor]
 
 
 def test_composite_pattern(distance_calculator):
     """Test the Composite pattern for complex geographic regions."""
     # Create simple regions
-    # Using a smaller radius for testing to ensure points are within the expected distance
-    circle1 = CircleRegion(51.0, 6.0, 50.0, distance_calculator)  # 50km radius
+    # circle1 is large enough to reach (50.5, 5.5), about 66km from its center,
+    # so it overlaps the rectangle there
+    circle1 = CircleRegion(51.0, 6.0, 80.0, distance_calculator)  # 80km radius
     circle2 = CircleRegion(52.0, 7.0, 25.0, distance_calculator)  # 25km radius
     rectangle = RectangleRegion(50.0, 5.0, 51.5, 6.5)
     
@@ -184,6 +435,8 @@ def test_composite_pattern(distance_calculator):
     assert circle1.contains(51.0, 6.0) == True  # Center point
     assert circle1.contains(51.1, 6.1) == True  # Point within radius
     assert circle1.contains(60.0, 6.0) == False  # Point outside radius
+    assert circle1.contains(51.0, 7.1) == True  # About 77km east, inside the box and radius
+    assert circle1.contains(51.7, 7.0) == False  # Inside the box corner, outside radius
     
     assert rectangle.contains(50.5, 5.5) == True  # Point inside
     assert rectangle.contains(52.0, 5.5) == False  # Point outside
@@ -197,6 +450,9 @@ def test_composite_pattern(distance_calculator):
     intersection.add_region(circle1)
     intersection.add_region(rectangle)
     
+    # Cheaper regions are checked first regardless of insertion order
+    assert intersection.regions == [rectangle, circle1]
+    
     # Test union region
     assert union.contains(51.0, 6.0) == True  # In circle1
     assert union.contains(50.5, 5.5) == True  # In rectangle
@@ -217,3 +473,28 @@ def test_composite_pattern(distance_calculator):
     # Test removing from composites
     union.remove_region(circle1)
     assert union.contains(51.0, 6.0) == True  # Still in rectangle
+
+
+def test_composite_contains_many(distance_calculator):
+    """Test that batched containment checks match the scalar ones."""
+    circle = CircleRegion(51.0, 6.0, 80.0, distance_calculator)
+    rectangle = RectangleRegion(50.0, 5.0, 51.5, 6.5)
+    
+    union = UnionRegion()
+    union.add_region(circle)
+    union.add_region(rectangle)
+    
+    intersection = IntersectionRegion()
+    intersection.add_region(circle)
+    intersection.add_region(rectangle)
+    
+    lats, lons = np.meshgrid(np.linspace(49.0, 53.0, 21), np.linspace(4.0, 8.0, 21))
+    lats, lons = lats.ravel(), lons.ravel()
+    
+    for region in (circle, rectangle, union, intersection):
+        expected = [region.contains(lat, lon) for lat, lon in zip(lats, lons)]
+        assert region.contains_many(lats, lons).tolist() == expected
+    
+    # Empty composites contain nothing
+    assert not UnionRegion().contains_many(lats, lons).any()
+    assert not IntersectionRegion().contains_many(lats, lons).any()
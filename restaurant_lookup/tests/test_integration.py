@@ -2,6 +2,7 @@
 Integration tests for the refactored restaurant lookup script.
 """
 
+import io
 import os
 import pytest
 import pandas as pd
@@ -14,17 +15,16 @@ from freezegun import freeze_time
 from time_checker import TimeChecker
 from distance_calculator import DistanceCalculator
 from spatial_index import SpatialIndex
-from data_loader import CSVDataLoader
+from data_loader import CSVDataLoader, seconds_of_day
+from interfaces import DataLoaderInterface, ResultWriterInterface
 from result_writer import CSVResultWriter
-from restaurant_lookup import RestaurantLookupService
+from restaurant_lookup import RestaurantLookupService, _load_coordinates
 
 
-@pytest.fixture
-def sample_restaurants_csv():
-    """Create a sample CSV file with restaurant data for testing."""
-    # Create a temporary directory
-    temp_dir = tempfile.mkdtemp()
-    csv_path = os.path.join(temp_dir, 'restaurants.csv')
+@pytest.fixture(scope='session')
+def sample_restaurants_csv(tmp_path_factory):
+    """Create a sample CSV file with restaurant data, shared by all tests."""
+    csv_path = str(tmp_path_factory.mktemp('restaurants', numbered=False) / 'restaurants.csv')
     
     # Create sample data
     data = [
@@ -35,23 +35,18 @@ def sample_restaurants_csv():
         ['4', '50.9118822', '4.4350511', '1', '08:00:00', '23:00:00', '4.9']
     ]
     
-    # Write to CSV
+    # Write to CSV once; tests only read it
     with open(csv_path, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerows(data)
     
-    yield csv_path
-    
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    return csv_path
 
 
-@pytest.fixture
-def sample_users_csv():
-    """Create a sample CSV file with user locations for testing."""
-    # Create a temporary directory
-    temp_dir = tempfile.mkdtemp()
-    csv_path = os.path.join(temp_dir, 'users.csv')
+@pytest.fixture(scope='session')
+def sample_users_csv(tmp_path_factory):
+    """Create a sample CSV file with user locations, shared by all tests."""
+    csv_path = str(tmp_path_factory.mktemp('users', numbered=False) / 'users.csv')
     
     # Create sample data - users at various distances from restaurants
     data = [
@@ -62,15 +57,12 @@ def sample_users_csv():
         ['40.0', '0.0']  # Far from all restaurants
     ]
     
-    # Write to CSV
+    # Write to CSV once; tests only read it
     with open(csv_path, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerows(data)
     
-    yield csv_path
-    
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    return csv_path
 
 
 @pytest.fixture
@@ -147,7 +139,8 @@ def test_process_user_locations_with_invalid_data(sample_restaurants_csv, restau
             ['not_a_number', '6.45'],  # Invalid latitude
             ['51.2'],  # Missing longitude
             [],  # Empty row
-            ['51.2', '6.45']  # Valid row
+            ['51.2', '6.45'],  # Valid row
+            ['50.13', '19.64', 'user_7']  # Valid row with an extra field
         ])
     
     # Create a temporary output file
@@ -167,9 +160,12 @@ def test_process_user_locations_with_invalid_data(sample_restaurants_csv, restau
             reader = csv.reader(f)
             results = list(reader)
         
-        # Only the valid row should be processed
-        assert len(results) == 1
-        assert results[0][0] == '51.2,6.45'
+        # Only the valid rows should be processed
+        assert [result[0] for result in results] == ['51.2,6.45', '50.13,19.64']
+        
+        # Extra fields are ignored on the fast path as well
+        coordinates = _load_coordinates("51.2,6.45,user_7\n50.13,19.64,user_8\n")
+        assert coordinates.tolist() == [[51.2, 6.45], [50.13, 19.64]]
         
     finally:
         # Cleanup
@@ -177,7 +173,142 @@ def test_process_user_locations_with_invalid_data(sample_restaurants_csv, restau
         shutil.rmtree(temp_dir)
 
 
-def test_with_real_data():
+def test_process_user_locations_from_io(sample_restaurants_csv, restaurant_lookup_service, capsys):
+    """Test processing user locations from in-memory streams."""
+    users_fp = io.StringIO("51.2,6.45\n40.0,0.0\n")
+    output_fp = io.StringIO()
+    
+    restaurant_lookup_service.load_restaurants(sample_restaurants_csv)
+    restaurant_lookup_service.process_user_locations_from_io(
+        users_fp, output_fp, current_time=datetime(2023, 1, 1, 15, 0, 0)
+    )
+    
+    assert "Query #" not in capsys.readouterr().out
+    results = list(csv.reader(io.StringIO(output_fp.getvalue())))
+    assert results == [['51.2,6.45', '1'], ['40.0,0.0', '']]
+    
+    # Per-query progress is only printed when the service is verbose
+    restaurant_lookup_service.verbose = True
+    restaurant_lookup_service.process_user_locations_from_io(
+        io.StringIO("51.2,6.45\n"), io.StringIO(), current_time=datetime(2023, 1, 1, 15, 0, 0)
+    )
+    assert capsys.readouterr().out.splitlines() == [
+        "Query #1: Finding restaurants near (51.2, 6.45) at 15:00:00",
+        "Query #1: Found 1 restaurants",
+    ]
+
+
+def test_seconds_of_day_rejects_invalid_hours():
+    """Test that opening hours are parsed once each and invalid ones are rejected."""
+    assert seconds_of_day(pd.Series(['14:00:00', '09:30:15', '14:00:00'])).tolist() == [50400, 34215, 50400]
+    
+    for hours in [['14:00:00', None], ['14:00:00', float('nan')], ['25:00:00'], ['abc']]:
+        with pytest.raises(ValueError, match="Invalid time of day"):
+            seconds_of_day(pd.Series(hours, dtype=object))
+
+
+def test_data_loader_default_soa(sample_restaurants_csv):
+    """Test that a loader implementing only load_data still loads Struct-of-Arrays."""
+    class FrameLoader(DataLoaderInterface):
+        def load_data(self, source):
+            return pd.read_csv(source)
+    
+    columns = FrameLoader().load_data_soa(sample_restaurants_csv)
+    assert columns['id'].tolist() == pd.read_csv(sample_restaurants_csv)['id'].tolist()
+    assert set(columns) == set(pd.read_csv(sample_restaurants_csv).columns)
+
+
+def test_result_writer_accepts_arrays():
+    """Test that restaurant IDs can be written from lists and NumPy arrays alike."""
+    import numpy as np
+    
+    output_fp = io.StringIO()
+    CSVResultWriter().write_results_to_io([
+        {'location': '51.2,6.45', 'restaurants': [1, 3]},
+        {'location': '50.13,19.64', 'restaurants': np.array([2, 4], dtype=np.int32)},
+        {'location': '40.0,0.0', 'restaurants': np.empty(0, dtype=np.int64)},
+    ], output_fp)
+    
+    results = list(csv.reader(io.StringIO(output_fp.getvalue())))
+    assert results == [['51.2,6.45', '1;3'], ['50.13,19.64', '2;4'], ['40.0,0.0', '']]
+    
+    # A writer implementing only write_results can still write to a stream
+    class FileWriter(ResultWriterInterface):
+        def write_results(self, results, output_path):
+            CSVResultWriter().write_results(results, output_path)
+    
+    default_fp = io.StringIO()
+    FileWriter().write_results_to_io([{'location': '51.2,6.45', 'restaurants': [1, 3]}], default_fp)
+    assert default_fp.getvalue() == output_fp.getvalue().splitlines(keepends=True)[0]
+
+
+def test_process_user_locations_in_blocks(sample_restaurants_csv, sample_users_csv,
+                                          restaurant_lookup_service, monkeypatch, tmp_path, capsys):
+    """Test that reading user files in small blocks gives the same results."""
+    import restaurant_lookup
+    
+    invalid_users_csv = tmp_path / 'invalid_users.csv'
+    invalid_users_csv.write_text("not_a_number,6.45\n\n51.2,6.45\n50.13,19.64")
+    restaurant_lookup_service.load_restaurants(sample_restaurants_csv)
+    now = datetime(2023, 1, 1, 15, 0, 0)
+    capsys.readouterr()
+    
+    for users_csv in [sample_users_csv, str(invalid_users_csv)]:
+        expected_path = tmp_path / 'expected.csv'
+        restaurant_lookup_service.process_user_locations(users_csv, str(expected_path), current_time=now)
+        expected_output = capsys.readouterr().out
+        
+        # Blocks this small end mid-line, so lines are carried over between them
+        blocks_path = tmp_path / 'blocks.csv'
+        with monkeypatch.context() as m:
+            m.setattr(restaurant_lookup, 'USER_READ_BLOCK_SIZE', 7)
+            restaurant_lookup_service.process_user_locations(users_csv, str(blocks_path), current_time=now)
+        
+        assert blocks_path.read_text() == expected_path.read_text()
+        assert capsys.readouterr().out.replace(str(blocks_path), str(expected_path)) == expected_output
+    
+    assert "line 1:" in expected_output
+    assert len(expected_path.read_text().splitlines()) == 2
+
+
+def test_process_user_locations_multithreaded(sample_restaurants_csv):
+    """Test that threaded processing keeps results in input order."""
+    temp_dir = tempfile.mkdtemp()
+    users_csv_path = os.path.join(temp_dir, 'many_users.csv')
+    output_path = os.path.join(temp_dir, 'output.csv')
+    
+    # Enough users to span several chunks, alternating near and far locations
+    locations = [['51.2', '6.45'] if i % 2 == 0 else ['40.0', '0.0'] for i in range(1000)]
+    with open(users_csv_path, 'w', newline='') as f:
+        csv.writer(f).writerows(locations)
+    
+    now = datetime(2023, 1, 1, 15, 0, 0)
+    service = RestaurantLookupService(
+        SpatialIndex(TimeChecker(), DistanceCalculator()),
+        CSVDataLoader(),
+        CSVResultWriter(),
+        max_workers=4
+    )
+    
+    try:
+        service.load_restaurants(sample_restaurants_csv)
+        service.process_user_locations(users_csv_path, output_path, current_time=now)
+        
+        with open(output_path, 'r') as f:
+            results = list(csv.reader(f))
+        
+        assert len(results) == 1000
+        for i, row in enumerate(results):
+            if i % 2 == 0:
+                assert row == ['51.2,6.45', '1']
+            else:
+                assert row == ['40.0,0.0', '']
+        
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_with_real_data(tmp_path):
     """Test with the real data provided in the takehome.csv file."""
     # Skip this test if the takehome.csv file doesn't exist
     # Use os.path for platform-independent path handling
@@ -187,47 +318,36 @@ def test_with_real_data():
         pytest.skip(f"Takehome CSV file not found at {takehome_csv}")
     
     # Create a sample users CSV
-    temp_dir = tempfile.mkdtemp()
-    users_csv_path = os.path.join(temp_dir, 'test_users.csv')
+    users_csv_path = str(tmp_path / 'test_users.csv')
     with open(users_csv_path, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerows([
             ['51.2', '6.45'],  # Near some restaurants in the dataset
             ['40.0', '0.0']    # Far from most restaurants
         ])
+    output_path = str(tmp_path / 'output.csv')
     
-    # Create a temporary output file
-    output_file = tempfile.NamedTemporaryFile(delete=False)
-    output_path = output_file.name
-    output_file.close()
+    # Create service
+    time_checker = TimeChecker()
+    distance_calculator = DistanceCalculator()
+    spatial_index = SpatialIndex(time_checker, distance_calculator)
+    data_loader = CSVDataLoader()
+    result_writer = CSVResultWriter()
+    service = RestaurantLookupService(spatial_index, data_loader, result_writer)
     
-    try:
-        # Create service
-        time_checker = TimeChecker()
-        distance_calculator = DistanceCalculator()
-        spatial_index = SpatialIndex(time_checker, distance_calculator)
-        data_loader = CSVDataLoader()
-        result_writer = CSVResultWriter()
-        service = RestaurantLookupService(spatial_index, data_loader, result_writer)
-        
-        # Load restaurant data and build index
-        service.load_restaurants(takehome_csv)
-        
-        # Process user locations
-        service.process_user_locations(users_csv_path, output_path)
-        
-        # Verify output exists
-        assert os.path.exists(output_path)
-        
-        # Read output
-        with open(output_path, 'r') as f:
-            reader = csv.reader(f)
-            results = list(reader)
-        
-        # Verify we have results for both user locations
-        assert len(results) == 2
-        
-    finally:
-        # Cleanup
-        os.unlink(output_path)
-        shutil.rmtree(temp_dir)
+    # Load restaurant data and build index
+    service.load_restaurants(takehome_csv)
+    
+    # Process user locations
+    service.process_user_locations(users_csv_path, output_path)
+    
+    # Verify output exists
+    assert os.path.exists(output_path)
+    
+    # Read output
+    with open(output_path, 'r') as f:
+        reader = csv.reader(f)
+        results = list(reader)
+    
+    # Verify we have results for both user locations
+    assert len(results) == 2
@@ -4,11 +4,22 @@ Unit tests for the refactored spatial indexing module.
 
 import pytest
 import pandas as pd
+import math
+import numpy as np
 from datetime import datetime, time
 
 from time_checker import TimeChecker
 from distance_calculator import DistanceCalculator
-from spatial_index import SpatialIndex
+from interfaces import DistanceCalculatorInterface
+import spatial_index
+from spatial_index import SpatialIndex, delivery_boxes
+from grid_index import GRID_ENTRIES_PER_AREA, DeliveryGrid, GridSpatialIndex
+from _kernels import (available_array, haversine_batch, haversine_from_rad,
+                      haversine_point_from_rad, _available_array_numpy,
+                      _haversine_batch_numpy, _haversine_from_rad_numpy,
+                      _haversine_point_from_rad_python, _within_radius_array_numpy, select_within_radius,
+                      _select_within_radius_numpy, within_radius_pairs_indexed,
+                      _within_radius_pairs_indexed_numpy)
 
 
 @pytest.fixture
@@ -54,14 +65,123 @@ def test_build_index(sample_restaurants_df, time_checker, distance_calculator):
     assert len(idx.restaurants) == len(sample_restaurants_df)
     
     # Check if restaurant data is stored correctly
-    for _, row in sample_restaurants_df.iterrows():
-        restaurant_id = row['id']
-        assert restaurant_id in idx.restaurants
-        assert idx.restaurants[restaurant_id]['latitude'] == row['latitude']
-        assert idx.restaurants[restaurant_id]['longitude'] == row['longitude']
-        assert idx.restaurants[restaurant_id]['availability_radius'] == row['availability_radius']
+    for row in sample_restaurants_df.itertuples(index=False):
+        assert row.id in idx.restaurants
+        assert idx.restaurants[row.id]['latitude'] == row.latitude
+        assert idx.restaurants[row.id]['longitude'] == row.longitude
+        assert idx.restaurants[row.id]['availability_radius'] == row.availability_radius
+        assert idx.restaurants[row.id]['open_hour'] == row.open_hour
+    
+    # Records are assembled from the columns, so unknown IDs are simply missing
+    assert 999 not in idx.restaurants
+    assert 'abc' not in idx.restaurants
+    assert list(idx.restaurants) == sample_restaurants_df['id'].tolist()
+    
+    # Distances from the float32 radian columns stay within 10 meters of float64 ones
+    columns = idx.get_columns(sample_restaurants_df['id'].to_numpy())
+    assert columns['lat_rad'].dtype == np.float32
+    exact = haversine_batch(51.2, 6.45, sample_restaurants_df['latitude'].to_numpy(),
+                            sample_restaurants_df['longitude'].to_numpy())
+    approx = haversine_batch(51.2, 6.45, np.degrees(columns['lat_rad'].astype(np.float64)),
+                             np.degrees(columns['lon_rad'].astype(np.float64)))
+    np.testing.assert_allclose(approx, exact, atol=0.01)
+
+
+def test_records_with_duplicate_ids(sample_restaurants_df, time_checker, distance_calculator):
+    """Test that duplicate IDs keep the mapping consistent, with the last record winning."""
+    idx = SpatialIndex(time_checker, distance_calculator)
+    assert len(idx.restaurants) == 0
+    assert list(idx.restaurants) == []
+    
+    duplicated = sample_restaurants_df.assign(id=[3, 1, 3, 2])
+    idx.build_index(duplicated)
+    
+    assert len(idx.restaurants) == 3
+    assert list(idx.restaurants) == [1, 3, 2]
+    assert idx.restaurants[3]['latitude'] == duplicated['latitude'][2]
+    records = dict(idx.restaurants)
+    assert len(records) == len(idx.restaurants)
+    assert records[3] == idx.restaurants[3]
+    
+    # Column lookups resolve duplicates the same way and reject unknown IDs
+    assert idx.get_columns(np.array([3, 1]))['latitude'].tolist() == duplicated['latitude'][[2, 1]].tolist()
+    for unknown in ([0], [4], [1, 5]):
+        with pytest.raises(KeyError):
+            idx.get_columns(np.array(unknown))
 
 
+def test_float32_columns_match_float64(time_checker, distance_calculator):
+    """Test that radius checks on the float32 columns agree with float64 outside a 2 m margin."""
+    rng = np.random.default_rng(7)
+    count = 2000
+    # Half the restaurants sit next to the antimeridian, where float32 longitudes are coarsest
+    longitudes = np.concatenate([rng.uniform(-180, 180, count // 2),
+                                 rng.choice([-1, 1], count // 2) * rng.uniform(179, 180, count // 2)])
+    restaurants_df = pd.DataFrame({
+        'id': np.arange(count),
+        'latitude': rng.uniform(-70, 70, count),
+        'longitude': longitudes,
+        'availability_radius': rng.uniform(0.5, 50, count),
+        'open_hour': '00:00:00',
+        'close_hour': '23:59:59',
+        'rating': 4.0,
+    })
+    idx = SpatialIndex(time_checker, distance_calculator)
+    idx.build_index(restaurants_df)
+    
+    noon = datetime.strptime('12:00:00', '%H:%M:%S')
+    margin = 0.002
+    for i in rng.choice(count, 100, replace=False):
+        user_lat = restaurants_df['latitude'][i] + rng.uniform(-0.3, 0.3)
+        user_lon = restaurants_df['longitude'][i] + rng.uniform(-0.3, 0.3)
+        user_lon = (user_lon + 180) % 360 - 180
+        distances = haversine_batch(user_lat, user_lon, restaurants_df['latitude'].to_numpy(),
+                                    restaurants_df['longitude'].to_numpy())
+        radius = restaurants_df['availability_radius'].to_numpy()
+        
+        found = set(idx.find_restaurants_in_radius(user_lat, user_lon, noon))
+        assert set(np.flatnonzero(distances <= radius - margin).tolist()) <= found
+        assert found <= set(np.flatnonzero(distances <= radius + margin).tolist())
+
+def test_index_keeps_restaurants_at_the_delivery_edge(time_checker, distance_calculator):
+    """Test that the index boxes never prune a restaurant the exact check accepts, right at the edge."""
+    rng = np.random.default_rng(3)
+    count = 2000
+    longitudes = np.concatenate([rng.uniform(-180, 180, count // 2),
+                                 rng.choice([-1, 1], count // 2) * rng.uniform(179, 180, count // 2)])
+    restaurants_df = pd.DataFrame({
+        'id': np.arange(count),
+        'latitude': rng.uniform(-80, 80, count),
+        'longitude': longitudes,
+        'availability_radius': rng.uniform(0.5, 50, count),
+        'open_hour': '00:00:00',
+        'close_hour': '23:59:59',
+        'rating': 4.0,
+    })
+    
+    # Users within 2 m of each restaurant's delivery edge, due north or south where the
+    # edge touches the box
+    lat_rad = np.radians(restaurants_df['latitude'].to_numpy())
+    lon_rad = np.radians(restaurants_df['longitude'].to_numpy())
+    angle = (restaurants_df['availability_radius'].to_numpy() + rng.uniform(-0.002, 0.002, count)) / 6371.0
+    bearing = rng.choice([0, np.pi], count)
+    user_lat = np.arcsin(np.sin(lat_rad) * np.cos(angle) + np.cos(lat_rad) * np.sin(angle) * np.cos(bearing))
+    user_lon = lon_rad + np.arctan2(np.sin(bearing) * np.sin(angle) * np.cos(lat_rad),
+                                    np.cos(angle) - np.sin(lat_rad) * np.sin(user_lat))
+    user_lat = np.degrees(user_lat)
+    user_lon = (np.degrees(user_lon) + 180) % 360 - 180
+    
+    noon = datetime.strptime('12:00:00', '%H:%M:%S')
+    everyone = np.arange(count, dtype=np.intp)
+    for idx in (SpatialIndex(time_checker, distance_calculator), GridSpatialIndex(time_checker, distance_calculator)):
+        idx.build_index(restaurants_df)
+        expected = [sorted(idx._filter_candidates(everyone, la, lo, noon))
+                    for la, lo in zip(user_lat.tolist(), user_lon.tolist())]
+        assert [sorted(ids) for ids in idx.find_restaurants_in_radius_batch(user_lat, user_lon, noon)] == expected
+        assert [sorted(idx.find_restaurants_in_radius(la, lo, noon))
+                for la, lo in zip(user_lat.tolist(), user_lon.tolist())] == expected
+        assert sum(map(len, expected)) > count // 4
+
 def test_time_checker():
     """Test the TimeChecker class."""
     checker = TimeChecker()
@@ -83,6 +203,24 @@ def test_time_checker():
     assert checker.is_open('22:00:00', '06:00:00', datetime.strptime('02:00:00', '%H:%M:%S').time())
     assert not checker.is_open('22:00:00', '06:00:00', datetime.strptime('21:59:59', '%H:%M:%S').time())
     assert not checker.is_open('22:00:00', '06:00:00', datetime.strptime('06:00:01', '%H:%M:%S').time())
+    
+    # The seconds form checks many hours at once, normal and overnight alike
+    open_s = np.array([14 * 3600, 22 * 3600, 22 * 3600], dtype=np.int32)
+    close_s = np.array([23 * 3600, 6 * 3600, 6 * 3600], dtype=np.int32)
+    at_2am = checker.is_open_seconds(open_s, close_s, datetime.strptime('02:00:00', '%H:%M:%S').time())
+    assert at_2am.tolist() == [False, True, True]
+    at_3pm = checker.is_open_seconds(open_s, close_s, datetime.strptime('15:00:00', '%H:%M:%S').time())
+    assert at_3pm.tolist() == [True, False, False]
+
+
+def test_time_checker_fixed_now():
+    """Test that a TimeChecker with a fixed time uses it when no time is given."""
+    checker = TimeChecker(now=datetime(2023, 1, 1, 15, 0, 0))
+    assert checker.is_open('14:00:00', '23:00:00')
+    assert not checker.is_open('09:00:00', '12:00:00')
+    
+    # An explicit time still takes precedence
+    assert checker.is_open('09:00:00', '12:00:00', datetime.strptime('10:00:00', '%H:%M:%S').time())
 
 
 def test_distance_calculator():
@@ -98,6 +236,87 @@ def test_distance_calculator():
     
     # Check if distance is in the expected range
     assert 500 <= distance <= 600
+    
+    # The batch form matches the scalar form for every point
+    distances = calculator.calculate_distance_batch(
+        berlin_lat, berlin_lon, np.array([munich_lat, berlin_lat]), np.array([munich_lon, berlin_lon])
+    )
+    assert distances[0] == pytest.approx(distance)
+    assert distances[1] == pytest.approx(0.0, abs=1e-6)
+    
+    # So does a function bound to the origin
+    distance_from_berlin = calculator.distance_from(berlin_lat, berlin_lon)
+    assert distance_from_berlin(munich_lat, munich_lon) == pytest.approx(distance)
+    
+    # A calculator implementing only the scalar form gets the batch form by default
+    class ScalarCalculator(DistanceCalculatorInterface):
+        def calculate_distance(self, lat1, lon1, lat2, lon2):
+            return calculator.calculate_distance(lat1, lon1, lat2, lon2)
+    
+    np.testing.assert_allclose(ScalarCalculator().calculate_distance_batch(
+        berlin_lat, berlin_lon, np.array([munich_lat, berlin_lat]), np.array([munich_lon, berlin_lon])
+    ), distances, atol=1e-9)
+
+
+def test_haversine_kernels():
+    """Test the vectorized haversine kernels against a known distance."""
+    # Berlin to Munich and Berlin to itself
+    lat_rad = np.radians(np.array([48.1351, 52.5200]))
+    lon_rad = np.radians(np.array([11.5820, 13.4050]))
+    args = (math.radians(52.5200), math.radians(13.4050), lat_rad, lon_rad, np.cos(lat_rad))
+    degree_args = (52.5200, 13.4050, np.array([48.1351, 52.5200]), np.array([11.5820, 13.4050]))
+    
+    distances = haversine_batch(*degree_args)
+    assert 500 <= distances[0] <= 600
+    assert distances[1] == pytest.approx(0.0, abs=1e-6)
+    
+    # The compiled kernel (when Numba is installed) must match the NumPy fallback
+    np.testing.assert_allclose(_haversine_batch_numpy(*degree_args), distances, atol=1e-6)
+    
+    # So does the kernel taking a precomputed origin
+    origin_args = (math.radians(52.5200), math.radians(13.4050), math.cos(math.radians(52.5200)))
+    np.testing.assert_allclose(haversine_from_rad(*origin_args, *degree_args[2:]), distances, atol=1e-6)
+    np.testing.assert_allclose(_haversine_from_rad_numpy(*origin_args, *degree_args[2:]), distances, atol=1e-6)
+    assert haversine_point_from_rad(*origin_args, 48.1351, 11.5820) == pytest.approx(distances[0])
+    assert _haversine_point_from_rad_python(*origin_args, 48.1351, 11.5820) == pytest.approx(distances[0])
+    
+    # The fused radius check agrees with comparing the distances
+    radius = np.array([distances[0] - 1.0, 1.0])
+    assert _within_radius_array_numpy(*args, radius).tolist() == [False, True]
+    assert _within_radius_array_numpy(*args, radius.astype(np.float32) + 2).tolist() == [True, True]
+    
+    # Negative and missing radii never match, radii past half the globe always do
+    assert _within_radius_array_numpy(*args, np.array([-1.0, np.nan])).tolist() == [False, False]
+    assert _within_radius_array_numpy(*args, np.array([30000.0, 30000.0])).tolist() == [True, True]
+    
+    # The distance and hours kernel also drops closed points, including across midnight
+    open_s = np.array([22 * 3600, 9 * 3600], dtype=np.int32)
+    close_s = np.array([6 * 3600, 17 * 3600], dtype=np.int32)
+    wide = np.array([30000.0, 30000.0])
+    for kernel in (available_array, _available_array_numpy):
+        assert kernel(*args, wide, open_s, close_s, 23 * 3600).tolist() == [True, False]
+        assert kernel(*args, wide, open_s, close_s, 12 * 3600).tolist() == [False, True]
+        assert kernel(*args, radius, open_s, close_s, 12 * 3600).tolist() == [False, True]
+        assert kernel(*args, np.array([np.nan, -1.0]), open_s, close_s, 5 * 3600).tolist() == [False, False]
+    
+    # The selecting kernel reads candidates in place and keeps the eligible ones in range
+    positions = np.array([1, 0, 1], dtype=np.intp)
+    for kernel in (select_within_radius, _select_within_radius_numpy):
+        assert kernel(*args[:2], positions, *args[2:], radius, np.array([True, True])).tolist() == [1, 1]
+        assert kernel(*args[:2], positions, *args[2:], wide, np.array([True, False])).tolist() == [0]
+        assert kernel(*args[:2], positions[:0], *args[2:], wide, np.array([True, True])).tolist() == []
+        assert kernel(*args[:2], positions, *args[2:], np.array([-1.0, np.nan]),
+                      np.array([True, True])).tolist() == []
+    
+    # So does the pairwise one, for pairs of user and point indices
+    user_args = (np.array([math.radians(52.5200)]), np.array([math.radians(13.4050)]),
+                 np.array([math.cos(math.radians(52.5200))]))
+    users = np.zeros(3, dtype=np.intp)
+    for kernel in (within_radius_pairs_indexed, _within_radius_pairs_indexed_numpy):
+        assert kernel(users, positions, *user_args, *args[2:], radius,
+                      np.array([True, True])).tolist() == [True, False, True]
+        assert kernel(users, positions, *user_args, *args[2:], wide,
+                      np.array([True, False])).tolist() == [False, True, False]
 
 
 def test_find_restaurants_in_radius(spatial_index_with_data):
@@ -123,3 +342,167 @@ def test_find_restaurants_in_radius(spatial_index_with_data):
     
     available = idx.find_restaurants_in_radius(user_lat, user_lon, current_time)
     assert len(available) == 0  # No restaurants should be available
+    
+    # The buffer variant writes the same IDs into the given array
+    out = np.zeros(4, dtype=np.int64)
+    count = idx.find_restaurants_in_radius_into(out, 51.2, 6.45, datetime.strptime('15:00:00', '%H:%M:%S'))
+    assert out[:count].tolist() == idx.find_restaurants_in_radius(51.2, 6.45, datetime.strptime('15:00:00', '%H:%M:%S'))
+    assert count == 1
+    assert out[count:].tolist() == [0, 0, 0]
+    
+    with pytest.raises(ValueError):
+        idx.find_restaurants_in_radius_into(np.zeros(0, dtype=np.int64), 51.2, 6.45,
+                                            datetime.strptime('15:00:00', '%H:%M:%S'))
+
+
+def test_find_restaurants_in_radius_batch(spatial_index_with_data):
+    """Test that batched queries match one query per location."""
+    idx = spatial_index_with_data
+    # Includes a repeated location, which is queried once and shared
+    latitudes = np.array([51.2, 51.2, 40.0, 52.5, 50.13, 51.2])
+    longitudes = np.array([6.45, 6.46, 0.0, 13.33, 19.64, 6.45])
+    
+    for hour in ['12:00:00', '15:00:00', '21:00:00']:
+        current_time = datetime.strptime(hour, '%H:%M:%S')
+        expected = [idx.find_restaurants_in_radius(lat, lon, current_time)
+                    for lat, lon in zip(latitudes, longitudes)]
+        assert idx.find_restaurants_in_radius_batch(latitudes, longitudes, current_time) == expected
+    
+    assert idx.find_restaurants_in_radius_batch(np.empty(0), np.empty(0)) == []
+
+
+def test_find_restaurants_in_radius_at_times(spatial_index_with_data):
+    """Test that per-user query times match batched queries at each time."""
+    idx = spatial_index_with_data
+    latitudes = np.array([51.2, 51.2, 52.5, 50.13, 52.5])
+    longitudes = np.array([6.45, 6.45, 13.33, 19.64, 13.33])
+    times = [datetime.strptime(hour, '%H:%M:%S')
+             for hour in ['12:00:00', '15:00:00', '15:00:00', '21:00:00', '21:00:00']]
+    
+    expected = [idx.find_restaurants_in_radius_batch(latitudes[i:i + 1], longitudes[i:i + 1], times[i])[0]
+                for i in range(len(times))]
+    assert idx.find_restaurants_in_radius_at_times(latitudes, longitudes, times) == expected
+    
+    # Seconds since midnight work as well
+    seconds = np.array([t.hour * 3600 for t in times])
+    assert idx.find_restaurants_in_radius_at_times(latitudes, longitudes, seconds) == expected
+    assert idx.find_restaurants_in_radius_at_times(latitudes, longitudes, seconds + 0.5) == expected
+    
+    with pytest.raises(ValueError):
+        idx.find_restaurants_in_radius_at_times(latitudes, longitudes, times[:2])
+    with pytest.raises(ValueError):
+        idx.find_restaurants_in_radius_at_times(latitudes, longitudes, np.full(5, np.nan))
+
+
+def test_find_restaurants_overnight_hours(time_checker, distance_calculator):
+    """Test that restaurants closing after midnight are found on both sides of midnight."""
+    df = pd.DataFrame({
+        'id': [1],
+        'latitude': [51.1942536],
+        'longitude': [6.455508],
+        'availability_radius': [5],
+        'open_hour': ['22:00:00'],
+        'close_hour': ['06:00:00'],
+        'rating': [4.7]
+    })
+    idx = SpatialIndex(time_checker, distance_calculator)
+    idx.build_index(df)
+    
+    assert idx.find_restaurants_in_radius(51.2, 6.45, datetime.strptime('23:00:00', '%H:%M:%S')) == [1]
+    assert idx.find_restaurants_in_radius(51.2, 6.45, datetime.strptime('06:00:00', '%H:%M:%S')) == [1]
+    assert idx.find_restaurants_in_radius(51.2, 6.45, datetime.strptime('12:00:00', '%H:%M:%S')) == []
+    
+    # The open mask is reused for the same time of day and dropped on rebuild
+    late = datetime.strptime('23:00:00', '%H:%M:%S')
+    mask = idx.open_mask(late)
+    assert mask.tolist() == [True]
+    assert idx.open_mask(late.replace(year=2024)) is mask
+    assert idx.open_mask(datetime.strptime('12:00:00', '%H:%M:%S')).tolist() == [False]
+    idx.build_index(df.assign(open_hour=['09:00:00'], close_hour=['17:00:00']))
+    assert idx.find_restaurants_in_radius(51.2, 6.45, datetime.strptime('12:00:00', '%H:%M:%S')) == [1]
+
+
+def test_find_restaurants_delivery_areas(time_checker, distance_calculator):
+    """Test that large, polar and antimeridian delivery areas are indexed in full."""
+    df = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'latitude': [51.0, 78.2, -16.5, 51.0],
+        'longitude': [6.0, 15.6, 179.9, 6.0],
+        'availability_radius': [250, 50, 20, float('nan')],
+        'open_hour': ['00:00:00'] * 4,
+        'close_hour': ['23:59:59'] * 4,
+        'rating': [4.0] * 4
+    })
+    idx = SpatialIndex(time_checker, distance_calculator)
+    idx.build_index(df)
+    noon = datetime.strptime('12:00:00', '%H:%M:%S')
+    
+    assert idx.find_restaurants_in_radius(52.0, 8.5, noon) == [1]
+    assert idx.find_restaurants_in_radius(78.4, 17.5, noon) == [2]
+    assert idx.find_restaurants_in_radius(-16.5, -179.95, noon) == [3]
+    assert idx.find_restaurants_in_radius_batch(
+        np.array([52.0, 78.4, -16.5]), np.array([8.5, 17.5, -179.95]), noon
+    ) == [[1], [2], [3]]
+
+
+def test_grid_index_matches_rtree(time_checker, distance_calculator):
+    """Test that the grid index finds the same restaurants as the R-tree index."""
+    rng = np.random.default_rng(7)
+    n = 500
+    df = pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'latitude': rng.uniform(-89, 89, n),
+        'longitude': rng.uniform(-180, 180, n),
+        # Mostly small areas, plus a few spanning much of the grid
+        'availability_radius': np.where(rng.random(n) < 0.05, 6000.0, rng.uniform(50, 300, n)),
+        'open_hour': ['00:00:00'] * n,
+        'close_hour': ['23:59:59'] * n,
+        'rating': [4.0] * n
+    })
+    rtree_index = SpatialIndex(time_checker, distance_calculator)
+    rtree_index.build_index(df)
+    grid_index = GridSpatialIndex(time_checker, distance_calculator)
+    grid_index.build_index(df)
+    noon = datetime.strptime('12:00:00', '%H:%M:%S')
+    
+    lat = np.append(rng.uniform(-90, 90, 300), [float('nan'), 90.0, -90.0])
+    lon = np.append(rng.uniform(-180, 180, 300), [0.0, 180.0, -180.0])
+    expected = [sorted(ids) for ids in rtree_index.find_restaurants_in_radius_batch(lat, lon, noon)]
+    assert [sorted(ids) for ids in grid_index.find_restaurants_in_radius_batch(lat, lon, noon)] == expected
+    assert [sorted(grid_index.find_restaurants_in_radius(la, lo, noon))
+            for la, lo in zip(lat.tolist(), lon.tolist())] == expected
+    assert sum(map(len, expected)) > 0
+    
+    # An empty grid finds nothing
+    grid_index.build_index(df.iloc[:0])
+    assert grid_index.find_restaurants_in_radius(51.2, 6.45, noon) == []
+    assert grid_index.find_restaurants_in_radius_batch(np.array([51.2]), np.array([6.45]), noon) == [[]]
+
+
+def test_grid_entry_budget_with_tied_spans():
+    """Test that areas tied at the budget threshold cannot overflow the entry budget."""
+    rng = np.random.default_rng(11)
+    count = 20000
+    lat = rng.uniform(35, 60, count)
+    lon = rng.uniform(-10, 30, count)
+    radius = np.where(rng.random(count) < 0.6, 0.5, 1500.0)
+    mins, maxs = delivery_boxes(lat, lon, radius)
+    
+    grid = DeliveryGrid(np.arange(count), mins, maxs)
+    assert grid.wide_start <= GRID_ENTRIES_PER_AREA * count
+    # Every area is still indexed, either in a cell or among the wide areas
+    assert np.array_equal(np.unique(grid.entries), np.arange(count))
+
+
+def test_rtree_stream_fallback(monkeypatch, spatial_index_with_data, sample_restaurants_df,
+                               time_checker, distance_calculator):
+    """Test that rtree releases without array bulk loading get the same index from an item stream."""
+    monkeypatch.setattr(spatial_index, 'RTREE_ARRAY_BULK_LOAD', False)
+    idx = SpatialIndex(time_checker, distance_calculator)
+    idx.build_index(sample_restaurants_df)
+    
+    current_time = datetime.strptime('15:00:00', '%H:%M:%S')
+    latitudes = np.array([51.2, 40.0, 52.5, 50.13])
+    longitudes = np.array([6.45, 0.0, 13.33, 19.64])
+    assert idx.find_restaurants_in_radius_batch(latitudes, longitudes, current_time) == \
+        spatial_index_with_data.find_restaurants_in_radius_batch(latitudes, longitudes, current_time)
@@ -6,7 +6,30 @@ at a specific time, following the Single Responsibility Principle.
 """
 
 from datetime import datetime, time
+from functools import lru_cache
+from typing import Optional
 from interfaces import TimeCheckerInterface
+from _kernels import SECONDS_PER_DAY
+
+
+@lru_cache(maxsize=4096)
+def parse_seconds_of_day(hour: str) -> int:
+    """
+    Parse an "HH:MM:SS" string to seconds since midnight.
+    
+    Restaurants share a small set of opening hours, so parsed values are cached.
+    
+    Args:
+        hour: Time in ISO format (HH:MM:SS)
+        
+    Returns:
+        Seconds since midnight
+        
+    Raises:
+        ValueError: If the string is not in HH:MM:SS format
+    """
+    parsed = datetime.strptime(hour, '%H:%M:%S')
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
 
 
 class TimeChecker(TimeCheckerInterface):
@@ -17,6 +40,34 @@ class TimeChecker(TimeCheckerInterface):
     at a specific time based on its opening and closing hours.
     """
     
+    def __init__(self, now: Optional[datetime] = None):
+        """
+        Initialize the time checker.
+        
+        Args:
+            now: Fixed time to use when no time is passed to is_open
+                 (default: None, uses the current time)
+        """
+        self.now = now
+    
+    def seconds_of_day(self, current_time=None) -> int:
+        """
+        Convert a time to seconds since midnight.
+        
+        Args:
+            current_time: Time or datetime to convert, or seconds since midnight which
+                          are returned as is (default: the fixed time, if any, else
+                          current time)
+            
+        Returns:
+            Seconds since midnight
+        """
+        if isinstance(current_time, int):
+            return current_time
+        if current_time is None:
+            current_time = self.now or datetime.now()
+        return current_time.hour * 3600 + current_time.minute * 60 + current_time.second
+    
     def is_open(self, open_hour: str, close_hour: str, current_time=None) -> bool:
         """
         Check if a location is open at the specified time.
@@ -24,25 +75,32 @@ class TimeChecker(TimeCheckerInterface):
         Args:
             open_hour: Opening hour in ISO format (HH:MM:SS)
             close_hour: Closing hour in ISO format (HH:MM:SS)
-            current_time: Time to check (default: current time)
+            current_time: Time to check (default: the fixed time, if any, else current time)
             
         Returns:
             True if open, False otherwise
         """
-        if current_time is None:
-            current_time = datetime.now().time()
-        elif isinstance(current_time, datetime):
-            current_time = current_time.time()
+        return bool(self.is_open_seconds(parse_seconds_of_day(open_hour),
+                                         parse_seconds_of_day(close_hour), current_time))
+    
+    def is_open_seconds(self, open_s, close_s, current_time=None):
+        """
+        Check if locations are open, given their hours as seconds since midnight.
+        
+        Works on single values as well as NumPy arrays of hours, without
+        branching on restaurants that close after midnight.
+        
+        Args:
+            open_s: Opening time(s) in seconds since midnight
+            close_s: Closing time(s) in seconds since midnight
+            current_time: Time to check, or seconds since midnight (default: the fixed
+                          time, if any, else current time)
             
-        # Parse open and close hours
-        open_time = datetime.strptime(open_hour, '%H:%M:%S').time()
-        close_time = datetime.strptime(close_hour, '%H:%M:%S').time()
-        
-        # Check if current time is within opening hours
-        if open_time <= close_time:
-            # Normal case: open_time <= current_time <= close_time
-            return open_time <= current_time <= close_time
-        else:
-            # Special case: restaurant closes after midnight
-            # In this case: current_time >= open_time OR current_time <= close_time
-            return current_time >= open_time or current_time <= close_time
+        Returns:
+            True where open, False otherwise (a boolean array for array input)
+        """
+        now_s = self.seconds_of_day(current_time)
+        
+        # Open when the time since opening, wrapped to a day, does not exceed the
+        # opening span; this also covers restaurants that close after midnight
+        return (now_s - open_s) % SECONDS_PER_DAY <= (close_s - open_s) % SECONDS_PER_DAY